@@ -1,26 +1,39 @@
 import sys
 import cv2
-import tempfile
-import os
 import json
+import time
 from PyQt5.QtCore import QThread, pyqtSignal
 from personal_color_analysis.detect_face import DetectFace
-from personal_color_analysis.color_extract import DominantColors
-from personal_color_analysis.tone_analysis import is_warm, is_spr, is_smr
-from colormath.color_objects import LabColor, sRGBColor, HSVColor
-from colormath.color_conversions import convert_color
+from personal_color_analysis.personal_color import face_part_colors, color_features, tone_number, aggregate_features, prepare_frame
+from personal_color_analysis.tone_analysis import classify_season, SEASONS
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+import device_profile
 from ocr.product_ocr import process_ocr
-from ocr.ocr_matcher import load_products, best_match_robust
+from ocr.ocr_matcher import get_product_index, best_match_robust
+from debug_dump import failed_frame_writer
 
 
 class AnalysisWorker(QThread):
     finished_ok = pyqtSignal(str, str, float)
     finished_err = pyqtSignal(str)
+    # 다중 프레임 모드에서 프레임 수집이 끝나면 발생 (웹캠 정지 시점)
+    frames_collected = pyqtSignal()
 
-    def __init__(self, img_bgr, parent=None):
+    def __init__(self, img_bgr, parent=None, frame_source=None, max_frames=None, landmarks=None):
+        """
+        frame_source: 호출 시 (seq, frame_bgr) 또는 None을 돌려주는 최신 프레임 함수.
+                      주어지면 최대 max_frames장을 분석해 집계한다.
+        landmarks: img_bgr 좌표계의 68점 (FaceTracker의 신선한 추적 결과) → 첫 프레임 검출 생략
+        """
         super().__init__(parent)
         self.img_bgr = img_bgr
+        self.landmarks = landmarks
+        self.frame_source = frame_source
+        self.max_frames = max_frames if max_frames is not None else device_profile.get('face_frames', 1)
+        self.workers = max(1, device_profile.get('face_frame_workers', 2))
+        self.stable_frames = max(1, device_profile.get('face_stable_frames', 3))
+        self.capture_timeout = device_profile.get('face_capture_timeout_s', 2.0)
     
     # --- Compatibility wrapper: use ocr_matcher APIs but keep the old name ---
     def match_ocr_to_db(ocr_texts, csv_path, top_k=3):
@@ -30,7 +43,7 @@ class AnalysisWorker(QThread):
         반환 딕셔너리 키는 기존 코드와 호환:
         ok, texts, score, detail, best, top
         """
-        products = load_products(csv_path)  # 리스트[{"row":row, "name_norm":..., ...}]
+        products = get_product_index(csv_path)  # (CSV가 바뀔 때만 다시 읽음) 리스트[{"row":row, "name_norm":..., ...}]
         best, score, top, ok, detail = best_match_robust(ocr_texts, products, top_k=top_k)
 
         if best:
@@ -47,94 +60,109 @@ class AnalysisWorker(QThread):
             return {"ok": False, "reason": "no_candidate", "texts": ocr_texts, "best": None, "top": []}
 
 
+    def _prepare(self, frame_bgr):
+        # 윈도우 환경에 맞춰 회전 로직 제거 / 640폭 축소 + CLAHE
+        return prepare_frame(frame_bgr, max_width=640)
+
+    def _analyze_frame(self, frame_bgr, landmarks=None):
+        # 임시 JPEG 저장/재로딩 없이 메모리 상의 BGR 배열을 바로 분석
+        prepared = self._prepare(frame_bgr)
+        if landmarks is not None:
+            # _prepare의 리사이즈 배율만큼 랜드마크도 축소
+            r = prepared.shape[1] / float(frame_bgr.shape[1])
+            landmarks = np.rint(np.asarray(landmarks, dtype=np.float64) * r).astype(np.int32)
+        df = DetectFace(prepared, landmarks=landmarks)
+        color = face_part_colors(df, clusters=4)
+        # 3색을 한 번에 Lab/HSV로 변환
+        return color_features(color)
+
+    def _is_stable(self, results):
+        """최근 stable_frames개의 프레임별 판정이 모두 집계 판정과 같으면 안정"""
+        n = self.stable_frames
+        if len(results) < n:
+            return False
+        agg = aggregate_features(results)
+        season = int(classify_season(agg['lab_b'], agg['hsv_s']))
+        recent = results[-n:]
+        per_frame = classify_season(np.stack([f['lab_b'] for f in recent]), np.stack([f['hsv_s'] for f in recent]))
+        return bool(np.all(per_frame == season))
+
+    def _analyze_frames(self):
+        """
+        웹캠에서 새 프레임을 받는 즉시 스레드 풀에 넘겨 캡처와 분석을 겹친다.
+        판정이 안정되면 남은 프레임을 기다리지 않고 종료한다.
+        반환: 성공한 프레임별 특징 목록 (모두 실패하면 마지막 오류를 다시 던짐)
+        """
+        if self.frame_source is None or self.max_frames <= 1:
+            self.frames_collected.emit()
+            return [self._analyze_frame(self.img_bgr, self.landmarks)]
+
+        results, last_err = [], None
+        cur = self.frame_source()
+        last_seq = cur[0] if cur else None
+        deadline = time.monotonic() + self.capture_timeout
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        pending = [pool.submit(self._analyze_frame, self.img_bgr, self.landmarks)]
+        submitted, collecting = 1, True
+        try:
+            while pending or collecting:
+                if collecting and (submitted >= self.max_frames or time.monotonic() >= deadline):
+                    collecting = False
+                    self.frames_collected.emit()
+                if collecting and len(pending) < self.workers:
+                    cur = self.frame_source()
+                    if cur is not None and cur[0] != last_seq:
+                        last_seq = cur[0]
+                        # 링 버퍼 뷰는 곧 덮어써지므로 분석용 사본
+                        pending.append(pool.submit(self._analyze_frame, cur[1].copy()))
+                        submitted += 1
+
+                done = [f for f in pending if f.done()]
+                for f in done:
+                    pending.remove(f)
+                    try:
+                        results.append(f.result())
+                    except Exception as e:
+                        # 한 프레임 실패(얼굴 없음/빈 영역/cv2 오류 등)는 건너뛰고 나머지로 판정
+                        last_err = e
+                if done and self._is_stable(results):
+                    break
+                if not done:
+                    self.msleep(10)
+        finally:
+            if collecting:
+                self.frames_collected.emit()
+            for f in pending:
+                f.cancel()
+            # 이미 실행 중인 프레임(짧음)은 끝날 때까지 대기 → 결과 전달/미리보기 재개 뒤까지 CPU를 쓰지 않음
+            pool.shutdown(wait=True)
+
+        if not results:
+            raise last_err or RuntimeError("No face detected in the image.")
+        return results
+
     def run(self):
-        tmp_path = None
         try:
-            # 윈도우 환경에 맞춰 회전 로직 제거
-            rotated_bgr = self.img_bgr
-            
-            (h, w) = rotated_bgr.shape[:2]
-            if w > 640:
-                r = 640 / float(w)
-                dim = (640, int(h * r))
-                resized_bgr = cv2.resize(rotated_bgr, dim, interpolation=cv2.INTER_AREA)
-            else:
-                resized_bgr = rotated_bgr
-            
-            lab = cv2.cvtColor(resized_bgr, cv2.COLOR_BGR2LAB)
-            l, a, b = cv2.split(lab)
-            clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-            cl = clahe.apply(l)
-            limg = cv2.merge((cl, a, b))
-            final_bgr = cv2.cvtColor(limg, cv2.COLOR_LAB2BGR)
-            
-            fd, tmp_path = tempfile.mkstemp(suffix=".jpg")
-            os.close(fd)
-            cv2.imwrite(tmp_path, final_bgr)
-            
-            df = DetectFace(tmp_path)
-            face = [df.left_cheek, df.right_cheek, df.left_eyebrow, df.right_eyebrow, df.left_eye, df.right_eye]
-            temp = []
-            clusters = 4
-            for f in face:
-                dc = DominantColors(f, clusters)
-                face_part_color, _ = dc.getHistogram()
-                temp.append(np.array(face_part_color[0]))
-            
-            cheek = np.mean([temp[0], temp[1]], axis=0)
-            eyebrow = np.mean([temp[2], temp[3]], axis=0)
-            eye = np.mean([temp[4], temp[5]], axis=0)
-
-            Lab_l, Lab_b, hsv_s = [], [], []
-            color = [cheek, eyebrow, eye]
-            for i in range(3):
-                rgb = sRGBColor(color[i][0], color[i][1], color[i][2], is_upscaled=True)
-                lab_color = convert_color(rgb, LabColor, through_rgb_type=sRGBColor)
-                hsv = convert_color(rgb, HSVColor, through_rgb_type=sRGBColor)
-                Lab_l.append(float(format(lab_color.lab_l, ".2f")))
-                Lab_b.append(float(format(lab_color.lab_b, ".2f")))
-                hsv_s.append(float(format(hsv.hsv_s, ".2f")) * 100)
-
-            Lab_weight = [30, 20, 5]
-            hsv_weight = [10, 1, 1]
-            
-            if is_warm(Lab_b, Lab_weight):
-                if is_spr(hsv_s, hsv_weight):
-                    personal_color = 'spring_warm'
-                else:
-                    personal_color = 'fall_warm'
-            else:
-                if is_smr(hsv_s, hsv_weight):
-                    personal_color = 'summer_cool'
-                else:
-                    personal_color = 'winter_cool'
-            
-            avg_lab_l = np.mean(Lab_l)
-            
-            if avg_lab_l >= 80:
-                user_tone_num = '20'
-            elif avg_lab_l >= 60:
-                user_tone_num = '21'
-            elif avg_lab_l >= 40:
-                user_tone_num = '22'
-            else:
-                user_tone_num = '23'
-            
+            results = self._analyze_frames()
+            # 프레임별 특징을 중앙값으로 집계 (깜빡임/조명 튐에 강함)
+            feats = aggregate_features(results)
+            personal_color = SEASONS[int(classify_season(feats['lab_b'], feats['hsv_s']))]
+
+            avg_lab_l = float(np.mean(feats['lab_l']))
+            user_tone_num = tone_number(avg_lab_l)
+
             brightness = float(avg_lab_l)
 
             self.finished_ok.emit(user_tone_num, personal_color, brightness)
             
         except RuntimeError as e:
             if str(e) == "No face detected in the image.":
-                cv2.imwrite('dlib_error.jpg', self.img_bgr)
+                # 실패 프레임 저장은 옵션(device_profile) + 백그라운드 기록
+                writer = failed_frame_writer()
+                if writer is not None:
+                    writer.submit_image(time.strftime("noface_%Y%m%d_%H%M%S.jpg"), self.img_bgr)
                 self.finished_err.emit("이미지에서 얼굴을 찾을 수 없어요. 조명과 얼굴 위치를 확인해주세요.")
             else:
                 self.finished_err.emit(str(e))
         except Exception as e:
-            self.finished_err.emit(f"분석 중 오류가 발생했습니다: {str(e)}")
-        finally:
-            if tmp_path and os.path.exists(tmp_path):
-                try:
-                    os.remove(tmp_path)
-                except Exception:
-                    pass
\ No newline at end of file
+            self.finished_err.emit(f"분석 중 오류가 발생했습니다: {str(e)}")
\ No newline at end of file
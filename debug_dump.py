@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+debug_dump.py
+- 디버그용 이미지/JSON을 백그라운드 스레드에서 저장 (분석 경로는 디스크 I/O를 기다리지 않음)
+- 용량/개수 한도를 넘으면 오래된 항목부터 삭제
+"""
+import os
+import json
+import queue
+import shutil
+import logging
+import threading
+
+import cv2
+
+import device_profile
+
+log = logging.getLogger(__name__)
+
+
+def _entry_size(path):
+    if os.path.isdir(path):
+        total = 0
+        for root, _, files in os.walk(path):
+            for fn in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, fn))
+                except OSError:
+                    pass
+        return total
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+class BackgroundDumpWriter:
+    """
+    root_dir 아래에 파일을 비동기로 기록한다.
+    - submit_*()는 큐에 넣고 바로 반환 (큐가 가득 차면 버림 → 호출 측은 절대 블로킹되지 않음)
+    - root_dir 바로 아래 항목(파일 또는 폴더) 단위로 max_files / max_bytes 한도 관리
+    """
+
+    def __init__(self, root_dir, max_bytes=200 * 1024 * 1024, max_files=None, queue_size=16):
+        self.root_dir = root_dir
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='debug-dump-writer', daemon=True)
+                self._thread.start()
+
+    def _put(self, job):
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(job)
+            return True
+        except queue.Full:
+            log.warning('debug dump queue full, dropping %s', job[1])
+            return False
+
+    def submit_image(self, rel_path, bgr, quality=90, render=None):
+        """
+        BGR 이미지를 JPEG로 저장 예약. 호출 후 원본이 바뀌어도 되도록 복사본을 넘긴다.
+        render: 저장 직전 기록 스레드에서 적용할 함수 img → img (오버레이 그리기 등)
+        """
+        if bgr is None:
+            return None
+        path = os.path.join(self.root_dir, rel_path)
+        return path if self._put(('image', path, bgr.copy(), int(quality), render)) else None
+
+    def submit_json(self, rel_path, obj, default=None):
+        path = os.path.join(self.root_dir, rel_path)
+        return path if self._put(('json', path, obj, default)) else None
+
+    def flush(self):
+        """테스트/종료 시점용: 큐가 빌 때까지 대기."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                self._write(job)
+                self._enforce_quota()
+            except Exception as e:
+                log.warning('debug dump write failed (%s): %s', job[1], e)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, job):
+        kind, path = job[0], job[1]
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if kind == 'image':
+            _, _, img, quality, render = job
+            if render is not None:
+                img = render(img)
+            ok, buf = cv2.imencode('.jpg', img, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+            if ok:
+                with open(path, 'wb') as f:
+                    f.write(buf.tobytes())
+        elif kind == 'json':
+            _, _, obj, default = job
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(obj, f, ensure_ascii=False, default=default)
+
+    def _enforce_quota(self):
+        try:
+            names = os.listdir(self.root_dir)
+        except OSError:
+            return
+        entries = []
+        for nm in names:
+            p = os.path.join(self.root_dir, nm)
+            try:
+                entries.append((os.path.getmtime(p), p, _entry_size(p)))
+            except OSError:
+                continue
+        entries.sort()  # 오래된 것부터
+        total = sum(sz for _, _, sz in entries)
+        while entries and ((self.max_files and len(entries) > self.max_files)
+                           or (self.max_bytes and total > self.max_bytes)):
+            _, p, sz = entries.pop(0)
+            try:
+                if os.path.isdir(p):
+                    shutil.rmtree(p, ignore_errors=True)
+                else:
+                    os.remove(p)
+            except OSError:
+                pass
+            total -= sz
+
+
+_FAILED_FRAMES = None
+
+
+def failed_frame_writer():
+    """얼굴 인식 실패 프레임 저장기. device_profile에서 꺼져 있으면 None."""
+    global _FAILED_FRAMES
+    if not device_profile.get('dump_failed_frames', False):
+        return None
+    if _FAILED_FRAMES is None:
+        _FAILED_FRAMES = BackgroundDumpWriter(
+            device_profile.get('dump_dir', 'logs/failed_frames'),
+            max_bytes=int(device_profile.get('dump_max_mb', 200)) * 1024 * 1024,
+            max_files=device_profile.get('dump_max_files', 100),
+        )
+    return _FAILED_FRAMES
+
+
+_OCR_DEBUG = None
+_OCR_DEBUG_LOCK = threading.Lock()
+
+
+def ocr_debug_writer():
+    """제품 OCR 디버그(오버레이/JSON) 저장기. ocr_debug_mode가 off면 None."""
+    global _OCR_DEBUG
+    if str(device_profile.get('ocr_debug_mode', 'sample')).lower() == 'off':
+        return None
+    with _OCR_DEBUG_LOCK:
+        if _OCR_DEBUG is None:
+            _OCR_DEBUG = BackgroundDumpWriter(
+                device_profile.get('ocr_debug_dir', 'logs/ocr_debug'),
+                max_bytes=int(device_profile.get('ocr_debug_max_mb', 100)) * 1024 * 1024,
+                max_files=device_profile.get('ocr_debug_max_shots', 50),
+                queue_size=32,
+            )
+        return _OCR_DEBUG
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+device_profile.py
+- 장치(데스크톱/Jetson)별 기본 설정값 모음
+- 환경변수 SMARTMIRROR_<KEY> 로 개별 값 덮어쓰기 (예: SMARTMIRROR_DUMP_FAILED_FRAMES=1)
+- SMARTMIRROR_PROFILE=desktop|jetson 으로 프로파일 강제 지정
+"""
+import os
+
+_PROFILES = {
+    'desktop': {
+        # 얼굴 인식 실패 프레임 덤프 (기본 꺼짐, 켜면 백그라운드로 저장)
+        'dump_failed_frames': False,
+        'dump_dir': 'logs/failed_frames',
+        'dump_max_files': 100,
+        'dump_max_mb': 200,
+        # 얼굴 분석: 최근 N프레임 집계 (1이면 단일 프레임 = 기존 동작), 판정 안정 시 조기 종료
+        # 다중 프레임은 분석 중에도 카메라를 켜 두고 N번 분석하므로 배포별로 켬 (예: 5)
+        'face_frames': 1,
+        'face_frame_workers': 3,
+        'face_stable_frames': 3,
+        'face_capture_timeout_s': 1.5,
+        # 얼굴 검출 축소 배율 / HOG 업샘플 횟수 (못 찾으면 원본 해상도로 재시도)
+        'face_detect_scale': 0.5,
+        'face_detect_upsample': 1,
+        # 라이브 얼굴 추적: 추적 주기, 전체 검출 간격, 분석에 재사용할 추적 결과의 최대 나이
+        'face_track_enabled': True,
+        'face_track_fps': 15,
+        'face_track_detect_interval_s': 0.5,
+        'face_track_max_age_s': 0.25,
+        # 촬영 품질 게이트 (얼굴/밝기/선명도/움직임), auto_shot이면 조건 유지 시 자동 촬영
+        'quality_gate_enabled': True,
+        'quality_fps': 4,
+        'quality_min_luma': 60,
+        'quality_max_luma': 225,
+        'quality_min_sharpness': 40.0,
+        'quality_max_motion': 8.0,
+        # 이 시간 넘게 조건 미달이면 촬영 버튼을 다시 켬 (판정 오류/계속 미달이어도 촬영·분석 경로로 진행 가능)
+        'quality_gate_grace_s': 5.0,
+        'auto_shot': False,
+        'auto_shot_hold_s': 1.5,
+        # 캡처 소스: auto(Windows=dshow, 그 외=v4l2) | v4l2 | dshow | gstreamer | replay
+        'capture_source': 'auto',
+        'capture_device': 0,
+        'capture_width': 640,
+        'capture_height': 480,
+        'capture_fps': 30,
+        'capture_fourcc': 'MJPG',
+        'capture_pipeline': '',
+        'capture_replay_path': '',
+        'capture_replay_loop': True,
+        # 캡처 링 버퍼 슬롯 수 (최신 프레임 우선, 슬롯은 이 수만큼 뒤에 재사용; OCR burst 구간을 담을 만큼)
+        'capture_ring_slots': 8,
+        # 이 시간 동안 프레임이 없으면 소스 재연결
+        'capture_reopen_s': 2.0,
+        # 촬영 시에만 장치를 고해상도로 잠시 전환해 정지 영상 1장 (제품 OCR; 얼굴은 선택)
+        'still_enabled': True,
+        'still_width': 1920,
+        'still_height': 1080,
+        'still_warmup_frames': 3,
+        # 이 시간 안에 정지 영상이 안 오면 최신 미리보기 프레임으로 대체 (캡처 스레드 정지/예외 대비)
+        'still_timeout_s': 3.0,
+        'still_for_face': False,
+        'ocr_max_side': 1920,
+        # 앱 시작 시 OCR 리더 생성 + 더미 추론을 낮은 우선순위로 미리 (첫 제품 촬영 지연 제거)
+        'ocr_warmup': True,
+        # 제품 OCR burst: 촬영 직전 window 안의 최근 N프레임 + 정지 영상 중 상위 k장만 OCR
+        'ocr_burst_frames': 6,
+        'ocr_burst_window_s': 0.4,
+        'ocr_burst_top_k': 2,
+        'ocr_burst_accept_score': 0.6,
+        # OCR 변형 스케줄러: 과거 승률 순으로 시도, 점수/사전 일치가 충분하면 조기 종료, 한 장당 시간 예산(초)
+        'ocr_accept_score': 0.7,
+        'ocr_accept_lexicon': 0.9,
+        'ocr_accept_min_conf': 0.4,
+        'ocr_time_budget_s': 8.0,
+        # 변형 승률 통계 파일 저장 간격(초, 최대 한 번 / 백그라운드), 종료 시 마지막 저장
+        'ocr_stats_flush_s': 30.0,
+        # 텍스트 검출은 한 번만 하고 변형별로는 같은 박스로 인식만 (회전 변형은 박스 좌표 변환)
+        'ocr_detect_once': True,
+        # 텍스트 방향 추정(auto) 후 상위 1~2방향만 인식 / off면 회전 3종 + 인식기 4방향 전부
+        # upright_prior: 가로쓰기일 때 정방향(0°)을 먼저 시도, second_min: 다른 축도 후보로 둘 최소 확률
+        # probe_boxes: 위/아래 판단용으로 후보 각도마다 인식해 볼 큰 검출 박스 수 (0 = 탐침 안 함)
+        'ocr_orientation': 'auto',
+        'ocr_orient_upright_prior': 0.8,
+        'ocr_orient_second_min': 0.15,
+        'ocr_orient_probe_boxes': 2,
+        # burst 상위 프레임이 여러 장이면 모든 프레임·변형의 글자 crop을 한 인식 배치로 (배치 크기)
+        'ocr_batch_frames': True,
+        'ocr_batch_size': 16,
+        # OCR 동시 작업 수(변형 인식/프레임 전처리)와 전체 torch/cv2 스레드 수 (0 = 코어 수-1), 작업마다 나눠 씀
+        'ocr_workers': 2,
+        'ocr_threads': 0,
+        # 제품 OCR 디버그 산출물(변형별 오버레이 + ocr_debug.json): 백그라운드 저장
+        # mode: sample(every_n장마다 1장) | failures(실패한 장만) | all | off, 용량(MB)/장 수 한도 넘으면 오래된 장부터 삭제
+        'ocr_debug_mode': 'sample',
+        'ocr_debug_every_n': 10,
+        'ocr_debug_dir': 'logs/ocr_debug',
+        'ocr_debug_max_mb': 100,
+        'ocr_debug_max_shots': 50,
+        'ocr_debug_jpeg_quality': 70,
+        # 미리보기 목표 FPS (캡처 FPS와 별개, 캡처 스레드에서 회전/거울/리사이즈까지 처리)
+        'preview_fps': 30,
+    },
+    'jetson': {
+        'dump_failed_frames': False,
+        'dump_dir': 'logs/failed_frames',
+        'dump_max_files': 30,
+        'dump_max_mb': 50,
+        'face_frames': 1,
+        'face_frame_workers': 2,
+        'face_stable_frames': 3,
+        'face_capture_timeout_s': 2.0,
+        'face_detect_scale': 0.5,
+        'face_detect_upsample': 0,
+        'face_track_enabled': True,
+        'face_track_fps': 8,
+        'face_track_detect_interval_s': 1.0,
+        'face_track_max_age_s': 0.3,
+        'quality_gate_enabled': True,
+        'quality_fps': 2,
+        'quality_min_luma': 60,
+        'quality_max_luma': 225,
+        'quality_min_sharpness': 40.0,
+        'quality_max_motion': 8.0,
+        'quality_gate_grace_s': 5.0,
+        'auto_shot': False,
+        'auto_shot_hold_s': 1.5,
+        'capture_source': 'v4l2',
+        'capture_device': 0,
+        'capture_width': 640,
+        'capture_height': 480,
+        'capture_fps': 30,
+        'capture_fourcc': 'MJPG',
+        'capture_pipeline': '',
+        'capture_replay_path': '',
+        'capture_replay_loop': True,
+        'capture_ring_slots': 6,
+        'capture_reopen_s': 3.0,
+        'still_enabled': True,
+        'still_width': 1280,
+        'still_height': 720,
+        'still_warmup_frames': 2,
+        'still_timeout_s': 4.0,
+        'still_for_face': False,
+        'ocr_max_side': 1280,
+        'ocr_warmup': True,
+        'ocr_burst_frames': 5,
+        'ocr_burst_window_s': 0.4,
+        'ocr_burst_top_k': 1,
+        'ocr_burst_accept_score': 0.6,
+        'ocr_accept_score': 0.7,
+        'ocr_accept_lexicon': 0.9,
+        'ocr_accept_min_conf': 0.4,
+        'ocr_time_budget_s': 15.0,
+        'ocr_stats_flush_s': 60.0,
+        'ocr_detect_once': True,
+        'ocr_orientation': 'auto',
+        'ocr_orient_upright_prior': 0.8,
+        'ocr_orient_second_min': 0.15,
+        'ocr_orient_probe_boxes': 2,
+        'ocr_batch_frames': True,
+        'ocr_batch_size': 8,
+        'ocr_workers': 2,
+        'ocr_threads': 0,
+        'ocr_debug_mode': 'failures',
+        'ocr_debug_every_n': 20,
+        'ocr_debug_dir': 'logs/ocr_debug',
+        'ocr_debug_max_mb': 30,
+        'ocr_debug_max_shots': 20,
+        'ocr_debug_jpeg_quality': 60,
+        'preview_fps': 15,
+    },
+}
+
+
+def is_jetson():
+    try:
+        return os.path.isfile('/etc/nv_tegra_release')
+    except Exception:
+        return False
+
+
+def profile_name():
+    name = (os.environ.get('SMARTMIRROR_PROFILE') or '').strip().lower()
+    if name in _PROFILES:
+        return name
+    return 'jetson' if is_jetson() else 'desktop'
+
+
+def _cast(raw, default):
+    if isinstance(default, bool):
+        return raw.strip().lower() in ('1', 'true', 'yes', 'on')
+    if isinstance(default, int):
+        return int(raw)
+    if isinstance(default, float):
+        return float(raw)
+    return raw
+
+
+def get(key, default=None):
+    """현재 프로파일의 설정값. 환경변수가 있으면 기본값의 타입으로 변환해 우선 적용."""
+    value = _PROFILES[profile_name()].get(key, default)
+    raw = os.environ.get('SMARTMIRROR_' + key.upper())
+    if raw is None:
+        return value
+    try:
+        return _cast(raw, value)
+    except (TypeError, ValueError):
+        return value
@@ -20,7 +20,7 @@ source .venv/bin/activate
 
 echo "[3/5] upgrade pip + install core deps (no sklearn/scipy)"
 pip install --upgrade pip
-pip install numpy==1.24.4 pillow colormath imutils
+pip install numpy==1.24.4 pillow imutils
 
 echo "[4/5] (Optional) Install PyTorch for Jetson (L4T) before EasyOCR."
 echo "      After torch is installed and importable, run: pip install easyocr"
@@ -11,13 +11,14 @@ def _global_excepthook(exc_type, exc, tb):
 
 sys.excepthook = _global_excepthook
 import csv
+import functools
 import cv2
 import numpy as np
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout,
     QStackedWidget, QMessageBox, QDesktopWidget
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThread, QTimer
 from PyQt5.QtGui import QImage
 from ui_pages.skin_type_survey_page import SkinTypeSurveyPage
 
@@ -28,11 +29,16 @@ from ui_pages.result_pages import FaceResultPage, ProductRecommendPage
 from ui_pages.loading_page import LoadingPage
 
 # Webcam
-from webcam_thread.webcam import WebcamThread
+from webcam_thread.webcam import WebcamThread, qimage_to_bgr
+from webcam_thread.face_track_thread import FaceTrackThread
+from webcam_thread.capture_quality import CaptureQualityThread
 
 # Workers
 from analysis_worker import AnalysisWorker
 from product_analysis_worker import ProductAnalysisWorker
+from ocr_warmup_worker import OcrWarmupWorker
+from personal_color_analysis.face_models import warm_up_face_models
+import device_profile
 
 # DB
 from db_manager.database import DatabaseManager
@@ -52,11 +58,23 @@ class BeautyFinderApp(QMainWindow):
         # 상태 변수
         self.webcam_last_frame = None
         self.webcam_thread = None
+        self._active_page = None   # 미리보기를 받을 현재 페이지 (카메라 세션은 하나로 유지)
+        self.face_track_thread = None
+        self.quality_thread = None
+        self._retiring_threads = set()   # 정지 요청 후 끝나기를 기다리지 않는 스레드 (끝날 때까지 참조 유지)
         self.db_manager = DatabaseManager()
         self.user_tone = None
         self.user_color = None
         self.user_skin_type = None
 
+        # 얼굴 모델(dlib) 백그라운드 선로딩 → 첫 촬영에서 모델 로딩 대기 제거
+        warm_up_face_models(background=True)
+
+        # OCR 리더 백그라운드 워밍업 (준비 전에 찍은 제품 샷은 준비되면 이어서 처리)
+        self.ocr_ready = False
+        self._ocr_waiters = []
+        self.ocr_warmup_thread = None
+
         # 레이아웃
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
@@ -70,6 +88,7 @@ class BeautyFinderApp(QMainWindow):
         self.apply_styles()
         self.stacked_widget.setCurrentWidget(self.pages['unified_capture'])
         self.start_webcam_and_connect(self.pages['unified_capture'])
+        self._start_ocr_warmup()
 
 
         self.is_busy = False
@@ -101,18 +120,75 @@ class BeautyFinderApp(QMainWindow):
         self.pages['face_capture'].capture_btn.clicked.connect(self.start_face_analysis)
         self.pages['skin_survey'].submitted.connect(self.on_skin_survey_submitted)
 
+    # ---------------- OCR 준비 ----------------
+    def _start_ocr_warmup(self):
+        if not device_profile.get('ocr_warmup', True):
+            self._set_ocr_ready()
+            return
+        self._set_product_page_ready(False)
+        self.ocr_warmup_thread = OcrWarmupWorker(self)
+        self.ocr_warmup_thread.finished_ok.connect(self._on_ocr_warmup_done)
+        self.ocr_warmup_thread.finished_err.connect(self._on_ocr_warmup_failed)
+        self.ocr_warmup_thread.start(QThread.LowPriority)
+
+    def _on_ocr_warmup_done(self, info):
+        print("[ocr] warm-up done:", info)
+        self._set_ocr_ready()
+
+    def _on_ocr_warmup_failed(self, msg):
+        # 워밍업 실패는 치명적이지 않음 → 첫 OCR에서 다시 생성 시도 (오류는 그 경로에서 표시)
+        print("[ocr] warm-up failed:", msg)
+        self._set_ocr_ready()
+
+    def _set_product_page_ready(self, ready):
+        page = self.pages.get('product_capture')
+        if page is not None and hasattr(page, 'set_ocr_ready'):
+            page.set_ocr_ready(ready)
+
+    def _set_ocr_ready(self):
+        self.ocr_ready = True
+        self._set_product_page_ready(True)
+        waiters, self._ocr_waiters = self._ocr_waiters, []
+        for fn, args in waiters:
+            fn(*args)
+
+    def _when_ocr_ready(self, fn, *args):
+        """OCR 준비가 끝났으면 바로, 아니면 워밍업 완료 시그널 때 fn(*args) 실행 (GUI 스레드, 대기 없음)"""
+        if self.ocr_ready:
+            fn(*args)
+        else:
+            self._ocr_waiters.append((fn, args))
+
     # ---------------- 제품 분석 ----------------
     def start_product_analysis(self):
-        if self.webcam_last_frame is None or getattr(self.webcam_last_frame, 'size', 0) == 0:
+        # 버튼 누를 때 흔들림 대비: 직전 미리보기 프레임들도 함께 넘겨 가장 좋은 프레임을 OCR
+        # 정지 영상 촬영(해상도 전환 + 노출 안정 대기) 뒤에는 링이 전환 직후 프레임으로 채워지므로 지금 복사
+        burst = []
+        if self.webcam_thread is not None and device_profile.get('ocr_burst_top_k', 2) > 1:
+            burst = [f.copy() for _, f in self.webcam_thread.last_frames(
+                device_profile.get('ocr_burst_frames', 6), device_profile.get('ocr_burst_window_s', 0.4))]
+        # 라벨 글자가 작으므로 고해상도 정지 영상으로 OCR (미리보기는 저해상도 유지)
+        self.capture_still(functools.partial(self._start_product_worker, burst=burst))
+
+    def _start_product_worker(self, frame, burst=None):
+        if frame is None or frame.size == 0:
             QMessageBox.warning(self, "안내", "웹캠 프레임을 아직 받지 못했어요.")
             return
 
-        self.stop_webcam()
-        self.pages['loading'].set_message("제품을 인식하고 있어요...", "잠시만 기다려 주세요")
+        burst = burst or []
+        self.pause_webcam()
+        if self.ocr_ready:
+            self.pages['loading'].set_message("제품을 인식하고 있어요...", "잠시만 기다려 주세요")
+        else:
+            self.pages['loading'].set_message("문자 인식 모델을 준비하고 있어요...", "준비되면 바로 인식을 시작해요")
         self.stacked_widget.setCurrentWidget(self.pages['loading'])
         QApplication.processEvents()
+        # 촬영 프레임/burst는 지금 확보해 두고, OCR 시작만 준비 완료까지 미룸
+        self._when_ocr_ready(self._launch_product_worker, frame, burst)
 
-        self.product_analysis_thread = ProductAnalysisWorker(self.webcam_last_frame, self.db_manager)
+    def _launch_product_worker(self, frame, burst):
+        self.pages['loading'].set_message("제품을 인식하고 있어요...", "잠시만 기다려 주세요")
+        self.product_analysis_thread = ProductAnalysisWorker(frame, self.db_manager, burst=burst)
         self.product_analysis_thread.finished_ok.connect(self.on_product_analysis_done)
         self.product_analysis_thread.finished_err.connect(self.on_product_analysis_error)
         self.product_analysis_thread.start()
@@ -364,19 +440,21 @@ class BeautyFinderApp(QMainWindow):
         if self.is_busy:
             return
         self.is_busy = True
+        self.capture_still(self._defer_ocr_on_frame)
 
+    def _defer_ocr_on_frame(self, frame):
+        # 워밍업 중이면 촬영한 프레임을 들고 준비 완료 시그널을 기다림 (GUI는 멈추지 않음)
+        if not self.ocr_ready:
+            self.pause_webcam()
+        self._when_ocr_ready(self._run_ocr_on_frame, frame)
+
+    def _run_ocr_on_frame(self, frame):
         try:
-            if self.webcam_last_frame is None or getattr(self.webcam_last_frame, 'size', 0) == 0:
+            if frame is None or frame.size == 0:
                 QMessageBox.warning(self, "안내", "웹캠 프레임을 아직 받지 못했어요.")
                 return
 
-            frame = (
-                self.webcam_last_frame.copy()
-                if hasattr(self.webcam_last_frame, 'copy')
-                else self.webcam_last_frame
-            )
-
-            self.stop_webcam()
+            self.pause_webcam()
 
             from ocr.ocr_matcher import run_ocr
             result = run_ocr(frame)
@@ -447,11 +525,30 @@ class BeautyFinderApp(QMainWindow):
 
     # ---------------- 얼굴 분석 ----------------
     def start_face_analysis(self):
-        if self.webcam_last_frame is None or getattr(self.webcam_last_frame, 'size', 0) == 0:
+        # 신선한 얼굴 추적 결과가 있으면 그 프레임 + 랜드마크로 검출 단계를 건너뜀
+        track = self.face_track_thread.snapshot() if self.face_track_thread is not None else None
+        if track is not None:
+            frame, landmarks = track['frame'], track['landmarks']
+        elif device_profile.get('still_for_face', False):
+            # 고해상도 정지 영상으로 분석 (추적 랜드마크는 미리보기 해상도라 쓰지 않음)
+            self.capture_still(lambda still: self._start_face_worker(still, None))
+            return
+        else:
+            frame, landmarks = self.capture_frame(), None
+        self._start_face_worker(frame, landmarks)
+
+    def _start_face_worker(self, frame, landmarks):
+        if frame is None or frame.size == 0:
             QMessageBox.warning(self, "안내", "웹캠 프레임을 아직 받지 못했어요.")
             return
 
-        self.stop_webcam()
+        # 다중 프레임 모드: 분석이 시작된 뒤에도 웹캠을 잠시 유지하고 새 프레임을 워커가 직접 가져감
+        multi = (device_profile.get('face_frames', 1) > 1
+                 and self.webcam_thread is not None and self.webcam_thread.isRunning()
+                 and not self.webcam_thread.paused)
+        frame_source = self.webcam_thread.latest_frame if multi else None
+        if not multi:
+            self.pause_webcam()
 
         # ★ 통합화면에서 온 호출이면 로딩 화면으로 전환하지 않음
         if not getattr(self, "intent_face_from_unified", False):
@@ -460,9 +557,11 @@ class BeautyFinderApp(QMainWindow):
 
         QApplication.processEvents()
 
-        self.analysis_thread = AnalysisWorker(self.webcam_last_frame)
+        self.analysis_thread = AnalysisWorker(frame, frame_source=frame_source, landmarks=landmarks)
         self.analysis_thread.finished_ok.connect(self.on_analysis_done)
         self.analysis_thread.finished_err.connect(self.on_analysis_error)
+        if multi:
+            self.analysis_thread.frames_collected.connect(self.pause_webcam)
         self.analysis_thread.start()
 
 
@@ -565,7 +664,7 @@ class BeautyFinderApp(QMainWindow):
 
     # ---------------- 네비게이션 ----------------
     def go_home(self):
-        self.stop_webcam()
+        self.pause_webcam()
         self.stacked_widget.setCurrentWidget(self.pages['home'])
 
     def show_product_capture(self):
@@ -576,93 +675,173 @@ class BeautyFinderApp(QMainWindow):
         self.start_webcam_and_connect(self.pages['face_capture'])
         self.stacked_widget.setCurrentWidget(self.pages['face_capture'])
 
-    from PyQt5.QtGui import QImage
-    import numpy as np, cv2
-
-    def _qimage_to_bgr(qimg: QImage):
-        # 어떤 포맷이 와도 RGB888로 변환 후 안전하게 ndarray 뽑기
-        if qimg.format() != QImage.Format_RGB888:
-            qimg = qimg.convertToFormat(QImage.Format_RGB888)
-        w, h = qimg.width(), qimg.height()
-        ptr = qimg.bits()
-        ptr.setsize(h * qimg.bytesPerLine())
-        arr = np.frombuffer(ptr, np.uint8).reshape(h, qimg.bytesPerLine() // 3, 3)[:, :w, :]
-        return cv2.cvtColor(arr, cv2.COLOR_RGB2BGR)
-    
-    def _stash_last(*args):
-        try:
-            if len(args) == 2:
-                # (QImage, raw_bgr) 쌍으로 오는 경우
-                self.webcam_last_frame = args[1]
-            elif len(args) == 1 and isinstance(args[0], QImage):
-                # QImage만 오는 경우 → 항상 RGB888로 변환해서 BGR ndarray 저장
-                self.webcam_last_frame = _qimage_to_bgr(args[0])
-        except Exception:
-            # 변환 실패 시 None으로 두되, 앱은 죽지 않게
-            self.webcam_last_frame = None
+    # ---------------- 웹캠 ----------------
+    def capture_frame(self):
+        """
+        촬영 시점의 원본 BGR 프레임 (요청할 때만 사본/변환).
+        웹캠이 없으면 외부에서 주입된 webcam_last_frame(ndarray 또는 QImage)을 사용.
+        """
+        frame = self.webcam_thread.snapshot() if self.webcam_thread is not None else None
+        if frame is None:
+            frame = self.webcam_last_frame
+            if isinstance(frame, QImage):
+                frame = qimage_to_bgr(frame)
+        return frame
+
+    def capture_still(self, callback):
+        """
+        고해상도 정지 영상을 찍어 callback(frame)으로 넘긴다 (GUI 스레드에서 호출됨).
+        장치 전환을 못 하거나 실패하면 최신 미리보기 프레임으로 대체.
+        still_timeout_s 안에 응답이 없어도(캡처 스레드 정지 등) 미리보기 프레임으로 한 번만 callback.
+        """
+        cam = self.webcam_thread
+        if (cam is None or not cam.isRunning() or cam.paused
+                or not device_profile.get('still_enabled', True)):
+            callback(self.capture_frame())
+            return
+
+        state = {'done': False}
 
+        def _done(still):
+            if state['done']:
+                return
+            state['done'] = True
+            try:
+                cam.still_ready.disconnect(_done)
+            except Exception:
+                pass
+            callback(still if still is not None else self.capture_frame())
 
+        cam.still_ready.connect(_done, type=Qt.QueuedConnection)
+        cam.request_still()
+        QTimer.singleShot(int(device_profile.get('still_timeout_s', 3.0) * 1000), lambda: _done(None))
 
-    # ---------------- 웹캠 ----------------
     def start_webcam_and_connect(self, page_widget):
-        
-        # 기존 스레드 정리
-        if self.webcam_thread and self.webcam_thread.isRunning():
+        """
+        page_widget으로 미리보기를 보낸다.
+        카메라 세션은 하나를 계속 유지하고(일시정지/재개), 장치는 처음 한 번만 연다.
+        """
+        self._active_page = page_widget
+        cam = self.webcam_thread
+        if cam is None or not cam.isRunning():
+            self._open_webcam()
+        else:
+            cam.set_display_spec(0, 0)   # 새 페이지 크기로 다시 지정될 때까지 기본 경로
+            cam.resume()
+
+        # 추적/품질 스레드는 페이지별 슬롯에 다시 연결
+        self._stop_face_track()
+        self._start_face_track(page_widget)
+
+    def _open_webcam(self):
+        # 이전 세션 정리 (비정상 종료 등)
+        if self.webcam_thread is not None:
             try:
-                self.webcam_thread.change_pixmap_signal.disconnect()
+                self.webcam_thread.frame_ready.disconnect()
             except Exception:
                 pass
             self.webcam_thread.stop()
             self.webcam_thread.wait(1500)
 
-        # 새 스레드
-        self.webcam_thread = WebcamThread(rotate=False, mirror=False)
+        self.webcam_thread = cam = WebcamThread(rotate=False, mirror=False)
 
         # --- 프리뷰 업데이트 핸들러 (페이지 시그니처 차이 대응) ---
-        def _forward_update(*args):
+        def _forward_update(page, *args):
             try:
                 # (QImage,) 또는 (QImage, frame_bgr) 모두 지원
-                page_widget.update_frame(*args)
+                page.update_frame(*args)
             except TypeError:
                 if args:
                     try:
-                        page_widget.update_frame(args[0])
+                        page.update_frame(args[0])
                     except Exception:
                         pass
 
-        # --- 마지막 프레임 보관 (OCR용) ---
-        def _stash_last(*args):
+        # --- 새 프레임 알림 → 캡처 스레드가 만든 표시용 이미지를 현재 활성 페이지에 붙이기만 함 ---
+        def _on_frame_ready():
+            cur = cam.consume_latest()
+            page = self._active_page
+            if cur is None or page is None or cam.paused:
+                return
+            # 분석용 프레임은 촬영 시 capture_frame()에서만 꺼냄 (프레임마다 변환/복사 없음)
+            # 표시 사양이 없는 페이지는 페이지 크기에 꽉 차게 (회전/거울 없음)
+            if hasattr(page, 'preview_spec'):
+                cam.set_display_spec(*page.preview_spec())
+            else:
+                cam.set_display_spec(page.width(), page.height())
+            disp = cam.latest_display()
+            if disp is None:
+                return
+            if hasattr(page, 'show_display_frame'):
+                page.show_display_frame(disp[1], disp[2])
+            else:
+                _forward_update(page, disp[1], None)
+
+        # --- 시그널 연결: 반드시 QueuedConnection (알림은 캡처 스레드에서 합쳐서 1개씩) ---
+        cam.frame_ready.connect(_on_frame_ready, type=Qt.QueuedConnection)
+
+        # 스레드 시작 (세션당 한 번만)
+        cam.start()
+        return cam
+
+    def _start_face_track(self, page_widget):
+        # 라이브 얼굴 추적 (얼굴 박스 오버레이 + 분석 시 검출 생략용)
+        if device_profile.get('face_track_enabled', True):
+            self.face_track_thread = FaceTrackThread(self.webcam_thread)
+            if hasattr(page_widget, 'set_face_track'):
+                self.face_track_thread.track_updated.connect(page_widget.set_face_track, type=Qt.QueuedConnection)
+            self.face_track_thread.start(QThread.LowPriority)
+
+        # 촬영 품질 게이트 (촬영 버튼 활성화/자동 촬영 판단용)
+        if device_profile.get('quality_gate_enabled', True) and hasattr(page_widget, 'set_capture_quality'):
+            tracker = self.face_track_thread
+
+            def _face_probe():
+                snap = tracker.snapshot(max_age_s=1.0) if tracker is not None else None
+                return snap['rect'] if snap else None
+
+            self.quality_thread = CaptureQualityThread(
+                self.webcam_thread, face_probe=_face_probe if tracker is not None else None)
+            self.quality_thread.quality_changed.connect(page_widget.set_capture_quality, type=Qt.QueuedConnection)
+            self.quality_thread.start(QThread.LowPriority)
+
+    def pause_webcam(self):
+        """분석 중/홈 화면: 장치는 열어 둔 채 미리보기 전달과 추적만 멈춤"""
+        self._stop_face_track()
+        if self.webcam_thread is not None:
+            self.webcam_thread.pause()
+
+    def _stop_face_track(self):
+        # 촬영 버튼 처리 중에 호출됨 → 진행 중인 얼굴 검출을 GUI 스레드에서 기다리지 않음
+        if self.quality_thread:
             try:
-                if len(args) == 2:
-                    # (QImage, frame_bgr) 형태
-                    self.webcam_last_frame = args[1]
-                elif len(args) == 1:
-                    # (QImage,) 형태 → QImage를 BGR ndarray로 변환
-                    qimg = args[0]
-                    if isinstance(qimg, QImage):
-                        w = qimg.width()
-                        h = qimg.height()
-                        ptr = qimg.bits()
-                        ptr.setsize(h * qimg.bytesPerLine())
-                        arr = np.frombuffer(ptr, np.uint8).reshape((h, qimg.bytesPerLine() // 3, 3))[:, :w, :]
-                        self.webcam_last_frame = cv2.cvtColor(arr, cv2.COLOR_RGB2BGR)
+                self.quality_thread.quality_changed.disconnect()
             except Exception:
-                # 변환 실패해도 앱이 죽지 않도록 무시
                 pass
-
-        # --- 시그널 연결: 반드시 QueuedConnection ---
-        from PyQt5.QtCore import Qt
-        self.webcam_thread.change_pixmap_signal.connect(_forward_update, type=Qt.QueuedConnection)
-        self.webcam_thread.change_pixmap_signal.connect(_stash_last,     type=Qt.QueuedConnection)
-
-        # 스레드 시작 (딱 한 번만)
-        self.webcam_thread.start()
-
+            self._retire_thread(self.quality_thread)
+            self.quality_thread = None
+        if self.face_track_thread:
+            try:
+                self.face_track_thread.track_updated.disconnect()
+            except Exception:
+                pass
+            self._retire_thread(self.face_track_thread)
+            self.face_track_thread = None
+
+    def _retire_thread(self, th):
+        """루프 종료만 요청하고 바로 반환. 끝나면 참조 해제 + deleteLater (실행 중 파괴 방지)"""
+        th.running = False
+        self._retiring_threads.add(th)
+        th.finished.connect(lambda th=th: self._retiring_threads.discard(th))
+        th.finished.connect(th.deleteLater)
+        if th.isFinished() or not th.isRunning():
+            self._retiring_threads.discard(th)
 
     def stop_webcam(self):
+        self._stop_face_track()
         if self.webcam_thread:
             try:
-                self.webcam_thread.change_pixmap_signal.disconnect()
+                self.webcam_thread.frame_ready.disconnect()
             except Exception:
                 pass
             if self.webcam_thread.isRunning():
@@ -674,6 +853,10 @@ class BeautyFinderApp(QMainWindow):
     # ---------------- 윈도우 ----------------
     def closeEvent(self, event):
         self.stop_webcam()
+        for th in list(self._retiring_threads):
+            th.wait(1500)
+        if self.ocr_warmup_thread is not None and self.ocr_warmup_thread.isRunning():
+            self.ocr_warmup_thread.wait(3000)
         event.accept()
 
     def center(self):
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+frame_select.py
+- 촬영 직전 짧은 연속 프레임(burst) 중 OCR에 넘길 프레임 고르기
+- 축소 gray 한 장으로 수 ms 안에 계산: 선명도 / 반사광 비율 / 글자 에지 밀도
+"""
+import cv2
+import numpy as np
+
+# 평가용 축소 폭 (해상도가 다른 정지 영상/미리보기 프레임을 같은 기준으로 비교)
+_EVAL_WIDTH = 480
+# 반사광(포화) 판정 밝기
+_GLARE_LUMA = 250
+
+
+def frame_metrics(bgr):
+    """
+    반환 dict:
+    - sharpness: 라플라시안 분산 (클수록 선명)
+    - glare: 포화 픽셀 비율 (0~1, 작을수록 좋음)
+    - text_edges: 가운데 영역의 가로 방향 강한 에지 밀도 (0~1, 글자 획이 많을수록 큼)
+    """
+    h, w = bgr.shape[:2]
+    r = _EVAL_WIDTH / float(w) if w > _EVAL_WIDTH else 1.0
+    small = cv2.resize(bgr, (int(w * r), int(h * r)), interpolation=cv2.INTER_AREA) if r < 1.0 else bgr
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    sharpness = float(cv2.Laplacian(gray, cv2.CV_64F).var())
+    glare = float(np.count_nonzero(gray >= _GLARE_LUMA)) / gray.size
+
+    # 라벨은 보통 화면 가운데 → 가운데 60% 영역의 세로 획(가로 그라디언트) 밀도
+    gh, gw = gray.shape
+    center = gray[int(gh * 0.2):int(gh * 0.8), int(gw * 0.2):int(gw * 0.8)]
+    gx = np.abs(cv2.Sobel(center, cv2.CV_16S, 1, 0, ksize=3))
+    text_edges = float(np.count_nonzero(gx > 80)) / max(1, gx.size)
+
+    return {'sharpness': sharpness, 'glare': glare, 'text_edges': text_edges}
+
+
+def _norm(values):
+    v = np.asarray(values, dtype=np.float64)
+    span = v.max() - v.min()
+    return np.zeros_like(v) if span <= 1e-9 else (v - v.min()) / span
+
+
+def rank_frames(frames, weights=(0.5, 0.3, 0.2)):
+    """
+    frames: BGR 배열 목록 (오래된 → 최신 순, 같은 해상도) → [(index, metrics), ...] 점수 높은 순.
+    점수 = burst 안에서 정규화한 선명도(log)·글자 에지·(1-반사광)의 가중합
+    """
+    if not frames:
+        return []
+    metrics = [frame_metrics(f) for f in frames]
+    sharp = _norm([np.log1p(m['sharpness']) for m in metrics])
+    edges = _norm([m['text_edges'] for m in metrics])
+    glare = _norm([m['glare'] for m in metrics])
+    w_s, w_e, w_g = weights
+    scores = w_s * sharp + w_e * edges + w_g * (1.0 - glare)
+    for m, sc in zip(metrics, scores):
+        m['score'] = round(float(sc), 4)
+    # 동점이면 나중(최신) 프레임 우선
+    order = sorted(range(len(frames)), key=lambda i: (-scores[i], -i))
+    return [(i, metrics[i]) for i in order]
+
+
+def select_best_frames(frames, k=2):
+    """점수 상위 k개 [(index, metrics), ...]"""
+    return rank_frames(frames)[:max(1, k)]
@@ -4,6 +4,8 @@ ocr_matcher.py
 - Webcam frame → EasyOCR → final.csv product matching
 - Robust fuzzy matching with numeric/token boosts
 - If confidence is low, still returns top-1 candidate ("확신 부족이어도 1등 강제표시")
+- Shares the process-wide EasyOCR reader with product_ocr (built/warmed once)
+- Product index is memoized per CSV and re-parsed only when the file changes (mtime/size → content hash)
 Python 3.6+ compatible
 """
 from __future__ import annotations
@@ -11,10 +13,13 @@ from __future__ import annotations
 import os
 import re
 import csv
+import hashlib
+import threading
 import unicodedata
 
 import cv2  # only for type hints / potential pre-processing
-import easyocr
+
+from ocr.product_ocr import get_reader
 
 # Prefer rapidfuzz; fallback to difflib
 try:
@@ -32,7 +37,7 @@ except Exception:
 # Default CSV path: ../final.csv from this file (i.e., smartmirror/final.csv)
 DEFAULT_CSV = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "final.csv"))
 NAME_COL = "name"
-USE_GPU = False  # set True if your env supports it
+# GPU use follows product_ocr.get_reader (CUDA available and not Jetson)
 
 # Normalization helpers
 _keep = re.compile(r"[^가-힣A-Za-z0-9 ]+")
@@ -103,6 +108,41 @@ def load_products(csv_path, name_col=NAME_COL):
         })
     return products
 
+def _file_digest(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+# (abs path, name_col) -> {"stat": (mtime_ns, size), "digest": str, "products": list}
+_INDEX = {}
+_INDEX_LOCK = threading.Lock()
+
+def get_product_index(csv_path, name_col=NAME_COL):
+    """
+    Memoized load_products().
+    - Same (mtime, size) as last time → cached list, no read at all
+    - Stat changed but content hash identical (e.g. touched/copied) → cached list
+    - Otherwise re-parse
+    The returned list is shared; treat it as read-only.
+    """
+    path = os.path.abspath(csv_path)
+    st = os.stat(path)
+    stat_key = (st.st_mtime_ns, st.st_size)
+    key = (path, name_col)
+    with _INDEX_LOCK:
+        ent = _INDEX.get(key)
+        if ent is not None and ent["stat"] == stat_key:
+            return ent["products"]
+        digest = _file_digest(path)
+        if ent is not None and ent["digest"] == digest:
+            ent["stat"] = stat_key
+            return ent["products"]
+        products = load_products(path, name_col)
+        _INDEX[key] = {"stat": stat_key, "digest": digest, "products": products}
+        return products
+
 def best_match_robust(texts, products, top_k=3):
     """
     texts: list[str] from OCR (raw)
@@ -181,11 +221,11 @@ def run_ocr(frame, csv_path=None, name_col=NAME_COL):
     if csv_path is None:
         csv_path = DEFAULT_CSV
 
-    products = load_products(csv_path, name_col)
+    products = get_product_index(csv_path, name_col)
     if not products:
         return {"ok": False, "reason": "no_products", "texts": [], "best": None, "top": []}
 
-    reader = easyocr.Reader(['ko', 'en'], gpu=USE_GPU)
+    reader = get_reader()
 
     # Use the raw frame (no heavy pre-processing; EasyOCR does its own)
     results = reader.readtext(frame)
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+orientation.py
+- 제품 라벨 텍스트 ROI의 방향(0/90/180/270°) 추정 — 모든 회전을 인식기에 돌리는 대신 상위 1~2개만 시도
+- 근거 1: 투영 프로파일 — 가로쓰기면 행 방향 잉크 분포가 줄/줄간격으로 크게 출렁이고 열 방향은 완만함
+- 근거 2: 텍스트 검출 박스 가로/세로 비 — 가로쓰기 줄은 넓은 박스로 묶임
+- 근거 1·2는 축(가로/세로)만 판단하고 위/아래(0↔180, 90↔270)는 구분하지 못함
+  → likely_orientations는 이긴 축의 두 방향을 항상 함께 돌려주고, 최종 선택은 인식기 신뢰도(product_ocr 탐침)로
+- upright_prior(정방향 사전확률)는 가로 축 안에서 0°를 먼저 시도하는 순서에만 쓰임
+- angle: 정방향이 되도록 ROI를 시계방향으로 돌릴 각도 (cv2.rotate 기준)
+"""
+import cv2
+import numpy as np
+
+# 투영 프로파일 계산용 축소 크기 (긴 변)
+_EVAL_SIDE = 400
+# 이보다 가로/세로 비가 1에 가까운 박스는 방향 근거로 쓰지 않음 (단일 글자 등)
+_ASPECT_MARGIN = 1.3
+
+
+def _profile_score(profile):
+    # 평균 대비 분산 (줄/간격 교차가 뚜렷할수록 큼)
+    m = float(profile.mean())
+    return float(profile.var()) / (m * m + 1e-6)
+
+
+def projection_horizontal(bw_roi):
+    """이진 ROI(글자=검정) → 가로쓰기 확률 (0~1), 잉크가 거의 없으면 None"""
+    h, w = bw_roi.shape[:2]
+    r = _EVAL_SIDE / float(max(h, w)) if max(h, w) > _EVAL_SIDE else 1.0
+    small = cv2.resize(bw_roi, (max(1, int(w * r)), max(1, int(h * r))), interpolation=cv2.INTER_AREA) if r < 1.0 else bw_roi
+    ink = (small < 128).astype(np.float32)
+    if ink.mean() < 0.005:
+        return None
+    s_rows = _profile_score(ink.mean(axis=1))
+    s_cols = _profile_score(ink.mean(axis=0))
+    return s_rows / (s_rows + s_cols + 1e-9)
+
+
+def boxes_horizontal(h_list, f_list):
+    """검출 박스 → 넓은 박스 면적 비율 (0~1), 판단할 박스가 없으면 None"""
+    wide = tall = 0.0
+    sizes = [(x1 - x0, y1 - y0) for x0, x1, y0, y1 in (h_list or [])]
+    for box in (f_list or []):
+        p = np.asarray(box, dtype=np.float32)
+        sizes.append((float(np.linalg.norm(p[1] - p[0])), float(np.linalg.norm(p[2] - p[1]))))
+    for bw, bh in sizes:
+        if bw <= 0 or bh <= 0:
+            continue
+        if bw >= bh * _ASPECT_MARGIN:
+            wide += bw * bh
+        elif bh >= bw * _ASPECT_MARGIN:
+            tall += bw * bh
+    if wide + tall <= 0:
+        return None
+    return wide / (wide + tall)
+
+
+def estimate_orientation(bw_roi, boxes=None, upright_prior=0.8):
+    """
+    bw_roi: 이진화 ROI (글자 어둡게), boxes: (horizontal_list, free_list) ROI 좌표 또는 None
+    반환 dict:
+    - candidates: [{'angle', 'p'}, ...] 확률 높은 순 (합 1)
+    - angle / confidence: 1순위
+    - p_horizontal, p_projection, p_boxes: 근거별 가로쓰기 확률 (없으면 None)
+    """
+    p_proj = projection_horizontal(bw_roi)
+    p_box = boxes_horizontal(*boxes) if boxes is not None else None
+    evidence = [p for p in (p_proj, p_box) if p is not None]
+    p_h = float(np.mean(evidence)) if evidence else 0.5
+
+    up = min(max(float(upright_prior), 0.5), 1.0)
+    probs = {0: p_h * up, 180: p_h * (1.0 - up), 90: (1.0 - p_h) * 0.5, 270: (1.0 - p_h) * 0.5}
+    # 동률이면 0 → 90 → 270 → 180 순 (90/270은 항상 동률이라 순서에 의미 없음)
+    pref = {0: 0, 90: 1, 270: 2, 180: 3}
+    cands = [{'angle': a, 'p': round(p, 4)} for a, p in sorted(probs.items(), key=lambda kv: (-kv[1], pref[kv[0]]))]
+    return {
+        'angle': cands[0]['angle'],
+        'confidence': cands[0]['p'],
+        'candidates': cands,
+        'p_horizontal': round(p_h, 4),
+        'p_projection': None if p_proj is None else round(p_proj, 4),
+        'p_boxes': None if p_box is None else round(p_box, 4),
+    }
+
+
+def likely_orientations(est, min_p=0.15):
+    """
+    추정 결과 → 시도할 각도 목록 (우선순위 순).
+    이긴 축의 두 방향은 항상 함께 (0/180 또는 90/270), 다른 축은 그 축 확률이 min_p 이상일 때만 추가
+    """
+    p_h = est['p_horizontal']
+    horizontal, vertical = [0, 180], [90, 270]
+    first, second, p_second = (horizontal, vertical, 1.0 - p_h) if p_h >= 0.5 else (vertical, horizontal, p_h)
+    return first + second if p_second >= min_p else list(first)
+
+
+def largest_boxes(h_list, f_list, k=2, min_side=8):
+    """검출 박스 → 면적 큰 순 상위 k개 (x0, y0, x1, y1) 정수 사각형 (짧은 변 min_side 미만 제외)"""
+    rects = [(x0, y0, x1, y1) for x0, x1, y0, y1 in (h_list or [])]
+    for box in (f_list or []):
+        p = np.asarray(box, dtype=np.float32)
+        rects.append((p[:, 0].min(), p[:, 1].min(), p[:, 0].max(), p[:, 1].max()))
+    rects = [tuple(int(round(float(v))) for v in r) for r in rects]
+    rects = [r for r in rects if min(r[2] - r[0], r[3] - r[1]) >= min_side]
+    rects.sort(key=lambda r: -(r[2] - r[0]) * (r[3] - r[1]))
+    return rects[:max(0, k)]
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
-import os, cv2, numpy as np, time, json, pathlib
+import os, cv2, numpy as np, time, json, pathlib, threading, atexit
+from concurrent.futures import ThreadPoolExecutor
 
 from typing import List, Tuple, Dict, Any
 try:
@@ -9,6 +10,9 @@ except Exception:
     RAPIDFUZZ = False
 
 import easyocr
+import device_profile
+from debug_dump import ocr_debug_writer
+from ocr.orientation import estimate_orientation, likely_orientations, largest_boxes
 try:
     import torch
     TORCH_OK = True
@@ -17,6 +21,7 @@ except Exception:
     TORCH_OK = False
 
 _READER = None
+_READER_LOCK = threading.Lock()
 
 # ---------------- Jetson 감지 ----------------
 def _is_jetson():
@@ -29,9 +34,14 @@ def get_reader(model_dir='./.easyocr'):
     """
     - 모델 캐시 경로 고정(첫 실행 이후 재다운로드 방지)
     - Jetson은 메모리/안정성 고려해 GPU 기본 비활성 권장
+    - 시작 시 워밍업 스레드와 첫 OCR이 겹쳐도 같은 락에서 기다려 한 번만 생성
     """
     global _READER
-    if _READER is None:
+    if _READER is not None:
+        return _READER
+    with _READER_LOCK:
+        if _READER is not None:
+            return _READER
         for_jetson = _is_jetson()
 
         use_gpu = False
@@ -126,7 +136,8 @@ def _largest_text_roi_relaxed(bw, k=3, pad_ratio=0.10):
     x1 = min(W, x1+pad); y1 = min(H, y1+pad)
     return x0,y0,(x1-x0),(y1-y0)
 
-def preprocess_for_ocr(bgr):
+def _roi_for_ocr(bgr):
+    """텍스트 ROI (BGR)와 같은 영역의 이진화 영상"""
     # 1) 기울기 보정은 기존대로 gray 기준
     base = bgr.copy()
     gray = cv2.cvtColor(base, cv2.COLOR_BGR2GRAY)
@@ -142,12 +153,14 @@ def preprocess_for_ocr(bgr):
     # 3) ROI: 상위 컨투어 합쳐 넓게 + 여유 패딩
     x,y,w,h = _largest_text_roi_relaxed(bw, k=3, pad_ratio=0.12)
     roi = base[y:y+h, x:x+w]
+    return roi, bw[y:y+h, x:x+w]
 
-    # 4) 추가 변형(광택/저대비 보완용)과 함께 앙상블
+def _photometric_variants(roi, bw_roi):
+    # 4) 추가 변형(광택/저대비 보완용)과 함께 앙상블 — 모두 ROI와 같은 좌표계
     v1 = roi
     v2 = _clahe_bgr(roi)
     v3 = _gamma(roi, 1.4)
-    v4 = cv2.cvtColor(bw[y:y+h, x:x+w], cv2.COLOR_GRAY2BGR)
+    v4 = cv2.cvtColor(bw_roi, cv2.COLOR_GRAY2BGR)
 
     # ★ Top-hat으로 밝은 배경 위 어두운 텍스트 부각
     gray_roi = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
@@ -168,9 +181,13 @@ def preprocess_for_ocr(bgr):
         ("bin",   v4),
         ("tophat", v5),     # ★ 추가
         ("sharp",  v6),     # ★ 추가
-        ("rot90",  cv2.rotate(v1, cv2.ROTATE_90_CLOCKWISE)),
-        ("rot180", cv2.rotate(v1, cv2.ROTATE_180)),
-        ("rot270", cv2.rotate(v1, cv2.ROTATE_90_COUNTERCLOCKWISE)),
+    ]
+
+def preprocess_for_ocr(bgr):
+    """사진 변형 6종 + 원본 ROI 회전 3종 (방향 추정 없이 모든 회전을 시도하던 기존 목록)"""
+    roi, bw_roi = _roi_for_ocr(bgr)
+    return _photometric_variants(roi, bw_roi) + [
+        ("rot%d" % a, _rotated(roi, a)) for a in (90, 180, 270)
     ]
 
 
@@ -215,180 +232,779 @@ def _draw_detections(bgr, res):
                     cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0,0,255), 1, cv2.LINE_AA)
     return vis
 
-def select_best(preds, brands, products):
-    def _penalty(s):
-        s2 = (s or "").strip()
-        if len(s2) <= 1:
-            return 0.25
-        if len(s2) <= 3:
-            return 0.12
-        # 허용 문자 외 비율이 높으면 감점
-        ok = set(" +-.,/&")  # 허용 특수
-        non_ok = sum(1 for ch in s2 if not ('0'<=ch<='9' or 'A'<=ch<='Z' or 'a'<=ch<='z' or '가'<=ch<='힣' or ch in ok))
-        return min(0.15, non_ok / max(1, len(s2)) * 0.2)
-
-    best = {"text":"","score":0.0,"detail":[]}
-    for txt, conf in preds:
-        t = normalize_errors(txt)
-        k = korean_ratio(t)
-        b = max((fuzzy(t,x) for x in brands), default=0.0) if brands else 0.0
-        p = max((fuzzy(t,x) for x in products), default=0.0) if products else 0.0
-        score = 0.5*conf + 0.2*k + 0.2*b + 0.1*p
-        score -= _penalty(t)  # ★ 단문자/기호 과다 시 감점
-        best["detail"].append({"text":txt,"conf":conf,"k_ratio":k,"brand":b,"prod":p,"score":score})
-        if score > best["score"]:
-            best["text"], best["score"] = txt, score
+def _penalty(s):
+    s2 = (s or "").strip()
+    if len(s2) <= 1:
+        return 0.25
+    if len(s2) <= 3:
+        return 0.12
+    # 허용 문자 외 비율이 높으면 감점
+    ok = set(" +-.,/&")  # 허용 특수
+    non_ok = sum(1 for ch in s2 if not ('0'<=ch<='9' or 'A'<=ch<='Z' or 'a'<=ch<='z' or '가'<=ch<='힣' or ch in ok))
+    return min(0.15, non_ok / max(1, len(s2)) * 0.2)
+
+def _score_pred(txt, conf, brands, products):
+    t = normalize_errors(txt)
+    k = korean_ratio(t)
+    b = max((fuzzy(t,x) for x in brands), default=0.0) if brands else 0.0
+    p = max((fuzzy(t,x) for x in products), default=0.0) if products else 0.0
+    score = 0.5*conf + 0.2*k + 0.2*b + 0.1*p
+    score -= _penalty(t)  # ★ 단문자/기호 과다 시 감점
+    return {"text":txt,"conf":conf,"k_ratio":k,"brand":b,"prod":p,"score":score}
+
+def _pick_best(detail):
+    best = {"text":"","score":0.0,"detail":detail}
+    for d in detail:
+        if d["score"] > best["score"]:
+            best["text"], best["score"] = d["text"], d["score"]
     return best
 
+def select_best(preds, brands, products):
+    return _pick_best([_score_pred(txt, conf, brands, products) for txt, conf in preds])
+
 
-def read_product_text(bgr, brand_lex=None, product_lex=None, allowlist="가-힣A-Za-z0-9()+&- .,[] ", debug=None):
+# ---------- 변형 스케줄러 ----------
+_STATS_PATH = pathlib.Path("logs/ocr") / "variant_stats.json"
+
+class VariantStats:
     """
-    debug(dict)를 넘기면:
-      - debug['dir']에 디버그 폴더 경로 기록
-      - 각 전처리/회전 버전 오버레이 이미지를 저장하고 경로를 결과에 포함
-      - 결과 dict에 'raw' / 'overlays' / 'detail' 포함
+    전처리 변형별 실행(runs)/채택(wins) 누적 — 채택 = select_best에서 최고 점수를 낸 변형.
+    승률 높은 변형부터 시도하면 조기 종료가 빨라진다. 파일이 없거나 깨졌으면 빈 통계로 시작.
+    저장은 OCR 경로 밖에서: 변경 표시만 하고 flush_s마다 최대 한 번 백그라운드 스레드로, 종료 시 flush()
     """
-    reader = get_reader()
 
-    # 디버그 준비
-    ts = time.strftime("%Y%m%d_%H%M%S")
-    dbg_dir = pathlib.Path("logs/ocr") / ts
-    if debug is not None:
-        dbg_dir.mkdir(parents=True, exist_ok=True)
-        debug["dir"] = str(dbg_dir)
-        debug["variants"] = []
+    def __init__(self, path=_STATS_PATH, flush_s=30.0):
+        self.path = pathlib.Path(path)
+        self.flush_s = float(flush_s)
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._dirty = False
+        self._saving = False
+        self._saved_at = 0.0
+        self._d = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for k, v in json.load(f).items():
+                    self._d[k] = {"runs": int(v.get("runs", 0)), "wins": int(v.get("wins", 0))}
+        except (OSError, ValueError, AttributeError):
+            self._d = {}
+
+    def win_rate(self, name):
+        s = self._d.get(name) or {}
+        # 라플라스 평활: 처음 보는 변형은 0.5
+        return (s.get("wins", 0) + 1.0) / (s.get("runs", 0) + 2.0)
+
+    def order(self, names):
+        """승률 내림차순 (동률이면 preprocess_for_ocr 기본 순서 유지)"""
+        with self._lock:
+            return sorted(names, key=lambda n: -self.win_rate(n))
+
+    def record(self, ran, winner):
+        with self._lock:
+            for n in ran:
+                self._d.setdefault(n, {"runs": 0, "wins": 0})["runs"] += 1
+            if winner:
+                self._d.setdefault(winner, {"runs": 0, "wins": 0})["wins"] += 1
+            self._dirty = True
+            due = not self._saving and time.monotonic() - self._saved_at >= self.flush_s
+            if due:
+                self._saving = True
+        if due:
+            threading.Thread(target=self._flush_bg, name="ocr-stats-save", daemon=True).start()
+
+    def _flush_bg(self):
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                self._saving = False
+
+    def flush(self):
+        """변경분이 있으면 지금 저장 (임시 파일 → 교체)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._d, ensure_ascii=False)
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        with self._io_lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_suffix(".tmp")
+                tmp.write_text(data, encoding="utf-8")
+                os.replace(str(tmp), str(self.path))
+            except OSError:
+                pass
+
+_STATS = None
+_STATS_LOCK = threading.Lock()
+
+def get_variant_stats():
+    global _STATS
+    with _STATS_LOCK:
+        if _STATS is None:
+            _STATS = VariantStats(flush_s=device_profile.get('ocr_stats_flush_s', 30.0))
+            atexit.register(_STATS.flush)
+        return _STATS
+
+def _accept_reason(d):
+    """조기 종료 조건: 종합 점수 또는 (신뢰도 + 사전 일치). 충족 시 사유 문자열"""
+    if d["score"] >= device_profile.get('ocr_accept_score', 0.7):
+        return "score"
+    if (d["conf"] >= device_profile.get('ocr_accept_min_conf', 0.4)
+            and max(d["brand"], d["prod"]) >= device_profile.get('ocr_accept_lexicon', 0.9)):
+        return "lexicon"
+    return None
+
+def _parse_lines(res, with_box=True):
+    # 라인 정리 (JSON-safe로 캐스팅)
+    lines, confs = [], []
+    for it in (res or []):
+        if isinstance(it,(list,tuple)) and len(it)>=3:
+            box, t, c = it[:3]
+        elif isinstance(it,dict):
+            box, t, c = it.get('box'), it.get('text',''), it.get('conf',0)
+        else:
+            continue
 
-    preds = []
-    raw_all = []
-    overlays = []
+        # box -> list[list[int,int]]
+        box_py = None
+        if with_box and box is not None:
+            try:
+                pts = np.asarray(box).tolist()
+            except Exception:
+                pts = box
+            box_py = [[int(float(x)), int(float(y))] for x, y in pts]
+
+        t_py = str(t) if t is not None else ""
+        c_py = float(c) if c is not None else 0.0
+
+        if t_py:
+            lines.append({"text": t_py, "conf": c_py, "box": box_py})
+            confs.append(c_py)
+    return lines, confs
+
+def _is_weak(lines, confs):
+    # 결과가 없거나, 짧으면서 신뢰도도 낮음
+    if not lines:
+        return True
+    total_len = len(" ".join([x["text"] for x in lines]))
+    return total_len < 6 and float(np.mean(confs)) < 0.55
+
+def _variant_params(brute_rotation=False):
+    # --- EasyOCR 파라미터 튜닝 (정확도 강화 / Jetson 안전값) ---
+    for_jetson = _is_jetson()
+    return dict(
+        contrast_ths=0.03,         # 경계 과강조 완화
+        adjust_contrast=0.6,
+        text_threshold=0.50,
+        low_text=0.18,
+        link_threshold=0.25,       # 파편 연결 좀 더 느슨
+        canvas_size=2048 if not for_jetson else 1280,
+        mag_ratio=1.7  if not for_jetson else 1.4,
+        slope_ths=0.2, ycenter_ths=0.5, height_ths=0.6, width_ths=0.7,
+        decoder='beamsearch',
+        # paragraph=True는 [box, text]만 돌려줘 신뢰도가 사라짐 → 라인 단위로 받아 직접 합침
+        paragraph=False,
+        # 방향 추정을 끈 경우에만 인식기가 crop마다 4방향을 모두 시도
+        rotation_info=[0, 90, 180, 270] if brute_rotation else None,
+    )
+
+# ---------- 검출 1회 / 인식 여러 번 ----------
+# 시계방향 회전각 → cv2.rotate 코드
+_ROTATE = {
+    90: cv2.ROTATE_90_CLOCKWISE,
+    180: cv2.ROTATE_180,
+    270: cv2.ROTATE_90_COUNTERCLOCKWISE,
+}
 
-    for vname, im in preprocess_for_ocr(bgr):
-        # --- EasyOCR 파라미터 튜닝 (정확도 강화 / Jetson 안전값) ---
-        for_jetson = _is_jetson()
-        params = dict(
-            contrast_ths=0.03,         # 경계 과강조 완화
-            adjust_contrast=0.6,
-            text_threshold=0.50,
-            low_text=0.18,
-            link_threshold=0.25,       # 파편 연결 좀 더 느슨
-            canvas_size=2048 if not for_jetson else 1280,
-            mag_ratio=1.7  if not for_jetson else 1.4,
+def _rotated(im, angle):
+    return cv2.rotate(im, _ROTATE[angle]) if angle else im
+# 검출 단계 파라미터 (나머지는 인식 단계로)
+_DETECT_KEYS = ('text_threshold', 'low_text', 'link_threshold', 'canvas_size', 'mag_ratio',
+                'slope_ths', 'ycenter_ths', 'height_ths', 'width_ths')
+
+def _split_params(params):
+    det = {k: v for k, v in params.items() if k in _DETECT_KEYS}
+    rec = {k: v for k, v in params.items() if k not in _DETECT_KEYS}
+    return det, rec
+
+def _rotate_point(x, y, w, h, code):
+    # 픽셀 경계 좌표 기준 (w x h 이미지를 cv2.rotate 했을 때의 위치)
+    if code == cv2.ROTATE_90_CLOCKWISE:
+        return h - y, x
+    if code == cv2.ROTATE_180:
+        return w - x, h - y
+    return y, w - x
+
+def _rotate_boxes(h_list, f_list, w, h, code):
+    """
+    EasyOCR 검출 결과를 회전 변형 좌표로 옮김.
+    - horizontal: [x_min, x_max, y_min, y_max] → 회전 후에도 축 정렬 사각형
+    - free: 4점 (tl, tr, br, bl) → 회전 후 좌상단이 첫 점이 되도록 순서를 돌림
+    """
+    hl = []
+    for x0, x1, y0, y1 in h_list:
+        (ax, ay), (bx, by) = _rotate_point(x0, y0, w, h, code), _rotate_point(x1, y1, w, h, code)
+        hl.append([int(min(ax, bx)), int(max(ax, bx)), int(min(ay, by)), int(max(ay, by))])
+    k = {cv2.ROTATE_90_CLOCKWISE: 1, cv2.ROTATE_180: 2}.get(code, 3)
+    fl = []
+    for box in f_list:
+        pts = [list(_rotate_point(float(x), float(y), w, h, code)) for x, y in box]
+        fl.append(pts[-k:] + pts[:-k])
+    return hl, fl
+
+def _contrast(im):
+    g = cv2.cvtColor(im, cv2.COLOR_BGR2GRAY) if im.ndim == 3 else im
+    return float(g.std())
+
+def _detect_source(variants):
+    """검출용 변형: 이진화를 뺀 사진 변형 중 RMS 대비가 가장 큰 것 (CRAFT는 자연 영상으로 학습됨)"""
+    cands = [(n, im) for n, im in variants if n != "bin"] or list(variants[:1])
+    return max(cands, key=lambda v: _contrast(v[1]))
+
+def _detect_boxes(reader, im, det_params):
+    h_list, f_list = reader.detect(im, **det_params)
+    return h_list[0], f_list[0]
+
+def _fallback_full(reader, bgr, allowlist, angle=None):
+    # 원본 전체 프레임 재시도 (angle: 추정 방향으로 돌려서 1방향만, None이면 4방향 모두)
+    try:
+        res2 = reader.readtext(
+            _rotated(bgr, angle or 0),
+            detail=1,
+            allowlist=allowlist,
+            blocklist="`~|{}[]<>^_=",
+            contrast_ths=0.05, adjust_contrast=0.7,
+            text_threshold=0.50, low_text=0.22, link_threshold=0.30,
+            canvas_size=1920 if not _is_jetson() else 1280,
+            mag_ratio=1.5  if not _is_jetson() else 1.3,
             slope_ths=0.2, ycenter_ths=0.5, height_ths=0.6, width_ths=0.7,
-            decoder='beamsearch',
-            paragraph=True,            # ★ 단문자 분절 줄이기
-            rotation_info=[0, 90, 180, 270],
+            decoder='beamsearch' if not _is_jetson() else 'greedy',
+            paragraph=False,
+            rotation_info=[0,90,180,270] if angle is None else None,
         )
-        # 괄호/대괄호/중괄호 등 노이즈 억제
-        allowlist = "가-힣A-Za-z0-9+&- .,/"   # ()[]{} 제거
-        blocklist  = "`~|{}[]<>^_=#:;\\"
+    except Exception:
+        res2 = []
+    return _parse_lines(res2, with_box=False)
 
-        res = reader.readtext(
-            im,
-            detail=1,
-            allowlist=allowlist,   # 한/영/숫자 위주
-            blocklist=blocklist,
-            **params
-        )
 
-        # 라인 정리 (JSON-safe로 캐스팅)
-        lines, confs = [], []
-        for it in (res or []):
-            if isinstance(it,(list,tuple)) and len(it)>=3:
-                box, t, c = it[:3]
-            elif isinstance(it,dict):
-                box, t, c = it.get('box'), it.get('text',''), it.get('conf',0)
-            else:
-                continue
+# 괄호/대괄호/중괄호 등 노이즈 억제
+_ALLOWLIST = "가-힣A-Za-z0-9+&- .,/"   # ()[]{} 제거
+_BLOCKLIST = "`~|{}[]<>^_=#:;\\"
 
-            # box -> list[list[int,int]]
-            try:
-                pts = np.asarray(box).tolist() if box is not None else None
-            except Exception:
-                pts = box
-            if pts is not None:
-                box_py = [[int(float(x)), int(float(y))] for x, y in pts]
-            else:
-                box_py = None
 
-            t_py = str(t) if t is not None else ""
-            c_py = float(c) if c is not None else 0.0
+_DEBUG_SEQ = 0
+_DEBUG_SEQ_LOCK = threading.Lock()
 
-            if t_py:
-                lines.append({"text": t_py, "conf": c_py, "box": box_py})
-                confs.append(c_py)
 
-        # Fallback: 결과가 짧거나 신뢰도 낮으면 원본 전체 프레임 재시도
-        need_fallback = False
-        avg_conf = float(np.mean(confs)) if confs else 0.0
-        if not lines:
-            need_fallback = True
-        else:
-            total_len = len(" ".join([x["text"] for x in lines]))
-            if total_len < 6 and avg_conf < 0.55:
-                need_fallback = True
+def _next_debug_seq():
+    global _DEBUG_SEQ
+    with _DEBUG_SEQ_LOCK:
+        _DEBUG_SEQ += 1
+        return _DEBUG_SEQ
 
-        if need_fallback:
-            full = bgr.copy()
-            try:
-                res2 = reader.readtext(
-                    full,
+
+def _should_dump(seq, best, accepted):
+    """
+    ocr_debug_mode에 따라 이번 장의 디버그 산출물 저장 여부 결정
+    - all: 매 장 / sample: ocr_debug_every_n장마다 1장 / failures: 실패한 장만 / off: 저장 안 함
+    - 실패: 텍스트 없음 또는 수락 기준을 넘긴 변형 없음
+    """
+    mode = str(device_profile.get('ocr_debug_mode', 'sample')).lower()
+    if mode == 'all':
+        return True
+    if mode == 'failures':
+        return not best["text"] or accepted is None
+    if mode == 'sample':
+        return seq % max(1, int(device_profile.get('ocr_debug_every_n', 10))) == 0
+    return False
+
+
+class _ShotLog:
+    """한 장(프레임) OCR의 후보·원시 라인·스케줄 기록 → 최종 결과 dict"""
+
+    def __init__(self, brand_lex=None, product_lex=None, debug=None):
+        self.brands, self.products = brand_lex or [], product_lex or []
+        self.detail, self.raw, self.overlays, self.schedule, self.ran = [], [], [], [], []
+        self.weak = True        # 지금까지 결과가 모두 빈약한지 (fallback 판단)
+        self.accepted = None    # 조기 종료를 일으킨 변형
+        self.slowest = 0.0      # 가장 오래 걸린 변형 인식 시간 (시간 예산 판단)
+        self.t0 = time.monotonic()
+        self.debug = debug
+        self.orientation = None  # 방향 추정 결과 (estimate_orientation + 'tried')
+        self._debug_items = []   # (변형, 이미지, 원시 결과, 라인) — 저장 여부는 finish에서 결정
+
+        if debug is not None:
+            debug["dir"] = None
+            debug["variants"] = []
+
+    def skip_reason(self, budget):
+        if self.accepted is not None:
+            return "accepted"
+        if self.ran and time.monotonic() - self.t0 + self.slowest > budget:
+            return "time_budget"
+        return None
+
+    def skip(self, vname, reason):
+        self.schedule.append({"variant": vname, "status": "skipped", "reason": reason})
+
+    def add(self, vname, lines, confs, entry):
+        joined = " ".join([x["text"] for x in lines]).strip()
+        joined = normalize_errors(joined)  # 오인식 보정
+        d = _score_pred(joined, float(np.mean(confs)) if confs else 0.0, self.brands, self.products)
+        d["variant"] = vname
+        self.detail.append(d)
+        self.raw.append({"variant": vname, "lines": lines})
+        entry["score"] = round(d["score"], 4)
+        return _accept_reason(d)
+
+    def record(self, vname, im, res, seconds, status="ran"):
+        """변형 하나의 인식 결과 반영 (라인 정리/점수/조기 종료 판단/오버레이)"""
+        lines, confs = _parse_lines(res)
+        self.slowest = max(self.slowest, seconds)
+        self.ran.append(vname)
+        entry = {"variant": vname, "status": status, "ms": int(seconds * 1000), "lines": len(lines)}
+        if lines:
+            why = self.add(vname, lines, confs, entry)
+            if why and self.accepted is None:
+                self.accepted = vname
+                entry["accepted"] = why
+        self.weak = self.weak and _is_weak(lines, confs)
+        self.schedule.append(entry)
+
+        # 오버레이는 참조만 보관 (그리기/인코딩/저장은 디버그 기록 스레드에서)
+        if self.debug is not None:
+            self._debug_items.append((vname, im, res or [], lines))
+
+    def fallback(self, reader, bgr, budget):
+        # Fallback: 실행한 변형 결과가 모두 짧거나 신뢰도 낮으면 원본 전체 프레임 1회 재시도
+        if not self.weak:
+            return
+        reason = self.skip_reason(budget)
+        if reason:
+            self.skip("fallback_full", reason)
+            return
+        tv = time.monotonic()
+        angle = self.orientation["angle"] if self.orientation else None
+        lines2, confs2 = _fallback_full(reader, bgr.copy(), _ALLOWLIST, angle)
+        entry = {"variant": "fallback_full", "status": "ran",
+                 "ms": int((time.monotonic() - tv) * 1000), "lines": len(lines2)}
+        if lines2:
+            self.add("fallback_full", lines2, confs2, entry)
+        self.schedule.append(entry)
+
+    def finish(self, stats, variant_names):
+        best = _pick_best(self.detail)
+        winner = None
+        if best["text"]:
+            winner = max(self.detail, key=lambda d: d["score"])["variant"]
+        stats.record(self.ran, winner if winner in variant_names else None)
+
+        best["raw"] = self.raw
+        best["overlays"] = self.overlays
+        best["schedule"] = self.schedule
+        best["winner"] = winner
+        best["orientation"] = self.orientation
+        best["elapsed_ms"] = int((time.monotonic() - self.t0) * 1000)
+
+        if self.debug is not None:
+            self.debug["orientation"] = self.orientation
+            self._dump(best)
+        return best
+
+    def _dump(self, best):
+        # 샘플링 통과 시 오버레이/JSON 저장을 예약만 하고 바로 반환 (결과는 디스크 I/O를 기다리지 않음)
+        writer = ocr_debug_writer()
+        seq = _next_debug_seq()
+        if writer is None or not _should_dump(seq, best, self.accepted):
+            return
+        shot_dir = "%s_%04d" % (time.strftime("%Y%m%d_%H%M%S"), seq)
+        quality = device_profile.get('ocr_debug_jpeg_quality', 70)
+        for vname, im, res, lines in self._debug_items:
+            out_path = writer.submit_image(f"{shot_dir}/{vname}_overlay.jpg", im, quality=quality,
+                                           render=lambda img, res=res: _draw_detections(img, res))
+            if out_path:
+                self.overlays.append(out_path)
+            self.debug["variants"].append({"name": vname, "overlay": out_path, "lines": lines})
+        self.debug["dir"] = os.path.join(writer.root_dir, shot_dir)
+        # 남은 numpy 타입은 기록 스레드에서 안전 변환
+        writer.submit_json(f"{shot_dir}/ocr_debug.json", {"best": dict(best)}, default=_json_safe)
+
+
+def _variant_boxes(boxes, angle, roi_shape):
+    h_list, f_list = boxes
+    if angle:
+        rh, rw = roi_shape[:2]
+        h_list, f_list = _rotate_boxes(h_list, f_list, rw, rh, _ROTATE[angle])
+    return h_list, f_list
+
+
+def _orientation_auto():
+    return str(device_profile.get('ocr_orientation', 'auto')).lower() == 'auto'
+
+
+def _probe_orientation(reader, roi, boxes, angles, rec_params):
+    """
+    큰 검출 박스 몇 개를 후보 각도마다 돌려 인식(greedy, 한 배치) → {각도: 평균 신뢰도}.
+    축 추정으로는 구분 못 하는 위/아래(0↔180, 90↔270)를 인식기 신뢰도로 가림. 박스가 없으면 None
+    """
+    rects = largest_boxes(*boxes, k=int(device_profile.get('ocr_orient_probe_boxes', 2))) if boxes else []
+    if not rects:
+        return None
+    rh, rw = roi.shape[:2]
+    jobs = []
+    for x0, y0, x1, y1 in rects:
+        crop = roi[max(0, y0 - 2):min(rh, y1 + 2), max(0, x0 - 2):min(rw, x1 + 2)]
+        for a in angles:
+            im = _rotated(crop, a)
+            jobs.append((im, [[0, im.shape[1], 0, im.shape[0]]], []))
+    params = dict(rec_params, decoder='greedy', rotation_info=None)
+    results = _recognize_batch(reader, jobs, params, int(device_profile.get('ocr_batch_size', 16)))
+    confs = dict((a, []) for a in angles)
+    for (a, res) in zip(list(angles) * len(rects), results):
+        confs[a].append(max([float(r[2]) for r in res] or [0.0]))
+    return dict((a, round(float(np.mean(c)), 4)) for a, c in confs.items())
+
+
+def _prepare_shot(reader, bgr, det_params, shot, detect=True, rec_params=None):
+    """
+    전처리 + (텍스트 검출 1회) + 방향 추정.
+    반환: (variants [(이름, 이미지)], angles {이름: ROI 기준 시계방향 회전각}, ROI 좌표 박스 또는 None, ROI shape)
+    - ocr_orientation='auto': 축(가로/세로)을 추정해 그 축의 두 방향(+애매하면 다른 축 두 방향)을 후보로,
+      검출 박스가 있으면 큰 박스 crop 인식 신뢰도(탐침)로 순위를 매겨 상위 2방향만 남김.
+      사진 변형 6종은 1순위 방향으로 돌리고, 나머지 후보는 원본 ROI 회전 1장씩('rot<각도>')
+    - 그 외: 기존처럼 rot90/180/270 3장 (인식기 rotation_info도 켬)
+    """
+    roi, bw_roi = _roi_for_ocr(bgr)
+    photo = _photometric_variants(roi, bw_roi)
+    boxes = None
+    if detect:
+        src_name, src_im = _detect_source(photo)
+        td = time.monotonic()
+        boxes = _detect_boxes(reader, src_im, det_params)
+        shot.schedule.append({"variant": "detect", "status": "ran", "source": src_name,
+                              "ms": int((time.monotonic() - td) * 1000),
+                              "boxes": len(boxes[0]) + len(boxes[1])})
+
+    if not _orientation_auto():
+        variants = photo + [("rot%d" % a, _rotated(roi, a)) for a in (90, 180, 270)]
+        angles = dict((n, 0) for n, _ in photo)
+        angles.update(rot90=90, rot180=180, rot270=270)
+        return variants, angles, boxes, roi.shape
+
+    est = estimate_orientation(bw_roi, boxes, upright_prior=device_profile.get('ocr_orient_upright_prior', 0.8))
+    tried = likely_orientations(est, min_p=device_profile.get('ocr_orient_second_min', 0.15))
+    probe = _probe_orientation(reader, roi, boxes, tried, rec_params) if rec_params is not None else None
+    if probe:
+        # 신뢰도 높은 순 (동률이면 추정 순서), 상위 2방향만
+        tried = sorted(tried, key=lambda a: -probe[a])[:2]
+        est["probe"] = probe
+    est["angle"] = tried[0]
+    est["tried"] = tried
+    shot.orientation = est
+
+    a1 = tried[0]
+    variants = [(n, _rotated(im, a1)) for n, im in photo]
+    angles = dict((n, a1) for n, _ in photo)
+    for a in tried[1:]:
+        variants.append(("rot%d" % a, _rotated(roi, a)))
+        angles["rot%d" % a] = a
+    return variants, angles, boxes, roi.shape
+
+
+# ---------- 병렬 실행 / 스레드 분배 ----------
+def _thread_plan():
+    """
+    (동시 작업 수, 전체 스레드 수, 작업당 스레드 수).
+    ocr_threads=0이면 코어 수-1 (캡처/UI 몫 1개), 작업마다 torch/cv2 스레드를 나눠 과다 구독 방지
+    """
+    workers = max(1, int(device_profile.get('ocr_workers', 1)))
+    total = int(device_profile.get('ocr_threads', 0)) or max(1, (os.cpu_count() or 1) - 1)
+    return workers, total, max(1, total // workers)
+
+def _set_torch_threads(n):
+    if TORCH_OK:
+        try:
+            torch.set_num_threads(int(n))
+        except Exception:
+            pass
+
+class _ThreadBudget:
+    """OCR 동안 cv2/torch 스레드 수 고정, 끝나면 원래 값으로 (cv2는 프로세스 전역)"""
+
+    def __init__(self, cv_threads, torch_threads):
+        self.cv_threads, self.torch_threads = int(cv_threads), int(torch_threads)
+        self._saved = None
+
+    def __enter__(self):
+        self._saved = (cv2.getNumThreads(), torch.get_num_threads() if TORCH_OK else None)
+        cv2.setNumThreads(self.cv_threads)
+        _set_torch_threads(self.torch_threads)
+        return self
+
+    def __exit__(self, *exc):
+        cv2.setNumThreads(self._saved[0])
+        if self._saved[1] is not None:
+            _set_torch_threads(self._saved[1])
+        return False
+
+def _in_worker(n_threads, fn, *args):
+    # torch 스레드 수는 호출 스레드 기준이라 작업 스레드마다 지정
+    _set_torch_threads(n_threads)
+    return fn(*args)
+
+def _run_in_order(names, task, shot, budget, images, pool, workers, per):
+    """
+    names 순서대로 task(vname) → (res, 초)를 실행해 shot에 기록.
+    pool이 있으면 앞의 결과를 기다리는 동안 최대 작업 수만큼 다음 변형을 미리 돌리되,
+    기록/조기 종료 판단은 항상 names 순서로 → 완료 순서와 관계없이 순차 실행과 같은 결과.
+    조기 종료 뒤에 끝난 작업은 버림('discarded'), 시간 예산 초과 시 이미 끝난 작업만 반영.
+    아직 시작 안 한 작업은 취소, 실행 중인 작업은 호출자가 pool.shutdown(wait=True)로 기다림
+    """
+    workers = workers if pool is not None else 1
+    futures = {}
+    nxt = 0
+    for i, vname in enumerate(names):
+        while pool is not None and shot.accepted is None and nxt < len(names) and nxt <= i + workers - 1:
+            futures[names[nxt]] = pool.submit(_in_worker, per, task, names[nxt])
+            nxt += 1
+        fut = futures.pop(vname, None)
+        reason = shot.skip_reason(budget)
+        if reason == "time_budget" and fut is not None and fut.done():
+            reason = None
+        if reason:
+            if fut is not None and not fut.cancel():
+                shot.skip(vname, reason)
+                shot.schedule[-1]["discarded"] = True
+            else:
+                shot.skip(vname, reason)
+            continue
+        res, seconds = fut.result() if fut is not None else task(vname)
+        shot.record(vname, images[vname], res, seconds)
+    for f in futures.values():
+        f.cancel()
+
+
+def read_product_text(bgr, brand_lex=None, product_lex=None, allowlist="가-힣A-Za-z0-9()+&- .,[] ", debug=None):
+    """
+    전처리 변형을 과거 승률 순으로 하나씩 인식하고, 충분히 확실한 후보가 나오면 나머지는 생략.
+    - 조기 종료: ocr_accept_score 이상, 또는 신뢰도 ocr_accept_min_conf 이상 + 브랜드/제품 사전 일치 ocr_accept_lexicon 이상
+    - 시간 예산: ocr_time_budget_s를 넘길 것 같으면 남은 변형 생략 (최소 1개는 실행)
+    - 원본 전체 프레임 fallback은 모든 결과가 빈약할 때 한 번만
+    - ocr_detect_once: 텍스트 검출(CRAFT)은 대비가 가장 큰 변형에서 한 번만 하고,
+      다른 변형은 같은 박스(회전 변형은 좌표 변환)로 인식 단계만 실행
+    - ocr_orientation='auto': 투영 프로파일 + 검출 박스 비율로 축을 추정하고 위/아래는 crop 인식 신뢰도로 골라
+      상위 1~2방향만 인식 (결과/디버그의 'orientation'에 추정·탐침 신뢰도·시도 각도 기록)
+    - ocr_workers > 1: 변형 인식을 스레드 풀에서 동시에 (ocr_threads를 작업 수로 나눠 torch/cv2 스레드 지정),
+      결과 반영 순서는 스케줄 순서 그대로라 완료 순서와 무관하게 같은 결과
+    - 결과 dict의 'schedule'에 변형별 실행/생략(사유)·소요 ms, detail 항목에 'variant' 기록
+
+    debug(dict)를 넘기면:
+      - ocr_debug_mode 샘플링을 통과한 장만 변형별 오버레이 + ocr_debug.json을 백그라운드로 저장
+        (debug['dir']에 폴더 경로, 저장 안 하면 None / 결과의 'overlays'에 예약된 경로, 파일은 늦게 생길 수 있음)
+      - 결과 dict에 'raw' / 'overlays' / 'detail' 포함
+    """
+    reader = get_reader()
+    shot = _ShotLog(brand_lex, product_lex, debug)
+
+    params = _variant_params(brute_rotation=not _orientation_auto())
+    det_params, rec_params = _split_params(params)
+    detect_once = bool(device_profile.get('ocr_detect_once', True))
+    budget = float(device_profile.get('ocr_time_budget_s', 8.0))
+
+    stats = get_variant_stats()
+    workers, total, per = _thread_plan()
+    with _ThreadBudget(per, total):
+        variants, angles, boxes, roi_shape = _prepare_shot(reader, bgr, det_params, shot, detect=detect_once,
+                                                           rec_params=rec_params)
+        images = dict(variants)
+
+        def _recognize(vname):
+            im = images[vname]
+            tv = time.monotonic()
+            if detect_once:
+                h_list, f_list = _variant_boxes(boxes, angles[vname], roi_shape)
+                res = reader.recognize(
+                    im, h_list, f_list,
                     detail=1,
-                    allowlist=allowlist,
-                    blocklist="`~|{}[]<>^_=",
-                    contrast_ths=0.05, adjust_contrast=0.7,
-                    text_threshold=0.50, low_text=0.22, link_threshold=0.30,
-                    canvas_size=1920 if not _is_jetson() else 1280,
-                    mag_ratio=1.5  if not _is_jetson() else 1.3,
-                    slope_ths=0.2, ycenter_ths=0.5, height_ths=0.6, width_ths=0.7,
-                    decoder='beamsearch' if not _is_jetson() else 'greedy',
-                    paragraph=False,
-                    rotation_info=[0,90,180,270],
+                    allowlist=_ALLOWLIST,
+                    blocklist=_BLOCKLIST,
+                    **rec_params
+                ) if (h_list or f_list) else []
+            else:
+                res = reader.readtext(
+                    im,
+                    detail=1,
+                    allowlist=_ALLOWLIST,   # 한/영/숫자 위주
+                    blocklist=_BLOCKLIST,
+                    **params
                 )
-            except Exception:
-                res2 = []
-
-            lines2, confs2 = [], []
-            for it in (res2 or []):
-                if isinstance(it,(list,tuple)) and len(it)>=3:
-                    box, t, c = it[:3]
-                elif isinstance(it,dict):
-                    box, t, c = it.get('box'), it.get('text',''), it.get('conf',0)
-                else:
-                    continue
-                t_py = str(t) if t is not None else ""
-                if t_py:
-                    lines2.append({"text": t_py, "conf": float(c or 0.0), "box": None})
-                    confs2.append(float(c or 0.0))
-
-            if lines2:
-                joined2 = normalize_errors(" ".join([x["text"] for x in lines2]).strip())
-                preds.append((joined2, float(np.mean(confs2)) if confs2 else 0.0))
-                raw_all.append({"variant": "fallback_full", "lines": lines2})
+            return res, time.monotonic() - tv
 
-        if lines:
-            joined = " ".join([x["text"] for x in lines]).strip()
-            joined = normalize_errors(joined)  # 오인식 보정
-            preds.append((joined, float(np.mean(confs)) if confs else 0.0))
-            raw_all.append({"variant": vname, "lines": lines})
+        pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            _set_torch_threads(per if pool is not None else total)
+            _run_in_order(stats.order([n for n, _ in variants]), _recognize, shot, budget, images, pool, workers, per)
+        finally:
+            # 버린 변형도 끝날 때까지 대기 → fallback/다음 장과 리더를 다투지 않고, 스레드 예산 안에서만 실행
+            if pool is not None:
+                pool.shutdown(wait=True)
+        _set_torch_threads(total)
+        shot.fallback(reader, bgr, budget)
+    return shot.finish(stats, images)
 
-        # 오버레이 저장
-        if debug is not None:
-            vis = _draw_detections(im, res or [])
-            out_path = str(dbg_dir / f"{vname}_overlay.jpg")
-            cv2.imwrite(out_path, vis)
-            overlays.append(out_path)
-            debug["variants"].append({"name": vname, "overlay": out_path, "lines": lines})
 
-    best = select_best(preds, brand_lex or [], product_lex or [])
-    best["raw"] = raw_all
-    best["overlays"] = overlays
+# ---------- 여러 변형·프레임 묶음 인식 ----------
+_BATCH_UNAVAILABLE = False  # EasyOCR 내부 함수 호출이 한 번 실패하면 True
 
-    # 디버그 JSON 저장 (남은 numpy 타입도 안전 변환)
-    if debug is not None:
-        with open(dbg_dir / "ocr_debug.json", "w", encoding="utf-8") as f:
-            json.dump({"best": best}, f, ensure_ascii=False, indent=2, default=_json_safe)
+def _recognize_batch(reader, jobs, rec_params, batch_size):
+    """
+    jobs: [(이미지, horizontal_list, free_list), ...] → 작업별 [(box, text, conf), ...] 목록 (Reader.recognize와 같은 형식).
+    모든 작업의 글자 영역 crop을 한 목록으로 모아 인식기를 batch_size 묶음으로 한 번 돌린다.
+    (Reader.recognize는 CPU에서 박스를 하나씩 인식해 호출 오버헤드가 박스 수만큼 반복됨)
+    EasyOCR 내부 함수가 없거나 시그니처가 달라진 버전이면 작업별 recognize로 대체.
+    """
+    global _BATCH_UNAVAILABLE
+    if not _BATCH_UNAVAILABLE:
+        try:
+            return _recognize_batch_internal(reader, jobs, rec_params, batch_size)
+        except (ImportError, AttributeError, TypeError) as e:
+            # 버전 문제는 다시 시도해도 같으므로 이후로는 바로 작업별 인식
+            _BATCH_UNAVAILABLE = True
+            print("[OCR] 배치 인식 불가 → 작업별 인식:", type(e).__name__, e)
+    return [reader.recognize(im, h, f, detail=1, allowlist=_ALLOWLIST, blocklist=_BLOCKLIST,
+                             batch_size=batch_size, **rec_params) if (h or f) else []
+            for im, h, f in jobs]
+
+def _recognize_batch_internal(reader, jobs, rec_params, batch_size):
+    # EasyOCR 1.7 내부 함수 직접 사용 (비공개 API라 인자는 모두 키워드로 넘김)
+    from easyocr.utils import get_image_list, make_rotated_img_list, set_result_with_confidence
+    from easyocr.recognition import get_text
+    character, recognizer, converter = reader.character, reader.recognizer, reader.converter
+
+    model_h = getattr(getattr(easyocr, 'easyocr', None), 'imgH', 64)
+    rotation_info = rec_params.get('rotation_info') or []
+    crops, spans, max_w = [], [], model_h
+    for im, h_list, f_list in jobs:
+        grey = cv2.cvtColor(im, cv2.COLOR_BGR2GRAY) if im.ndim == 3 else im
+        image_list, w = get_image_list(h_list, f_list, grey, model_height=model_h) if (h_list or f_list) else ([], 0)
+        n = len(image_list)
+        if rotation_info and image_list:
+            image_list = make_rotated_img_list(rotation_info, image_list)
+        spans.append((len(crops), n))
+        crops.extend(image_list)
+        max_w = max(max_w, w)
+    if not crops:
+        return [[] for _ in jobs]
+
+    ignore_char = ''.join(set(character) - set(_ALLOWLIST))
+    flat = get_text(character=character, imgH=model_h, imgW=int(max_w), recognizer=recognizer,
+                    converter=converter, image_list=crops, ignore_char=ignore_char,
+                    decoder=rec_params.get('decoder', 'greedy'), beamWidth=5, batch_size=int(batch_size),
+                    contrast_ths=rec_params.get('contrast_ths', 0.1),
+                    adjust_contrast=rec_params.get('adjust_contrast', 0.5),
+                    filter_ths=0.003, workers=0, device=reader.device)
+
+    out = []
+    for start, n in spans:
+        if n == 0:
+            out.append([])
+            continue
+        rows = [flat[start + n * i: start + n * (i + 1)] for i in range(len(rotation_info) + 1)]
+        out.append(set_result_with_confidence(rows) if rotation_info else rows[0])
+    return out
 
-    return best
+
+def process_ocr_batch(frames, brand_lex=None, product_lex=None, debug=None, batch_size=None):
+    """
+    여러 프레임(burst 상위 프레임 등)을 한 번에 OCR.
+    - 프레임마다 전처리 + 텍스트 검출 1회, 모든 프레임·변형의 글자 crop은 한 인식 배치로 처리
+      (batch_size 기본: ocr_batch_size)
+    - 반환: 프레임별 결과 dict 목록 (read_product_text와 같은 형식: text/score/detail/raw/schedule ...)
+      스케줄의 변형 항목은 status='batched', ms는 배치 전체 시간
+    - 조기 종료는 배치 특성상 적용하지 않음. fallback은 프레임별로 시간 예산 안에서만
+    - debug(dict)는 첫 프레임에만 적용
+    """
+    if not frames:
+        return []
+    reader = get_reader()
+    batch_size = int(batch_size or device_profile.get('ocr_batch_size', 16))
+    params = _variant_params(brute_rotation=not _orientation_auto())
+    det_params, rec_params = _split_params(params)
+    budget = float(device_profile.get('ocr_time_budget_s', 8.0))
+    stats = get_variant_stats()
+
+    workers, total, per = _thread_plan()
+    shots = [_ShotLog(brand_lex, product_lex, debug if k == 0 else None) for k in range(len(frames))]
+
+    with _ThreadBudget(per, total):
+        # 프레임별 전처리 + 검출은 서로 독립 → 스레드 풀에서 동시에 (결과는 프레임 순서대로)
+        if workers > 1 and len(frames) > 1:
+            pool = ThreadPoolExecutor(max_workers=min(workers, len(frames)))
+            try:
+                prepared = list(pool.map(
+                    lambda k: _in_worker(per, _prepare_shot, reader, frames[k], det_params, shots[k],
+                                         True, rec_params),
+                    range(len(frames))))
+            finally:
+                pool.shutdown(wait=True)
+        else:
+            prepared = [_prepare_shot(reader, bgr, det_params, shot, rec_params=rec_params)
+                        for bgr, shot in zip(frames, shots)]
+
+        jobs, owners, per_frame = [], [], []
+        for k, (variants, angles, boxes, roi_shape) in enumerate(prepared):
+            images = dict(variants)
+            for vname in stats.order([n for n, _ in variants]):
+                h_list, f_list = _variant_boxes(boxes, angles[vname], roi_shape)
+                jobs.append((images[vname], h_list, f_list))
+                owners.append((k, vname))
+            per_frame.append(images)
+
+        # 인식은 한 배치 → 전체 스레드 사용
+        _set_torch_threads(total)
+        tv = time.monotonic()
+        results = _recognize_batch(reader, jobs, rec_params, batch_size)
+        seconds = time.monotonic() - tv
+
+        for (k, vname), res in zip(owners, results):
+            shots[k].record(vname, per_frame[k][vname], res, seconds, status="batched")
+
+        out = []
+        for shot, images, bgr in zip(shots, per_frame, frames):
+            shot.fallback(reader, bgr, budget)
+            out.append(shot.finish(stats, images))
+    return out
+
+# ---------- 시작 시 워밍업 ----------
+def warm_up_reader():
+    """
+    리더 생성 + 설정된 canvas_size로 검출/인식 1회 (모델 역직렬화·첫 추론 메모리 할당을 앱 시작 시 미리 치름).
+    작업당 스레드 수만 써서 미리보기/얼굴 추적과 코어를 나눔.
+    반환: {'load_ms', 'infer_ms', 'canvas_size'}
+    """
+    t0 = time.monotonic()
+    reader = get_reader()
+    t1 = time.monotonic()
+
+    _, _, per = _thread_plan()
+    det_params, rec_params = _split_params(_variant_params(brute_rotation=not _orientation_auto()))
+    # CRAFT 입력이 min(canvas_size, mag_ratio * 긴 변)이 되도록 더미 크기 결정
+    side = max(64, int(det_params['canvas_size'] / det_params['mag_ratio']))
+    img = np.full((side * 3 // 4, side, 3), 255, np.uint8)
+    cv2.putText(img, "WARM UP 0123", (side // 10, side // 3), cv2.FONT_HERSHEY_SIMPLEX,
+                side / 500.0, (0, 0, 0), max(2, side // 250))
+    # 워밍업 추론 동안만 작업당 스레드 수, 끝나면 원래 값으로
+    with _ThreadBudget(per, per):
+        h_list, f_list = _detect_boxes(reader, img, det_params)
+        if not (h_list or f_list):
+            h_list = [[0, side // 2, 0, side // 8]]
+        _recognize_batch(reader, [(img, h_list, f_list)], rec_params,
+                         int(device_profile.get('ocr_batch_size', 16)))
+    t2 = time.monotonic()
+    return {'load_ms': int((t1 - t0) * 1000), 'infer_ms': int((t2 - t1) * 1000),
+            'canvas_size': det_params['canvas_size']}
 
 # 호환 래퍼
 def process_ocr(bgr, brand_lex=None, product_lex=None, allowlist="가-힣A-Za-z0-9()+&- .,[] ", debug=None):
@@ -0,0 +1,23 @@
+import logging
+from PyQt5.QtCore import QThread, pyqtSignal
+from ocr import product_ocr
+
+log = logging.getLogger(__name__)
+
+class OcrWarmupWorker(QThread):
+    """
+    앱 시작 시 EasyOCR 리더 생성 + 더미 추론 1회 (QThread.LowPriority로 start).
+    끝나면 finished_ok({'load_ms', 'infer_ms', 'canvas_size'}) / 실패 시 finished_err(메시지)
+    """
+    finished_ok = pyqtSignal(dict)
+    finished_err = pyqtSignal(str)
+
+    def run(self):
+        try:
+            info = product_ocr.warm_up_reader()
+        except Exception as e:
+            log.exception('OCR warm-up failed: %s', e)
+            self.finished_err.emit(str(e))
+            return
+        log.info('OCR warm-up done: %s', info)
+        self.finished_ok.emit(info)
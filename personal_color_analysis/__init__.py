@@ -2,5 +2,6 @@
 
 from .color_extract import DominantColors
 from .detect_face import DetectFace
-from .tone_analysis import is_warm, is_spr, is_smr
+from .face_models import get_face_models, warm_up_face_models
+from .tone_analysis import is_warm, is_spr, is_smr, classify_season
 from .personal_color import analysis
\ No newline at end of file
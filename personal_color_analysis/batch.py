@@ -0,0 +1,123 @@
+# personal_color_analysis/batch.py
+"""
+저장된 촬영 이미지를 일괄 재채점하는 헤드리스 CLI (Qt 불필요).
+tone_analysis.py 기준표를 조정한 뒤 기존 캡처 전체를 다시 돌려볼 때 사용.
+
+사용 예:
+    python -m personal_color_analysis.batch captures/ -o results.jsonl
+    python -m personal_color_analysis.batch "captures/**/*.jpg" --format csv -o results.csv -j 4
+
+- 작업은 프로세스 풀로 분산, 각 워커는 dlib 모델을 시작 시 한 번만 로드
+- 결과: 이미지별 season / tone_number / Lab·HSV 특징 / 단계별 시간(ms)
+"""
+
+import os
+import sys
+import csv
+import glob
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+REGIONS = ('cheek', 'eyebrow', 'eye')
+CSV_FIELDS = (['path', 'ok', 'error', 'season', 'tone_number', 'brightness']
+              + ['%s_%s' % (k, r) for k in ('lab_l', 'lab_b', 'hsv_s') for r in REGIONS]
+              + ['detect_ms', 'color_ms', 'total_ms'])
+
+_PREPROCESS = True
+
+
+def iter_images(inputs, recursive=False):
+    """디렉터리/글롭/파일 경로 목록 → 정렬된 이미지 경로 (중복 제거)"""
+    seen = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            pattern = os.path.join(item, '**', '*') if recursive else os.path.join(item, '*')
+            paths = glob.glob(pattern, recursive=recursive)
+        else:
+            paths = glob.glob(item, recursive=True) or [item]
+        for p in sorted(paths):
+            if p.lower().endswith(IMAGE_EXTS) and os.path.isfile(p) and p not in seen:
+                seen.add(p)
+                yield p
+
+
+def _init_worker(preprocess):
+    # 워커 프로세스마다 1회: 모델 로드 (이후 이미지마다 재사용)
+    global _PREPROCESS
+    _PREPROCESS = preprocess
+    from personal_color_analysis.face_models import get_face_models
+    get_face_models().load()
+
+
+def _analyze_path(path):
+    from personal_color_analysis.personal_color import analyze_image
+    try:
+        res = analyze_image(path, preprocess=_PREPROCESS)
+        res.update(path=path, ok=True, error=None)
+    except Exception as e:
+        res = {'path': path, 'ok': False, 'error': str(e)}
+    return res
+
+
+def _csv_row(res):
+    row = {k: res.get(k) for k in ('path', 'ok', 'error', 'season', 'tone_number', 'brightness')}
+    for k in ('lab_l', 'lab_b', 'hsv_s'):
+        for r, v in zip(REGIONS, res.get(k) or []):
+            row['%s_%s' % (k, r)] = v
+    for k in ('detect_ms', 'color_ms', 'total_ms'):
+        row[k] = (res.get('timings') or {}).get(k)
+    return row
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m personal_color_analysis.batch',
+                                 description='Batch personal-color analysis over saved images.')
+    ap.add_argument('inputs', nargs='+', help='image files, directories or glob patterns')
+    ap.add_argument('-o', '--output', default='-', help='output file (default: stdout)')
+    ap.add_argument('--format', choices=('jsonl', 'csv'), default=None,
+                    help='output format (default: from extension, else jsonl)')
+    ap.add_argument('-j', '--jobs', type=int, default=max(1, (os.cpu_count() or 2) - 1),
+                    help='worker processes')
+    ap.add_argument('-r', '--recursive', action='store_true', help='recurse into directories')
+    ap.add_argument('--no-preprocess', action='store_true',
+                    help='skip the app preprocessing (640px resize + CLAHE)')
+    args = ap.parse_args(argv)
+
+    fmt = args.format or ('csv' if args.output.lower().endswith('.csv') else 'jsonl')
+    paths = list(iter_images(args.inputs, recursive=args.recursive))
+    if not paths:
+        print('no images found', file=sys.stderr)
+        return 1
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', newline='')
+    writer = None
+    if fmt == 'csv':
+        writer = csv.DictWriter(out, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+
+    t0 = time.perf_counter()
+    n_ok = 0
+    try:
+        with ProcessPoolExecutor(max_workers=max(1, args.jobs), initializer=_init_worker,
+                                 initargs=(not args.no_preprocess,)) as pool:
+            # map은 입력 순서를 유지 → 출력이 실행마다 같은 순서
+            for res in pool.map(_analyze_path, paths, chunksize=4):
+                n_ok += bool(res['ok'])
+                if writer is not None:
+                    writer.writerow(_csv_row(res))
+                else:
+                    out.write(json.dumps(res, ensure_ascii=False) + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print('%d images, %d ok, %d failed, %.1fs' % (len(paths), n_ok, len(paths) - n_ok, time.perf_counter() - t0),
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
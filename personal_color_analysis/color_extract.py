@@ -1,40 +1,115 @@
 # personal_color_analysis/color_extract.py
 
-import cv2
 import numpy as np
-from sklearn.cluster import KMeans
-from itertools import compress
+
+# 얼굴 부위 크롭에서 폴리곤 바깥을 칠하는 색 (detect_face.extract_face_part, BGR)
+MASK_FILL_BGR = (255, 0, 0)
+
+# mode별 (양자화 비트 수, 최대 반복). fast: 5bit(32단계) 히스토그램 bin 위에서 가중 k-means
+_MODES = {
+    'fast': (5, 8),
+    'precise': (None, 30),
+}
+
+
+def _seed_centers(points, weights, k):
+    """
+    결정적 시드: 빈도가 가장 높은 색부터 고르고, 이후에는 (빈도 x 기존 중심과의 거리²)가
+    가장 큰 색을 고른다 (k-means++의 랜덤 선택을 최댓값 선택으로 바꾼 형태).
+    """
+    centers = [points[int(np.argmax(weights))]]
+    d2 = ((points - centers[0]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        score = weights * d2
+        i = int(np.argmax(score))
+        if score[i] <= 0:
+            centers.append(centers[-1])  # 색이 k개보다 적음 → 빈 클러스터로 남음
+            continue
+        centers.append(points[i])
+        d2 = np.minimum(d2, ((points - points[i]) ** 2).sum(axis=1))
+    return np.array(centers, dtype=np.float64)
+
+
+def dominant_colors_batch(pixel_sets, clusters=4, mode='fast'):
+    """
+    여러 얼굴 부위의 대표색을 한 번의 배치 k-means로 구한다 (scikit-learn 불필요, 결정적).
+    - pixel_sets: 부위별 (N_i, 3) BGR uint8 픽셀 배열 목록 (마스크 안쪽 픽셀만)
+    - mode: 'fast'(양자화 히스토그램 위에서 계산) | 'precise'(원본 픽셀 전체)
+    반환: 부위별 (colors, hist) 목록 — DominantColors.getHistogram()과 같은 형식
+          colors는 RGB, 빈도 내림차순. 빈 클러스터는 제외.
+    """
+    bits, max_iter = _MODES[mode]
+    R, K = len(pixel_sets), int(clusters)
+    out = [([], np.zeros(0))] * R
+    sets = [np.asarray(p, dtype=np.uint8).reshape(-1, 3) for p in pixel_sets]
+    live = [i for i in range(R) if len(sets[i]) > 0]
+    if not live:
+        return out
+
+    rgb = np.concatenate([sets[i][:, ::-1] for i in live])
+    rid = np.repeat(np.arange(len(live)), [len(sets[i]) for i in live])
+
+    if bits is not None:
+        # 부위별 색 히스토그램으로 압축: (부위, 양자화 색) bin의 평균색 + 픽셀 수
+        q = (rgb >> (8 - bits)).astype(np.int64)
+        code = (q[:, 0] << (2 * bits)) | (q[:, 1] << bits) | q[:, 2]
+        key = rid.astype(np.int64) << (3 * bits) | code
+        uniq, inv, cnt = np.unique(key, return_inverse=True, return_counts=True)
+        inv = inv.reshape(-1)
+        pts = np.stack([np.bincount(inv, weights=rgb[:, c], minlength=len(uniq)) for c in range(3)], axis=1)
+        pts /= cnt[:, None]
+        w = cnt.astype(np.float64)
+        prid = (uniq >> (3 * bits)).astype(np.int64)
+    else:
+        pts = rgb.astype(np.float64)
+        w = np.ones(len(pts))
+        prid = rid
+
+    L = len(live)
+    centers = np.stack([_seed_centers(pts[prid == r], w[prid == r], K) for r in range(L)])  # (L,K,3)
+
+    labels = None
+    for _ in range(max_iter):
+        d = ((pts[:, None, :] - centers[prid]) ** 2).sum(axis=2)  # (M,K)
+        new_labels = d.argmin(axis=1)
+        if labels is not None and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        idx = prid * K + labels
+        wsum = np.bincount(idx, weights=w, minlength=L * K)
+        sums = np.stack([np.bincount(idx, weights=w * pts[:, c], minlength=L * K) for c in range(3)], axis=1)
+        nz = wsum > 0
+        flat = centers.reshape(L * K, 3)
+        flat[nz] = sums[nz] / wsum[nz, None]
+        centers = flat.reshape(L, K, 3)
+
+    counts = np.bincount(prid * K + labels, weights=w, minlength=L * K).reshape(L, K)
+    for r, i in enumerate(live):
+        hist = counts[r] / counts[r].sum()
+        order = (-hist).argsort(kind='stable')
+        order = order[hist[order] > 0]
+        colors = np.floor(centers[r][order])
+        out[i] = (list(colors), hist[order])
+    return out
+
 
 class DominantColors:
     CLUSTERS = None
     IMAGE = None
     COLORS = None
-    LABELS = None
+    HIST = None
 
-    def __init__(self, image, clusters=3):
+    def __init__(self, image, clusters=3, mask=None, mode='fast'):
+        # image: BGR 크롭. mask가 있으면 마스크 안쪽 픽셀만 사용하고,
+        # 없으면 extract_face_part가 칠한 폴리곤 바깥 색(MASK_FILL_BGR)을 제외한다.
         self.CLUSTERS = clusters
-        img = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        self.IMAGE = img.reshape((img.shape[0] * img.shape[1], 3))
-
-        kmeans = KMeans(n_clusters=self.CLUSTERS, n_init=10) # n_init=10 추가
-        kmeans.fit(self.IMAGE)
-
-        self.COLORS = kmeans.cluster_centers_
-        self.LABELS = kmeans.labels_
+        if mask is not None:
+            pixels = image[mask.astype(bool)]
+        else:
+            pixels = image.reshape(-1, 3)
+            pixels = pixels[np.any(pixels != MASK_FILL_BGR, axis=1)]
+        self.IMAGE = pixels[:, ::-1]
+        self.COLORS, self.HIST = dominant_colors_batch([pixels], clusters, mode=mode)[0]
 
     def getHistogram(self):
-        numLabels = np.arange(0, self.CLUSTERS + 1)
-        (hist, _) = np.histogram(self.LABELS, bins=numLabels)
-        hist = hist.astype("float")
-        hist /= hist.sum()
-
-        colors = self.COLORS
-        colors = colors[(-hist).argsort()]
-        hist = hist[(-hist).argsort()]
-        for i in range(len(colors)):
-            colors[i] = colors[i].astype(int)
-
-        # 파란색 마스크 제거 (피부, 눈썹, 눈 색상에서 파란색을 제외)
-        fil = [colors[i][2] < 250 and colors[i][0] > 10 for i in range(len(colors))]
-        colors = list(compress(colors, fil))
-        return colors, hist
\ No newline at end of file
+        return self.COLORS, self.HIST
@@ -0,0 +1,64 @@
+# personal_color_analysis/color_science.py
+"""
+NumPy 색 변환 / 기준표 분류.
+- 색 배열을 한 번에 변환 (colormath sRGBColor → convert_color 를 색마다 부르던 것 대체)
+- 수치는 colormath 기본 변환(sRGB, D65, 2° observer)과 동일하게 맞춤
+"""
+
+import numpy as np
+
+# sRGB(D65) 선형 RGB → XYZ (colormath sRGBColor와 동일 행렬)
+_SRGB_TO_XYZ = np.array([
+    [0.412424, 0.357579, 0.180464],
+    [0.212656, 0.715158, 0.0721856],
+    [0.0193324, 0.119193, 0.950444],
+])
+# D65 기준 백색점 (2° observer)
+_D65_WHITE = np.array([0.95047, 1.0, 1.08883])
+_CIE_E = 216.0 / 24389.0
+
+
+def srgb_to_lab(rgb):
+    """
+    rgb: (..., 3) 0~255 sRGB 배열 → (..., 3) [L, a, b] (D65)
+    """
+    v = np.asarray(rgb, dtype=np.float64) / 255.0
+    lin = np.where(v <= 0.04045, v / 12.92, ((v + 0.055) / 1.055) ** 2.4)
+    t = (lin @ _SRGB_TO_XYZ.T) / _D65_WHITE
+    f = np.where(t > _CIE_E, np.cbrt(t), 7.787 * t + 16.0 / 116.0)
+    L = 116.0 * f[..., 1] - 16.0
+    a = 500.0 * (f[..., 0] - f[..., 1])
+    b = 200.0 * (f[..., 1] - f[..., 2])
+    return np.stack([L, a, b], axis=-1)
+
+
+def srgb_to_hsv(rgb):
+    """
+    rgb: (..., 3) 0~255 sRGB 배열 → (..., 3) [H(0~360), S(0~1), V(0~1)]
+    """
+    v = np.asarray(rgb, dtype=np.float64) / 255.0
+    r, g, b = v[..., 0], v[..., 1], v[..., 2]
+    vmax = v.max(axis=-1)
+    vmin = v.min(axis=-1)
+    delta = vmax - vmin
+    safe = np.where(delta == 0, 1.0, delta)
+    h = np.select(
+        [delta == 0, vmax == r, vmax == g],
+        [0.0, (60.0 * (g - b) / safe + 360.0) % 360.0, 60.0 * (b - r) / safe + 120.0],
+        60.0 * (r - g) / safe + 240.0,
+    )
+    s = np.where(vmax == 0, 0.0, 1.0 - vmin / np.where(vmax == 0, 1.0, vmax))
+    return np.stack([h, s, vmax], axis=-1)
+
+
+def nearest_reference(samples, references, weights):
+    """
+    가중 L1 거리로 가장 가까운 기준 행을 고른다 (여러 샘플/프레임을 한 번에).
+    - samples: (..., D), references: (C, D), weights: (D,)
+    반환: (idx (...), dist (..., C)). 거리가 같으면 앞쪽 기준(낮은 인덱스)을 고른다.
+    """
+    x = np.asarray(samples, dtype=np.float64)
+    ref = np.asarray(references, dtype=np.float64)
+    w = np.asarray(weights, dtype=np.float64)
+    dist = (np.abs(x[..., None, :] - ref) * w).sum(axis=-1)
+    return dist.argmin(axis=-1), dist
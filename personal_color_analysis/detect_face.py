@@ -4,17 +4,50 @@ from imutils import face_utils
 import numpy as np
 import dlib
 import cv2
+import device_profile
+from personal_color_analysis.face_models import get_face_models
+
+# 색 분석에 쓰는 얼굴 부위 (personal_color에서 이 순서로 쌍을 묶어 평균)
+FACE_REGIONS = ('left_cheek', 'right_cheek', 'left_eyebrow', 'right_eyebrow', 'left_eye', 'right_eye')
+
+def detect_face_rect(detector, gray, scale=1.0, upsample=1):
+    """
+    축소한 gray에서 HOG 검출 후 사각형을 원본 좌표로 되돌린다.
+    축소 영상에서 못 찾으면 원본 해상도(upsample 1)로 한 번 더 시도. 없으면 None.
+    """
+    scale = float(scale or 1.0)
+    if 0 < scale < 1:
+        small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        rects = detector(small, int(upsample))
+        if len(rects) > 0:
+            r = rects[0]
+            return dlib.rectangle(int(round(r.left() / scale)), int(round(r.top() / scale)),
+                                  int(round(r.right() / scale)), int(round(r.bottom() / scale)))
+    rects = detector(gray, 1)
+    return rects[0] if len(rects) > 0 else None
 
 class DetectFace:
-    def __init__(self, image_path):
-        # res 폴더의 경로를 명시
-        predictor_path = 'res/shape_predictor_68_face_landmarks.dat'
-        self.detector = dlib.get_frontal_face_detector()
-        self.predictor = dlib.shape_predictor(predictor_path)
+    def __init__(self, image, models=None, detect_scale=None, upsample=None, landmarks=None):
+        # image: BGR ndarray(메모리 경로, 권장) 또는 이미지 파일 경로
+        # landmarks: 이미 구한 68점 (FaceTracker 등) → 검출/랜드마크 예측을 건너뜀
+        # 모델은 프로세스 전역 서비스에서 재사용 (매 분석마다 100MB 재로드 방지)
+        models = models or get_face_models()
+        self.detector = models.detector
+        self.predictor = models.predictor
+        # 검출은 축소 영상에서, 랜드마크/부위 추출은 원본 해상도에서 (장치 프로파일별 배율)
+        self.detect_scale = detect_scale if detect_scale is not None else device_profile.get('face_detect_scale', 1.0)
+        self.upsample = upsample if upsample is not None else device_profile.get('face_detect_upsample', 1)
+        self.face_rect = None
+        self.landmarks = None if landmarks is None else np.asarray(landmarks, dtype=np.int32)
 
-        self.img = cv2.imread(image_path)
-        if self.img is None:
-            raise RuntimeError(f"Error: Could not read image from {image_path}")
+        if isinstance(image, np.ndarray):
+            if image.ndim != 3 or image.shape[2] != 3 or image.size == 0:
+                raise RuntimeError("Error: expected a non-empty BGR image array")
+            self.img = image
+        else:
+            self.img = cv2.imread(image)
+            if self.img is None:
+                raise RuntimeError(f"Error: Could not read image from {image}")
 
         self.right_eyebrow = []
         self.left_eyebrow = []
@@ -22,32 +55,50 @@ class DetectFace:
         self.left_eye = []
         self.left_cheek = []
         self.right_cheek = []
+        # 부위별 마스크 안쪽 픽셀 (N,3) BGR — 색 추출 엔진 입력
+        self.part_pixels = {}
 
         self.detect_face_part()
 
     def detect_face_part(self):
-        gray = cv2.cvtColor(self.img, cv2.COLOR_BGR2GRAY)
-        rects = self.detector(gray, 1)
-        if len(rects) == 0:
-            raise RuntimeError("No face detected in the image.")
+        if self.landmarks is not None:
+            h, w = self.img.shape[:2]
+            shape = self.landmarks.copy()
+            shape[:, 0] = np.clip(shape[:, 0], 0, w - 1)
+            shape[:, 1] = np.clip(shape[:, 1], 0, h - 1)
+        else:
+            gray = cv2.cvtColor(self.img, cv2.COLOR_BGR2GRAY)
+            rect = self.detect_rect(gray)
+            if rect is None:
+                raise RuntimeError("No face detected in the image.")
 
-        rect = rects[0]
-        shape = self.predictor(gray, rect)
-        shape = face_utils.shape_to_np(shape)
+            self.face_rect = rect
+            shape = self.predictor(gray, rect)
+            shape = face_utils.shape_to_np(shape)
+            self.landmarks = shape
 
         face_parts_indices = face_utils.FACIAL_LANDMARKS_IDXS
         
         # 눈썹, 눈 추출
-        self.right_eyebrow = self.extract_face_part(shape[face_parts_indices["right_eyebrow"][0]:face_parts_indices["right_eyebrow"][1]])
-        self.left_eyebrow = self.extract_face_part(shape[face_parts_indices["left_eyebrow"][0]:face_parts_indices["left_eyebrow"][1]])
-        self.right_eye = self.extract_face_part(shape[face_parts_indices["right_eye"][0]:face_parts_indices["right_eye"][1]])
-        self.left_eye = self.extract_face_part(shape[face_parts_indices["left_eye"][0]:face_parts_indices["left_eye"][1]])
+        self.right_eyebrow = self.extract_face_part(shape[face_parts_indices["right_eyebrow"][0]:face_parts_indices["right_eyebrow"][1]], "right_eyebrow")
+        self.left_eyebrow = self.extract_face_part(shape[face_parts_indices["left_eyebrow"][0]:face_parts_indices["left_eyebrow"][1]], "left_eyebrow")
+        self.right_eye = self.extract_face_part(shape[face_parts_indices["right_eye"][0]:face_parts_indices["right_eye"][1]], "right_eye")
+        self.left_eye = self.extract_face_part(shape[face_parts_indices["left_eye"][0]:face_parts_indices["left_eye"][1]], "left_eye")
 
         # 뺨 추출
         self.left_cheek = self.img[shape[29][1]:shape[33][1], shape[4][0]:shape[48][0]]
         self.right_cheek = self.img[shape[29][1]:shape[33][1], shape[54][0]:shape[12][0]]
+        self.part_pixels['left_cheek'] = self.left_cheek.reshape(-1, 3)
+        self.part_pixels['right_cheek'] = self.right_cheek.reshape(-1, 3)
+
+    def detect_rect(self, gray):
+        return detect_face_rect(self.detector, gray, self.detect_scale, self.upsample)
+
+    def region_pixels(self):
+        """FACE_REGIONS 순서의 부위별 마스크 안쪽 픽셀 목록 (폴리곤 바깥 채움색 미포함)"""
+        return [self.part_pixels.get(name, np.zeros((0, 3), np.uint8)) for name in FACE_REGIONS]
 
-    def extract_face_part(self, face_part_points):
+    def extract_face_part(self, face_part_points, name=None):
         (x, y, w, h) = cv2.boundingRect(face_part_points)
         crop = self.img[y:y+h, x:x+w].copy() # .copy() 추가
         adj_points = np.array([p - [x, y] for p in face_part_points])
@@ -55,6 +106,8 @@ class DetectFace:
         mask = np.zeros((crop.shape[0], crop.shape[1]), dtype=np.uint8)
         cv2.fillConvexPoly(mask, adj_points, 1)
         mask = mask.astype(bool)
+        if name:
+            self.part_pixels[name] = crop[mask]
         
         # 마스크를 씌우는 대신, 마스크 영역 외부에 투명도(alpha)를 추가
         # 이 코드에서는 마스크가 아닌 직접 [255, 0, 0]으로 채우므로 기존 코드 유지
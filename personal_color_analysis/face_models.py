@@ -0,0 +1,105 @@
+# personal_color_analysis/face_models.py
+
+import os
+import threading
+import logging
+
+import dlib
+
+log = logging.getLogger(__name__)
+
+PREDICTOR_PATH = 'res/shape_predictor_68_face_landmarks.dat'
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _resolve_predictor_path(path):
+    # 실행 위치(cwd) 기준 경로가 없으면 프로젝트 루트 기준으로 다시 찾는다
+    if os.path.isfile(path) or os.path.isabs(path):
+        return path
+    alt = os.path.join(_ROOT, path)
+    return alt if os.path.isfile(alt) else path
+
+
+class FaceModelService:
+    """
+    dlib 얼굴 검출기 / 68점 랜드마크 모델을 프로세스 전체에서 공유한다.
+    - shape_predictor(~100MB)는 최초 1회만 로드하고, 읽기 전용으로 모든 스레드가 같이 쓴다.
+    - frontal_face_detector는 생성 비용이 작으므로 스레드마다 하나씩 둔다(동시 호출 안전).
+    """
+
+    def __init__(self, predictor_path=PREDICTOR_PATH):
+        self.predictor_path = predictor_path
+        self._lock = threading.Lock()
+        self._predictor = None
+        self._local = threading.local()
+        self._warm_thread = None
+
+    @property
+    def predictor(self):
+        if self._predictor is None:
+            with self._lock:
+                if self._predictor is None:
+                    path = _resolve_predictor_path(self.predictor_path)
+                    if not os.path.isfile(path):
+                        raise RuntimeError(f"Error: landmark model not found: {path}")
+                    self._predictor = dlib.shape_predictor(path)
+                    log.info('dlib shape predictor loaded: %s', path)
+        return self._predictor
+
+    @property
+    def detector(self):
+        det = getattr(self._local, 'detector', None)
+        if det is None:
+            det = dlib.get_frontal_face_detector()
+            self._local.detector = det
+        return det
+
+    def is_ready(self):
+        return self._predictor is not None
+
+    def load(self):
+        """모델을 동기적으로 로드한다(이미 로드돼 있으면 즉시 반환)."""
+        self.predictor
+        self.detector
+        return self
+
+    def warm_up(self, background=True):
+        """
+        앱 시작 시 호출: 백그라운드 스레드에서 모델을 미리 올려둔다.
+        첫 분석이 먼저 시작되면 같은 락에서 기다리므로 중복 로드는 없다.
+        """
+        if self.is_ready():
+            return None
+        if not background:
+            self.load()
+            return None
+        with self._lock:
+            if self._warm_thread is not None and self._warm_thread.is_alive():
+                return self._warm_thread
+            self._warm_thread = threading.Thread(target=self._warm_up_safe, name='face-model-warmup', daemon=True)
+            self._warm_thread.start()
+            return self._warm_thread
+
+    def _warm_up_safe(self):
+        try:
+            self.load()
+        except Exception as e:
+            log.warning('face model warm-up failed: %s', e)
+
+
+_SERVICE = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_face_models():
+    """프로세스 전역 FaceModelService 싱글턴."""
+    global _SERVICE
+    if _SERVICE is None:
+        with _SERVICE_LOCK:
+            if _SERVICE is None:
+                _SERVICE = FaceModelService()
+    return _SERVICE
+
+
+def warm_up_face_models(background=True):
+    return get_face_models().warm_up(background=background)
@@ -0,0 +1,121 @@
+# personal_color_analysis/face_tracker.py
+
+import time
+import threading
+
+import cv2
+import numpy as np
+from imutils import face_utils
+
+import device_profile
+from personal_color_analysis.detect_face import detect_face_rect
+from personal_color_analysis.face_models import get_face_models
+
+# 얼굴 박스 재계산용 (턱선+눈썹 = 얼굴 외곽)
+_OUTLINE = list(range(0, 27))
+
+
+class FaceTracker:
+    """
+    라이브 미리보기용 얼굴 추적기.
+    - detect_interval_s마다 한 번만 dlib 전체 검출 + 68점 랜드마크
+    - 그 사이 프레임은 피라미드 LK 옵티컬 플로우로 68점을 따라감 (수 ms)
+    - snapshot()으로 '랜드마크를 구한 바로 그 프레임'과 랜드마크를 함께 넘겨
+      얼굴 분석이 검출을 건너뛸 수 있게 한다.
+    """
+
+    def __init__(self, models=None, detect_interval_s=None, max_age_s=None):
+        self.models = models or get_face_models()
+        self.detect_interval_s = (detect_interval_s if detect_interval_s is not None
+                                  else device_profile.get('face_track_detect_interval_s', 0.5))
+        self.max_age_s = max_age_s if max_age_s is not None else device_profile.get('face_track_max_age_s', 0.3)
+        self._lock = threading.Lock()
+        self._prev_gray = None
+        self._points = None          # (68,2) float32, 원본 좌표
+        self._last_detect = 0.0
+        self._state = None
+
+    def reset(self):
+        with self._lock:
+            self._prev_gray = None
+            self._points = None
+            self._state = None
+
+    def _full_detect(self, gray):
+        # DetectFace와 같은 축소 검출 경로 (부위 추출은 하지 않음)
+        rect = detect_face_rect(self.models.detector, gray,
+                                device_profile.get('face_detect_scale', 1.0),
+                                device_profile.get('face_detect_upsample', 1))
+        if rect is None:
+            return None
+        shape = face_utils.shape_to_np(self.models.predictor(gray, rect))
+        return shape.astype(np.float32)
+
+    def _track(self, gray):
+        p0 = self._points.reshape(-1, 1, 2)
+        p1, st, _ = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, p0, None,
+                                            winSize=(21, 21), maxLevel=3)
+        if p1 is None:
+            return None
+        # 역방향 추적으로 검증 (되돌아온 위치가 1px 넘게 어긋나면 실패로 본다)
+        p0r, st2, _ = cv2.calcOpticalFlowPyrLK(gray, self._prev_gray, p1, None,
+                                              winSize=(21, 21), maxLevel=3)
+        if p0r is None:
+            return None
+        fb = np.linalg.norm((p0 - p0r).reshape(-1, 2), axis=1)
+        good = (st.reshape(-1) == 1) & (st2.reshape(-1) == 1) & (fb < 1.0)
+        if good.mean() < 0.8:
+            return None
+        pts = p1.reshape(-1, 2)
+        # 놓친 점은 이동량 중앙값만큼 평행이동해서 채움
+        shift = np.median(pts[good] - self._points[good], axis=0)
+        pts[~good] = self._points[~good] + shift
+        return pts
+
+    def update(self, seq, frame_bgr):
+        """새 프레임 하나를 처리하고 현재 추적 상태(dict 또는 None)를 반환"""
+        gray = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY)
+        now = time.monotonic()
+        with self._lock:
+            pts, detected = None, False
+            if self._points is not None and now - self._last_detect < self.detect_interval_s:
+                pts = self._track(gray)
+            if pts is None:
+                if self._points is None and now - self._last_detect < self.detect_interval_s / 2.0:
+                    # 얼굴이 없는 상태에서 검출을 너무 자주 돌리지 않음
+                    self._prev_gray = gray
+                    return None
+                pts = self._full_detect(gray)
+                self._last_detect = now
+                detected = True
+            self._prev_gray = gray
+            self._points = pts
+            if pts is None:
+                self._state = None
+                return None
+            x, y, w, h = cv2.boundingRect(pts[_OUTLINE].astype(np.int32))
+            self._state = {
+                'seq': seq,
+                'time': now,
+                'frame': frame_bgr,
+                'landmarks': np.rint(pts).astype(np.int32),
+                'rect': (x, y, w, h),
+                'detected': detected,
+                'since_detect': now - self._last_detect,
+            }
+            return self._state
+
+    def snapshot(self, max_age_s=None):
+        """
+        신선한 추적 결과가 있으면 {'frame','landmarks','rect',...}를 반환.
+        프레임 나이가 max_age_s를 넘거나 마지막 전체 검출이 너무 오래됐으면 None.
+        """
+        max_age = self.max_age_s if max_age_s is None else max_age_s
+        with self._lock:
+            st = self._state
+            if st is None:
+                return None
+            now = time.monotonic()
+            if now - st['time'] > max_age or now - self._last_detect > 2.0 * self.detect_interval_s + max_age:
+                return None
+            return dict(st)
@@ -1,48 +1,129 @@
 # personal_color_analysis/personal_color.py
 
+import time
 import cv2
 import numpy as np
-from personal_color_analysis.tone_analysis import is_warm, is_spr, is_smr
+from personal_color_analysis.tone_analysis import classify_season, SEASONS
 from personal_color_analysis.detect_face import DetectFace
-from personal_color_analysis.color_extract import DominantColors
-from colormath.color_objects import LabColor, sRGBColor, HSVColor
-from colormath.color_conversions import convert_color
-
-def analysis(imgpath):
-    df = DetectFace(imgpath)
-    face = [df.left_cheek, df.right_cheek, df.left_eyebrow, df.right_eyebrow, df.left_eye, df.right_eye]
-    
+from personal_color_analysis.color_extract import dominant_colors_batch
+from personal_color_analysis.color_science import srgb_to_lab, srgb_to_hsv
+
+SEASON_LABELS_KO = {
+    'spring_warm': '봄웜톤(spring)',
+    'fall_warm': '가을웜톤(fall)',
+    'summer_cool': '여름쿨톤(summer)',
+    'winter_cool': '겨울쿨톤(winter)',
+}
+
+def face_part_colors(df, clusters=4, mode='fast'):
+    """
+    DetectFace 결과 → [뺨, 눈썹, 눈] 대표색(RGB) 목록.
+    6개 부위의 마스크 안쪽 픽셀만 모아 한 번의 배치 클러스터링으로 처리한다.
+    """
     temp = []
-    clusters = 4
-    for f in face:
-        dc = DominantColors(f, clusters)
-        face_part_color, _ = dc.getHistogram()
+    for face_part_color, _ in dominant_colors_batch(df.region_pixels(), clusters, mode=mode):
+        if len(face_part_color) == 0:
+            raise RuntimeError("Face region too small for color analysis.")
         temp.append(np.array(face_part_color[0]))
     cheek = np.mean([temp[0], temp[1]], axis=0)
     eyebrow = np.mean([temp[2], temp[3]], axis=0)
     eye = np.mean([temp[4], temp[5]], axis=0)
+    return [cheek, eyebrow, eye]
 
-    Lab_b, hsv_s = [], []
-    color = [cheek, eyebrow, eye]
-    for i in range(3):
-        rgb = sRGBColor(color[i][0], color[i][1], color[i][2], is_upscaled=True)
-        lab = convert_color(rgb, LabColor, through_rgb_type=sRGBColor)
-        hsv = convert_color(rgb, HSVColor, through_rgb_type=sRGBColor)
-        Lab_b.append(float(format(lab.lab_b,".2f")))
-        hsv_s.append(float(format(hsv.hsv_s,".2f"))*100)
-
-    Lab_weight = [30, 20, 5]
-    hsv_weight = [10, 1, 1]
-    
-    if(is_warm(Lab_b, Lab_weight)):
-        if(is_spr(hsv_s, hsv_weight)):
-            tone = '봄웜톤(spring)'
-        else:
-            tone = '가을웜톤(fall)'
-    else:
-        if(is_smr(hsv_s, hsv_weight)):
-            tone = '여름쿨톤(summer)'
+def color_features(colors):
+    """
+    [뺨, 눈썹, 눈] RGB 대표색 (..., 3, 3) → Lab L/b, HSV s(%) 배열.
+    기준표가 소수 둘째 자리 값으로 만들어졌으므로 같은 반올림을 유지한다.
+    """
+    rgb = np.asarray(colors, dtype=np.float64)
+    lab = srgb_to_lab(rgb)
+    hsv = srgb_to_hsv(rgb)
+    return {
+        'lab_l': np.round(lab[..., 0], 2),
+        'lab_b': np.round(lab[..., 2], 2),
+        'hsv_s': np.round(hsv[..., 1], 2) * 100,
+    }
+
+def aggregate_features(feats_list, method='median', trim=0.2):
+    """
+    여러 프레임의 color_features 결과를 항목별로 강건하게 집계한다.
+    - method='median': 중앙값 / 'trimmed': 양끝 trim 비율을 버린 평균
+    """
+    out = {}
+    for key in feats_list[0]:
+        arr = np.stack([np.asarray(f[key], dtype=np.float64) for f in feats_list])
+        if method == 'trimmed' and len(arr) >= 3:
+            k = int(len(arr) * trim)
+            arr = np.sort(arr, axis=0)[k:len(arr) - k]
+            out[key] = arr.mean(axis=0)
         else:
-            tone = '겨울쿨톤(winter)'
+            out[key] = np.median(arr, axis=0)
+    return out
+
+def tone_number(avg_lab_l):
+    """평균 Lab L → 호수('20'~'23')"""
+    if avg_lab_l >= 80:
+        return '20'
+    elif avg_lab_l >= 60:
+        return '21'
+    elif avg_lab_l >= 40:
+        return '22'
+    return '23'
+
+def prepare_frame(bgr, max_width=640):
+    """앱과 같은 전처리: 폭 max_width로 축소 + Lab L 채널 CLAHE"""
+    (h, w) = bgr.shape[:2]
+    if w > max_width:
+        r = max_width / float(w)
+        bgr = cv2.resize(bgr, (max_width, int(h * r)), interpolation=cv2.INTER_AREA)
+    lab = cv2.cvtColor(bgr, cv2.COLOR_BGR2LAB)
+    l, a, b = cv2.split(lab)
+    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+    cl = clahe.apply(l)
+    return cv2.cvtColor(cv2.merge((cl, a, b)), cv2.COLOR_LAB2BGR)
+
+def analyze_image(image, preprocess=True):
+    """
+    한 장 분석 결과를 dict로 반환 (배치 재채점/로그용).
+    - image: BGR ndarray 또는 경로, preprocess=True면 앱과 같은 prepare_frame 적용
+    keys: season, season_ko, tone_number, brightness, lab_l, lab_b, hsv_s, timings(ms)
+    """
+    t0 = time.perf_counter()
+    if not isinstance(image, np.ndarray):
+        path = image
+        image = cv2.imread(path)
+        if image is None:
+            raise RuntimeError(f"Error: Could not read image from {path}")
+    if preprocess:
+        image = prepare_frame(image)
+    t1 = time.perf_counter()
+    df = DetectFace(image)
+    t2 = time.perf_counter()
+    feats = color_features(face_part_colors(df))
+    t3 = time.perf_counter()
+    season = SEASONS[int(classify_season(feats['lab_b'], feats['hsv_s']))]
+    avg_l = float(np.mean(feats['lab_l']))
+    t4 = time.perf_counter()
+    return {
+        'season': season,
+        'season_ko': SEASON_LABELS_KO[season],
+        'tone_number': tone_number(avg_l),
+        'brightness': avg_l,
+        'lab_l': [float(v) for v in feats['lab_l']],
+        'lab_b': [float(v) for v in feats['lab_b']],
+        'hsv_s': [float(v) for v in feats['hsv_s']],
+        'timings': {
+            'prepare_ms': (t1 - t0) * 1000.0,
+            'detect_ms': (t2 - t1) * 1000.0,
+            'color_ms': (t3 - t2) * 1000.0,
+            'classify_ms': (t4 - t3) * 1000.0,
+            'total_ms': (t4 - t0) * 1000.0,
+        },
+    }
 
-    return tone
\ No newline at end of file
+def analysis(image):
+    # image: BGR ndarray 또는 이미지 경로
+    df = DetectFace(image)
+    feats = color_features(face_part_colors(df))
+    season = SEASONS[int(classify_season(feats['lab_b'], feats['hsv_s']))]
+    return SEASON_LABELS_KO[season]
@@ -1,7 +1,11 @@
 # personal_color_analysis/skin_tone_estimator.py
 
 import os
+import hashlib
 import tempfile
+import threading
+from collections import OrderedDict
+
 import cv2
 import numpy as np
 
@@ -9,6 +13,17 @@ import numpy as np
 # 패키지 내부 모듈명은 stone
 import stone
 
+try:
+    # stone.process 내부 단계를 직접 호출 (파일 왕복 없이 ndarray 전달)
+    from stone.image import process_image as _stone_process_image
+    from stone.image import build_full_palette, normalize_palette, default_tone_labels
+except Exception:
+    _stone_process_image = None
+
+# 메모리 경로를 못 쓸 때 임시 파일을 둘 RAM 디스크 (없으면 기본 임시 폴더)
+_RAM_DIR = '/dev/shm' if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK) else None
+
+
 def hex_to_bgr(hex_code: str):
     hex_code = hex_code.lstrip('#')
     r = int(hex_code[0:2], 16)
@@ -16,11 +31,18 @@ def hex_to_bgr(hex_code: str):
     b = int(hex_code[4:6], 16)
     return (b, g, r)
 
+# bgr_to_lab_L용 1x1 버퍼 (호출마다 이미지를 만들지 않고 재사용)
+_PX_BGR = np.zeros((1, 1, 3), np.uint8)
+_PX_LAB = np.zeros((1, 1, 3), np.uint8)
+_PX_LOCK = threading.Lock()
+
+
 def bgr_to_lab_L(bgr: tuple) -> float:
-    """BGR(0-255) 1픽셀을 OpenCV Lab로 변환해 L(0-255)만 반환"""
-    arr = np.uint8([[list(bgr)]])  # (1,1,3)
-    lab = cv2.cvtColor(arr, cv2.COLOR_BGR2LAB)
-    return float(lab[0, 0, 0])
+    """BGR(0-255) 1픽셀의 OpenCV 8bit Lab L(0-255) 값 (cv2.cvtColor 그대로, 미리 할당한 버퍼 재사용)"""
+    with _PX_LOCK:
+        _PX_BGR[0, 0] = bgr
+        cv2.cvtColor(_PX_BGR, cv2.COLOR_BGR2LAB, _PX_LAB)
+        return float(_PX_LAB[0, 0, 0])
 
 def map_L_to_shade(L: float) -> str:
     """
@@ -36,19 +58,78 @@ def map_L_to_shade(L: float) -> str:
     else:
         return '23'
 
-def estimate_shade_from_bgr(img_bgr: np.ndarray, palette: str = 'perla') -> dict:
+def frame_key(img_bgr: np.ndarray) -> str:
+    """결과 캐시용 프레임 해시 (shape + 픽셀 바이트)"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(img_bgr.shape).encode())
+    h.update(np.ascontiguousarray(img_bgr).data)
+    return h.hexdigest()
+
+
+class SkinToneEstimator:
     """
-    입력:  BGR 이미지 (numpy)
-    출력:  {'shade': '20'|'21'|'22'|'23', 'hex': '#RRGGBB', 'L': float, 'tone_label': str, 'accuracy': float}
-    실패 시 RuntimeError
+    SkinToneClassifier(stone) 래퍼.
+    - 팔레트/라벨은 이름별로 한 번만 구성해 재사용
+    - 가능하면 stone.image.process_image에 ndarray를 바로 넘기고,
+      불가하면 RAM 디스크 임시 파일 + stone.process로 대체
+    - (프레임 해시, 팔레트) 기준 소형 LRU 결과 캐시
     """
-    fd, tmp = tempfile.mkstemp(suffix=".png"); os.close(fd)
-    try:
-        cv2.imwrite(tmp, img_bgr)
 
-        # image_type: 'color' 고정, palette: 'perla'/'yadon-ostfeld'/'proder' 등
-        result = stone.process(tmp, 'color', palette, return_report_image=False)
-        faces = result.get('faces') or []
+    def __init__(self, cache_size=32, new_width=250):
+        self.cache_size = cache_size
+        self.new_width = new_width
+        self._palettes = {}
+        self._full_palette = None
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _palette(self, palette):
+        # stone.process와 같은 규칙으로 (색 목록, 라벨) 구성 후 캐시
+        key = palette.lower() if isinstance(palette, str) else tuple(palette)
+        with self._lock:
+            cached = self._palettes.get(key)
+            if cached is not None:
+                return cached
+            if isinstance(palette, str):
+                if self._full_palette is None:
+                    self._full_palette = build_full_palette()
+                if key not in self._full_palette:
+                    raise ValueError("Invalid palette: %s" % palette)
+                colors = self._full_palette[key]
+            else:
+                colors = normalize_palette(list(palette))
+            cached = (colors, default_tone_labels(colors, 'C'))
+            self._palettes[key] = cached
+            return cached
+
+    def _faces_in_memory(self, img_bgr, palette):
+        colors, labels = self._palette(palette)
+        records, _ = _stone_process_image(
+            img_bgr, False, False, colors, labels,
+            new_width=self.new_width, n_dominant_colors=2,
+            scaleFactor=1.1, minNeighbors=5, minSize=(90, 90),
+            threshold=0.15, verbose=False,
+        )
+        return records
+
+    def _faces_via_file(self, img_bgr, palette):
+        fd, tmp = tempfile.mkstemp(suffix=".png", dir=_RAM_DIR); os.close(fd)
+        try:
+            cv2.imwrite(tmp, img_bgr)
+            # image_type: 'color' 고정, palette: 'perla'/'yadon-ostfeld'/'proder' 등
+            result = stone.process(tmp, 'color', palette, return_report_image=False)
+            return result.get('faces') or []
+        finally:
+            try:
+                os.remove(tmp)
+            except Exception:
+                pass
+
+    def _score(self, img_bgr, palette):
+        if _stone_process_image is not None:
+            faces = self._faces_in_memory(img_bgr, palette)
+        else:
+            faces = self._faces_via_file(img_bgr, palette)
         if not faces:
             raise RuntimeError("No face detected by SkinToneClassifier")
 
@@ -62,10 +143,65 @@ def estimate_shade_from_bgr(img_bgr: np.ndarray, palette: str = 'perla') -> dict
 
         L = bgr_to_lab_L(hex_to_bgr(hex_skin))
         shade = map_L_to_shade(L)
-
         return {'shade': shade, 'hex': hex_skin, 'L': L, 'tone_label': tone_label, 'accuracy': acc}
-    finally:
-        try:
-            os.remove(tmp)
-        except Exception:
-            pass
+
+    def estimate(self, img_bgr: np.ndarray, palette='perla', key=None) -> dict:
+        """
+        입력:  BGR 이미지 (numpy), key: 미리 계산한 frame_key (생략 시 계산)
+        출력:  {'shade', 'hex', 'L', 'tone_label', 'accuracy'}
+        실패 시 RuntimeError
+        """
+        pkey = palette.lower() if isinstance(palette, str) else tuple(palette)
+        ckey = (key or frame_key(img_bgr), pkey)
+        with self._lock:
+            hit = self._cache.get(ckey)
+            if hit is not None:
+                self._cache.move_to_end(ckey)
+                return dict(hit)
+        res = self._score(img_bgr, palette)
+        with self._lock:
+            self._cache[ckey] = res
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return dict(res)
+
+    def estimate_many(self, frames, palettes=('perla',)):
+        """
+        여러 프레임 × 여러 팔레트를 한 번에 채점.
+        반환: 프레임별 {팔레트: 결과 dict 또는 {'error': str}} 리스트
+        """
+        out = []
+        for img in frames:
+            key = frame_key(img)
+            row = {}
+            for p in palettes:
+                name = p if isinstance(p, str) else ','.join(p)
+                try:
+                    row[name] = self.estimate(img, p, key=key)
+                except RuntimeError as e:
+                    row[name] = {'error': str(e)}
+            out.append(row)
+        return out
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_ESTIMATOR = None
+_ESTIMATOR_LOCK = threading.Lock()
+
+def get_estimator() -> SkinToneEstimator:
+    global _ESTIMATOR
+    with _ESTIMATOR_LOCK:
+        if _ESTIMATOR is None:
+            _ESTIMATOR = SkinToneEstimator()
+        return _ESTIMATOR
+
+def estimate_shade_from_bgr(img_bgr: np.ndarray, palette: str = 'perla') -> dict:
+    """
+    입력:  BGR 이미지 (numpy)
+    출력:  {'shade': '20'|'21'|'22'|'23', 'hex': '#RRGGBB', 'L': float, 'tone_label': str, 'accuracy': float}
+    실패 시 RuntimeError
+    """
+    return get_estimator().estimate(img_bgr, palette)
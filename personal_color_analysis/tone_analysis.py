@@ -1,40 +1,52 @@
 # personal_color_analysis/tone_analysis.py
 
-def is_warm(lab_b, a):
-    warm_b_std = [11.6518, 11.71445, 3.6484]
-    cool_b_std = [4.64255, 4.86635, 0.18735]
-
-    warm_dist = 0
-    cool_dist = 0
+import numpy as np
+from personal_color_analysis.color_science import nearest_reference
+
+# 기준표: 각 행 = [뺨, 눈썹, 눈]
+# Lab b: 웜 / 쿨
+WARM_COOL_B_STD = np.array([
+    [11.6518, 11.71445, 3.6484],
+    [4.64255, 4.86635, 0.18735],
+])
+# HSV s(%): 봄 / 가을
+SPR_FAL_S_STD = np.array([
+    [18.59296, 30.30303, 25.80645],
+    [27.13987, 39.75155, 37.5],
+])
+# HSV s(%): 여름 / 겨울
+SMR_WNT_S_STD = np.array([
+    [12.5, 21.7195, 24.77064],
+    [16.73913, 24.8276, 31.3726],
+])
+
+LAB_WEIGHT = [30, 20, 5]
+HSV_WEIGHT = [10, 1, 1]
+
+SEASONS = ('spring_warm', 'fall_warm', 'summer_cool', 'winter_cool')
+
+def _first(values, table, a):
+    # 기존 함수들과 동일하게 입력 길이만큼만 비교
+    n = len(values)
+    idx, _ = nearest_reference(np.asarray(values, dtype=np.float64)[:n], table[:, :n], np.asarray(a)[:n])
+    return bool(idx == 0)
 
-    for i in range(len(lab_b)):
-        warm_dist += abs(lab_b[i] - warm_b_std[i]) * a[i]
-        cool_dist += abs(lab_b[i] - cool_b_std[i]) * a[i]
-
-    return warm_dist <= cool_dist
+def is_warm(lab_b, a):
+    return _first(lab_b, WARM_COOL_B_STD, a)
 
 def is_spr(hsv_s, a):
-    spr_s_std = [18.59296, 30.30303, 25.80645]
-    fal_s_std = [27.13987, 39.75155, 37.5]
-
-    spr_dist = 0
-    fal_dist = 0
-
-    for i in range(len(hsv_s)):
-        spr_dist += abs(hsv_s[i] - spr_s_std[i]) * a[i]
-        fal_dist += abs(hsv_s[i] - fal_s_std[i]) * a[i]
-
-    return spr_dist <= fal_dist
+    return _first(hsv_s, SPR_FAL_S_STD, a)
 
 def is_smr(hsv_s, a):
-    smr_s_std = [12.5, 21.7195, 24.77064]
-    wnt_s_std = [16.73913, 24.8276, 31.3726]
-    
-    smr_dist = 0
-    wnt_dist = 0
-    
-    for i in range(len(hsv_s)):
-        smr_dist += abs(hsv_s[i] - smr_s_std[i]) * a[i]
-        wnt_dist += abs(hsv_s[i] - wnt_s_std[i]) * a[i]
-        
-    return smr_dist <= wnt_dist
\ No newline at end of file
+    return _first(hsv_s, SMR_WNT_S_STD, a)
+
+def classify_season(lab_b, hsv_s, lab_weight=LAB_WEIGHT, hsv_weight=HSV_WEIGHT):
+    """
+    여러 샘플/프레임을 한 번에 분류한다.
+    - lab_b, hsv_s: (..., 3) [뺨, 눈썹, 눈]
+    반환: (...) SEASONS 인덱스 배열 (0 봄웜, 1 가을웜, 2 여름쿨, 3 겨울쿨)
+    """
+    warm_idx, _ = nearest_reference(lab_b, WARM_COOL_B_STD, lab_weight)
+    spr_idx, _ = nearest_reference(hsv_s, SPR_FAL_S_STD, hsv_weight)
+    smr_idx, _ = nearest_reference(hsv_s, SMR_WNT_S_STD, hsv_weight)
+    return np.where(warm_idx == 0, spr_idx, 2 + smr_idx)
@@ -1,7 +1,9 @@
 import cv2, logging
 from PyQt5.QtCore import QThread, pyqtSignal
-from ocr.product_ocr import process_ocr
+from ocr.product_ocr import process_ocr, process_ocr_batch
 from ocr import product_ocr, ocr_matcher
+from ocr.frame_select import select_best_frames
+import device_profile
 
 try:
     from rapidfuzz import process as rf_process, fuzz as rf_fuzz
@@ -15,10 +17,39 @@ class ProductAnalysisWorker(QThread):
     finished_ok = pyqtSignal(dict)
     finished_err = pyqtSignal(str)
 
-    def __init__(self, img_bgr, db_manager, parent=None):
+    def __init__(self, img_bgr, db_manager, parent=None, burst=None):
+        """
+        burst: 촬영 직전 미리보기 프레임 사본 목록 (오래된 → 최신 순, 점수 상위 프레임만 img_bgr에 더해 OCR)
+        """
         super().__init__(parent)
         self.img_bgr = img_bgr
         self.db = db_manager
+        self.burst = [f for f in (burst or []) if f is not None and f.size]
+
+    def _prepare(self, img):
+        # 고해상도 정지 영상이 올 수 있으므로 비율 유지, 긴 변만 ocr_max_side로 제한
+        frame = img
+        h, w = frame.shape[:2]
+        max_side = device_profile.get('ocr_max_side', 1920)
+        if max(h, w) > max_side:
+            r = max_side / float(max(h, w))
+            frame = cv2.resize(frame, (int(w * r), int(h * r)), interpolation=cv2.INTER_AREA)
+
+        MIRROR_INPUT = True
+        if MIRROR_INPUT:
+            frame = cv2.flip(frame, 1)
+        return frame
+
+    def _pick_frames(self):
+        """
+        촬영(고해상도) 프레임은 항상 포함 + burst 중 선명도/반사광/글자 에지 점수 상위 k-1장 → (프레임 목록, 지표 목록).
+        해상도가 다른 정지 영상과 미리보기 프레임은 상대 점수로 비교하지 않음 (index는 burst 안 순번 + 1)
+        """
+        k = device_profile.get('ocr_burst_top_k', 2)
+        if not self.burst or k <= 1:
+            return [self.img_bgr], []
+        ranked = select_best_frames(self.burst, k=k - 1)
+        return [self.img_bgr] + [self.burst[i] for i, _ in ranked], [dict(m, index=i + 1) for i, m in ranked]
 
     def _fuzzy_lookup(self, text, limit=5):
         try:
@@ -44,11 +75,8 @@ class ProductAnalysisWorker(QThread):
                 self.finished_err.emit('카메라 프레임이 비어있습니다.')
                 return
 
-            frame = cv2.resize(self.img_bgr, (640, 480), interpolation=cv2.INTER_AREA)
-
-            MIRROR_INPUT = True
-            if MIRROR_INPUT:
-                frame = cv2.flip(frame, 1)
+            frames, frame_scores = self._pick_frames()
+            log.info('OCR frames: %d candidates → %s', 1 + len(self.burst), frame_scores)
 
             # 0) 사전 (있으면 인식 품질↑)
             try:
@@ -64,7 +92,22 @@ class ProductAnalysisWorker(QThread):
 
             # 1) OCR (+ 디버그 수집)
             dbg = {}
-            ocr = process_ocr(frame, brand_lex=brands, product_lex=prods, debug=dbg)
+            ocr = None
+            if len(frames) > 1 and device_profile.get('ocr_batch_frames', True):
+                # 상위 프레임 전부를 한 인식 배치로 → 점수 최고 결과 (동점이면 프레임 점수 순)
+                results = process_ocr_batch([self._prepare(img) for img in frames],
+                                            brand_lex=brands, product_lex=prods, debug=dbg)
+                ocr = max(results, key=lambda r: r.get('score', 0.0))
+            else:
+                # 점수 1위 프레임부터, 충분히 확실하면 나머지는 생략
+                accept = device_profile.get('ocr_burst_accept_score', 0.6)
+                for k, img in enumerate(frames):
+                    res = process_ocr(self._prepare(img), brand_lex=brands, product_lex=prods,
+                                      debug=dbg if k == 0 else None)
+                    if ocr is None or res.get('score', 0.0) > ocr.get('score', 0.0):
+                        ocr = res
+                    if ocr.get('text') and ocr.get('score', 0.0) >= accept:
+                        break
             log.info('OCR result: %s', ocr)
 
             text = (ocr.get('text') if isinstance(ocr, dict) else str(ocr)).strip()
@@ -103,8 +146,10 @@ class ProductAnalysisWorker(QThread):
                 'ocr_text': text,
                 'ocr_detail': (ocr.get('detail') if isinstance(ocr, dict) else None),
                 'ocr_debug_dir': dbg.get('dir'),
+                'ocr_frames': frame_scores,
                 'ocr_overlays': ocr.get('overlays', []),
                 'ocr_raw': ocr.get('raw', []),
+                'ocr_schedule': ocr.get('schedule', []),
                 'found_product': picked,
                 'direct_hits': direct_rows,
                 'fuzzy_hits': fuzzy_rows,
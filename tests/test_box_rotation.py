@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""검출 1회 + 회전 변형: 박스 좌표 변환이 cv2.rotate와 일치하고 왕복하면 원래대로"""
+import cv2
+import numpy as np
+import pytest
+
+pytest.importorskip("easyocr")
+from ocr import product_ocr as po  # noqa: E402
+
+W, H = 64, 40
+CODES = [cv2.ROTATE_90_CLOCKWISE, cv2.ROTATE_180, cv2.ROTATE_90_COUNTERCLOCKWISE]
+INVERSE = {cv2.ROTATE_90_CLOCKWISE: cv2.ROTATE_90_COUNTERCLOCKWISE,
+           cv2.ROTATE_180: cv2.ROTATE_180,
+           cv2.ROTATE_90_COUNTERCLOCKWISE: cv2.ROTATE_90_CLOCKWISE}
+H_BOXES = [[5, 30, 3, 12], [40, 63, 20, 39], [0, 64, 0, 40]]
+F_BOXES = [[[10, 5], [30, 8], [28, 18], [8, 15]]]
+
+
+def _rotated_size(code):
+    return (W, H) if code == cv2.ROTATE_180 else (H, W)
+
+
+@pytest.mark.parametrize("code", CODES)
+def test_horizontal_boxes_match_cv2_rotate(code):
+    for x0, x1, y0, y1 in H_BOXES:
+        img = np.zeros((H, W), np.uint8)
+        img[y0:y1, x0:x1] = 255
+        ys, xs = np.nonzero(cv2.rotate(img, code))
+        hl, _ = po._rotate_boxes([[x0, x1, y0, y1]], [], W, H, code)
+        assert hl == [[xs.min(), xs.max() + 1, ys.min(), ys.max() + 1]]
+
+
+@pytest.mark.parametrize("code", CODES)
+def test_round_trip(code):
+    hl, fl = po._rotate_boxes(H_BOXES, F_BOXES, W, H, code)
+    rw, rh = _rotated_size(code)
+    back_h, back_f = po._rotate_boxes(hl, fl, rw, rh, INVERSE[code])
+    assert back_h == H_BOXES
+    np.testing.assert_allclose(np.array(back_f, float), np.array(F_BOXES, float), atol=1e-9)
+
+
+@pytest.mark.parametrize("code", CODES)
+def test_free_box_starts_top_left(code):
+    _, fl = po._rotate_boxes([], F_BOXES, W, H, code)
+    pts = np.array(fl[0])
+    # 회전 후에도 (tl, tr, br, bl) 순서: 첫 점이 x+y 최소
+    assert int(np.argmin(pts.sum(axis=1))) == 0
+
+
+def test_variant_boxes_uses_roi_shape():
+    boxes = (H_BOXES, F_BOXES)
+    assert po._variant_boxes(boxes, 0, (H, W, 3)) == boxes
+    hl, _ = po._variant_boxes(boxes, 90, (H, W, 3))
+    assert hl == po._rotate_boxes(H_BOXES, F_BOXES, W, H, cv2.ROTATE_90_CLOCKWISE)[0]
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""dominant_colors_batch: 결정성 / 배치·단일 결과 일치 / 분리된 색 클러스터 복원"""
+import numpy as np
+import pytest
+
+from personal_color_analysis.color_extract import dominant_colors_batch, DominantColors, MASK_FILL_BGR
+
+
+def _blobs(rng, centers_bgr, counts, noise=4.0):
+    pts = [np.clip(rng.normal(c, noise, size=(n, 3)), 0, 255) for c, n in zip(centers_bgr, counts)]
+    return np.concatenate(pts).astype(np.uint8)
+
+
+@pytest.mark.parametrize("mode", ["fast", "precise"])
+def test_deterministic(mode):
+    rng = np.random.default_rng(0)
+    sets = [rng.integers(0, 256, (500, 3), dtype=np.uint8) for _ in range(3)]
+    a = dominant_colors_batch(sets, clusters=4, mode=mode)
+    b = dominant_colors_batch(sets, clusters=4, mode=mode)
+    for (ca, ha), (cb, hb) in zip(a, b):
+        np.testing.assert_array_equal(np.array(ca), np.array(cb))
+        np.testing.assert_array_equal(ha, hb)
+
+
+@pytest.mark.parametrize("mode", ["fast", "precise"])
+def test_batch_matches_single(mode):
+    rng = np.random.default_rng(1)
+    sets = [_blobs(rng, [(40, 80, 200), (200, 180, 160)], [300, 100]),
+            _blobs(rng, [(20, 20, 20), (90, 120, 150), (230, 230, 230)], [50, 150, 80])]
+    batch = dominant_colors_batch(sets, clusters=3, mode=mode)
+    for s, (colors, hist) in zip(sets, batch):
+        c1, h1 = dominant_colors_batch([s], clusters=3, mode=mode)[0]
+        np.testing.assert_allclose(np.array(colors), np.array(c1))
+        np.testing.assert_allclose(hist, h1)
+
+
+@pytest.mark.parametrize("mode", ["fast", "precise"])
+def test_recovers_separated_clusters(mode):
+    rng = np.random.default_rng(2)
+    bgr = [(40, 80, 200), (200, 180, 160)]
+    colors, hist = dominant_colors_batch([_blobs(rng, bgr, [700, 300])], clusters=2, mode=mode)[0]
+    # 빈도 내림차순, RGB로 반환
+    np.testing.assert_allclose(hist, [0.7, 0.3], atol=1e-9)
+    np.testing.assert_allclose(colors[0], bgr[0][::-1], atol=3.0)
+    np.testing.assert_allclose(colors[1], bgr[1][::-1], atol=3.0)
+
+
+def test_matches_kmeans_centers():
+    KMeans = pytest.importorskip("sklearn.cluster").KMeans
+    rng = np.random.default_rng(3)
+    px = _blobs(rng, [(30, 60, 120), (120, 160, 210), (220, 220, 230)], [400, 250, 150], noise=6.0)
+    colors, _ = dominant_colors_batch([px], clusters=3, mode="precise")[0]
+    km = KMeans(n_clusters=3, n_init=10, random_state=0).fit(px[:, ::-1].astype(np.float64))
+    ref = sorted(map(tuple, km.cluster_centers_))
+    got = sorted(map(tuple, np.array(colors)))
+    np.testing.assert_allclose(got, ref, atol=1.0)
+
+
+def test_empty_sets_and_mask_fill():
+    rng = np.random.default_rng(4)
+    out = dominant_colors_batch([np.zeros((0, 3), np.uint8), rng.integers(0, 256, (50, 3), dtype=np.uint8)])
+    assert out[0][0] == [] and len(out[0][1]) == 0
+    assert abs(out[1][1].sum() - 1.0) < 1e-9
+
+    # 마스크 없이 넘기면 폴리곤 바깥 채움색은 대표색에서 빠짐
+    crop = np.empty((10, 10, 3), np.uint8)
+    crop[:] = MASK_FILL_BGR
+    crop[:5] = (50, 100, 150)
+    colors, hist = DominantColors(crop, clusters=2).getHistogram()
+    assert len(colors) == 1 and hist[0] == 1.0
+    np.testing.assert_allclose(colors[0], (150, 100, 50))
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""color_science: colormath 기본 변환(sRGB, D65, 2°)과 수치 일치 / 기준표 최근접"""
+import numpy as np
+import pytest
+
+from personal_color_analysis.color_science import srgb_to_lab, srgb_to_hsv, nearest_reference
+
+colormath = pytest.importorskip("colormath")
+from colormath.color_objects import LabColor, sRGBColor, HSVColor  # noqa: E402
+from colormath.color_conversions import convert_color  # noqa: E402
+
+
+def _random_rgb(n=300, seed=0):
+    rgb = np.random.default_rng(seed).integers(0, 256, (n, 3))
+    # 경계값(검정/흰색/무채색/원색)도 포함
+    extra = np.array([[0, 0, 0], [255, 255, 255], [128, 128, 128], [255, 0, 0], [0, 255, 0], [0, 0, 255]])
+    return np.concatenate([rgb, extra])
+
+
+def test_srgb_to_lab_matches_colormath():
+    rgb = _random_rgb()
+    ref = np.array([convert_color(sRGBColor(*c, is_upscaled=True), LabColor).get_value_tuple() for c in rgb])
+    np.testing.assert_allclose(srgb_to_lab(rgb), ref, atol=1e-6)
+
+
+def test_srgb_to_hsv_matches_colormath():
+    rgb = _random_rgb(seed=1)
+    ref = np.array([convert_color(sRGBColor(*c, is_upscaled=True), HSVColor).get_value_tuple() for c in rgb])
+    np.testing.assert_allclose(srgb_to_hsv(rgb), ref, atol=1e-9)
+
+
+def test_batch_shape_and_single_color():
+    rgb = _random_rgb(seed=2)[:12].reshape(3, 4, 3)
+    lab = srgb_to_lab(rgb)
+    assert lab.shape == (3, 4, 3)
+    np.testing.assert_allclose(lab[1, 2], srgb_to_lab(rgb[1, 2]))
+
+
+def test_nearest_reference_matches_loop_and_ties():
+    rng = np.random.default_rng(3)
+    refs = rng.uniform(0, 100, (4, 3))
+    w = np.array([1.0, 0.5, 2.0])
+    samples = rng.uniform(0, 100, (5, 7, 3))
+    idx, dist = nearest_reference(samples, refs, w)
+    assert idx.shape == (5, 7) and dist.shape == (5, 7, 4)
+    for s, i in zip(samples.reshape(-1, 3), idx.reshape(-1)):
+        d = [float((np.abs(s - r) * w).sum()) for r in refs]
+        assert i == int(np.argmin(d))
+    # 동률이면 앞쪽 기준
+    idx, _ = nearest_reference([5.0, 0.0, 0.0], [[10.0, 0, 0], [0.0, 0, 0]], [1, 1, 1])
+    assert int(idx) == 0
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""FrameRing: 최신 프레임 우선 / 읽기 전용 뷰 / 슬롯 재사용 / 나이 제한"""
+import time
+
+import numpy as np
+import pytest
+
+from webcam_thread.frame_ring import FrameRing
+
+
+def _push(ring, value, shape=(4, 6, 3)):
+    idx, buf = ring.writable(shape)
+    buf[:] = value
+    return ring.commit(idx)
+
+
+def test_empty_ring():
+    ring = FrameRing(4)
+    assert ring.latest() is None
+    assert ring.last(3) == []
+    assert ring.get(1) is None
+    assert ring.seq == 0
+
+
+def test_latest_and_last_order():
+    ring = FrameRing(4)
+    seqs = [_push(ring, v) for v in (10, 20, 30, 40, 50)]
+    assert seqs == [1, 2, 3, 4, 5]
+    seq, frame = ring.latest()
+    assert seq == 5 and frame[0, 0, 0] == 50
+    # 최대 slots-1개, 오래된 → 최신 순
+    last = ring.last(10)
+    assert [s for s, _ in last] == [3, 4, 5]
+    assert [int(f[0, 0, 0]) for _, f in last] == [30, 40, 50]
+
+
+def test_views_are_read_only_and_slots_are_reused():
+    ring = FrameRing(2)
+    _push(ring, 1)
+    _, frame = ring.latest()
+    with pytest.raises(ValueError):
+        frame[0, 0, 0] = 7
+    first_buf = ring._bufs[0]
+    _push(ring, 2)
+    _push(ring, 3)
+    assert ring._bufs[0] is first_buf          # 같은 크기면 재할당 없음
+    assert ring.get(1) is None                 # 덮어쓴 프레임은 조회 불가
+    assert int(ring.get(3)[0, 0, 0]) == 3
+
+
+def test_slot_being_written_is_hidden():
+    ring = FrameRing(3)
+    _push(ring, 1)
+    _push(ring, 2)
+    idx, buf = ring.writable((4, 6, 3))
+    # commit 전 슬롯은 get/last에 나오지 않음
+    assert [s for s, _ in ring.last(5)] == [1, 2]
+    buf[:] = 9
+    ring.commit(idx)
+    assert ring.latest()[0] == 3
+
+
+def test_resolution_change_reallocates_slot():
+    ring = FrameRing(2)
+    _push(ring, 1, shape=(4, 6, 3))
+    _push(ring, 2, shape=(8, 12, 3))
+    seq, frame = ring.latest()
+    assert seq == 2 and frame.shape == (8, 12, 3)
+
+
+def test_max_age_filters_old_frames():
+    ring = FrameRing(4)
+    _push(ring, 1)
+    time.sleep(0.05)
+    _push(ring, 2)
+    _push(ring, 3)
+    assert [s for s, _ in ring.last(3, max_age_s=0.03)] == [2, 3]
+    assert [s for s, _ in ring.last(3, max_age_s=1.0)] == [1, 2, 3]
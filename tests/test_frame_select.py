@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""frame_select: 선명도/반사광/글자 에지 지표와 burst 순위"""
+import cv2
+import numpy as np
+
+from ocr.frame_select import frame_metrics, rank_frames, select_best_frames
+
+
+def _label(seed=0, size=(480, 640)):
+    rng = np.random.default_rng(seed)
+    img = np.full(size + (3,), 200, np.uint8)
+    for i in range(6):
+        cv2.putText(img, "LABEL %d" % rng.integers(100, 999), (120, 120 + 45 * i),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.2, (20, 20, 20), 2)
+    return img
+
+
+def test_metrics_track_blur_and_glare():
+    sharp = _label()
+    blurred = cv2.GaussianBlur(sharp, (0, 0), 4)
+    glare = sharp.copy()
+    glare[:240] = 255
+    ms, mb, mg = frame_metrics(sharp), frame_metrics(blurred), frame_metrics(glare)
+    assert ms["sharpness"] > 5 * mb["sharpness"]
+    assert ms["text_edges"] > mb["text_edges"]
+    assert ms["glare"] < 0.01 and 0.45 < mg["glare"] < 0.55
+
+
+def test_metrics_scale_invariant_eval_width():
+    img = _label()
+    big = cv2.resize(img, (1280, 960), interpolation=cv2.INTER_CUBIC)
+    # 평가용 폭(480)으로 줄여서 비교 → 반사광/에지 비율은 해상도와 거의 무관
+    a, b = frame_metrics(img), frame_metrics(big)
+    assert abs(a["glare"] - b["glare"]) < 0.01
+    assert abs(a["text_edges"] - b["text_edges"]) < 0.05
+
+
+def test_rank_prefers_sharp_frame_and_scores_in_range():
+    sharp = _label()
+    frames = [cv2.GaussianBlur(sharp, (0, 0), 3), sharp, cv2.GaussianBlur(sharp, (0, 0), 1.5)]
+    ranked = rank_frames(frames)
+    assert [i for i, _ in ranked] == [1, 2, 0]
+    assert all(0.0 <= m["score"] <= 1.0 for _, m in ranked)
+    assert [i for i, _ in select_best_frames(frames, k=2)] == [1, 2]
+
+
+def test_ties_prefer_newest_and_empty():
+    img = _label()
+    # 입력은 오래된 → 최신 순: 동점이면 마지막(최신) 프레임이 1위
+    ranked = rank_frames([img, img.copy(), img.copy()])
+    assert [i for i, _ in ranked] == [2, 1, 0]
+    assert rank_frames([]) == []
+    assert len(select_best_frames([img], k=0)) == 1
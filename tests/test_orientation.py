@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""orientation: 축 추정(투영/박스), 후보 각도 목록, 탐침용 박스 선택"""
+import cv2
+import numpy as np
+import pytest
+
+from ocr.orientation import (estimate_orientation, likely_orientations, largest_boxes,
+                             boxes_horizontal, projection_horizontal)
+
+
+def _text_roi():
+    img = np.full((240, 400), 255, np.uint8)
+    for i in range(5):
+        cv2.putText(img, "BRAND NAME 0%d" % i, (10, 40 + 45 * i), cv2.FONT_HERSHEY_SIMPLEX, 1.0, 0, 2)
+    return img
+
+
+def _est(p_h):
+    return {'p_horizontal': p_h}
+
+
+def test_likely_orientations_keeps_both_directions_of_winning_axis():
+    assert likely_orientations(_est(0.9), min_p=0.15) == [0, 180]
+    assert likely_orientations(_est(0.1), min_p=0.15) == [90, 270]
+    # 다른 축도 애매하면 네 방향 모두 (이긴 축 먼저)
+    assert likely_orientations(_est(0.6), min_p=0.15) == [0, 180, 90, 270]
+    assert likely_orientations(_est(0.4), min_p=0.15) == [90, 270, 0, 180]
+    assert likely_orientations(_est(0.5), min_p=0.6) == [0, 180]
+
+
+def test_projection_is_complementary_under_rotation():
+    # 투영 근거는 약하므로(깨끗한 글자에서도 0.5 근처) 값 자체가 아니라 대칭성만 확인
+    roi = _text_roi()
+    p0 = projection_horizontal(roi)
+    p90 = projection_horizontal(cv2.rotate(roi, cv2.ROTATE_90_CLOCKWISE))
+    assert 0.0 <= p0 <= 1.0
+    assert p0 + p90 == pytest.approx(1.0, abs=1e-6)
+    assert projection_horizontal(np.full((50, 50), 255, np.uint8)) is None
+
+
+def test_box_evidence_decides_axis():
+    roi = _text_roi()
+    wide = ([[10, 300, 20, 45], [10, 280, 65, 90]], [])
+    tall = ([[20, 45, 10, 300], [65, 90, 10, 280]], [])
+    assert estimate_orientation(roi, wide)['p_horizontal'] > 0.5
+    assert likely_orientations(estimate_orientation(roi, wide))[:2] == [0, 180]
+    assert likely_orientations(estimate_orientation(roi, tall))[:2] == [90, 270]
+
+
+def test_boxes_horizontal():
+    assert boxes_horizontal([[0, 100, 0, 20]], []) == pytest.approx(1.0)
+    assert boxes_horizontal([[0, 20, 0, 100]], []) == pytest.approx(0.0)
+    assert boxes_horizontal([[0, 20, 0, 20]], []) is None            # 정사각형은 근거 아님
+    assert boxes_horizontal([], [[[0, 0], [10, 0], [10, 50], [0, 50]]]) == pytest.approx(0.0)
+    assert boxes_horizontal(None, None) is None
+
+
+@pytest.mark.parametrize("angle", [0, 90, 180, 270])
+def test_true_angle_is_always_tried(angle):
+    codes = {90: cv2.ROTATE_90_COUNTERCLOCKWISE, 180: cv2.ROTATE_180, 270: cv2.ROTATE_90_CLOCKWISE}
+    # ROI를 angle만큼 시계방향으로 돌려야 정방향이 되도록 반대로 돌려 둠
+    roi = cv2.rotate(_text_roi(), codes[angle]) if angle else _text_roi()
+    est = estimate_orientation(roi)
+    assert angle in likely_orientations(est)
+    assert sum(c['p'] for c in est['candidates']) == pytest.approx(1.0, abs=1e-3)
+    assert est['angle'] == est['candidates'][0]['angle']
+
+
+def test_largest_boxes():
+    h = [[0, 10, 0, 10], [0, 100, 0, 30], [0, 5, 0, 40]]
+    f = [[[0, 0], [60, 0], [60, 20], [0, 20]]]
+    assert largest_boxes(h, f, k=2) == [(0, 0, 100, 30), (0, 0, 60, 20)]
+    # 짧은 변이 min_side 미만이면 제외
+    assert largest_boxes([[0, 5, 0, 40]], [], k=2, min_side=8) == []
+    assert largest_boxes([], [], k=2) == []
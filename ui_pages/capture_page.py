@@ -67,8 +67,17 @@ class ProductCapturePage(QWidget):
         if qimg and not qimg.isNull():
             scaled_qimg = qimg.scaled(self.size(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
             self.webcam_label.setPixmap(QPixmap.fromImage(scaled_qimg))
-        self.parent.webcam_last_frame = raw_bgr
-        
+
+    def preview_spec(self):
+        # 캡처 스레드가 이 크기로 꽉 차게 잘라 만든 이미지를 보냄 (회전/거울 없음)
+        return (self.webcam_label.width(), self.webcam_label.height(), False, False)
+
+    def show_display_frame(self, qimg, M):
+        self.webcam_label.setPixmap(QPixmap.fromImage(qimg))
+
+    def set_ocr_ready(self, ready):
+        # OCR 모델 워밍업 중에는 버튼에 준비 상태 표시 (눌러도 되며, 준비되면 이어서 인식)
+        self.capture_btn.setText("촬영" if ready else "촬영 (인식 준비 중)")
 
     def use_ocr_flow(self, enable=True):
         # 제품 촬영 버튼을 main의 run_ocr_product_capture로 연결/해제합니다.
@@ -122,5 +131,12 @@ class FaceCapturePage(QWidget):
         if qimg and not qimg.isNull():
             scaled_qimg = qimg.scaled(self.size(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
             self.webcam_label.setPixmap(QPixmap.fromImage(scaled_qimg))
-        self.parent.webcam_last_frame = raw_bgr
+        self.webcam_label.setGuideMode(True)
+
+    def preview_spec(self):
+        # 캡처 스레드가 이 크기로 꽉 차게 잘라 만든 이미지를 보냄 (회전/거울 없음)
+        return (self.webcam_label.width(), self.webcam_label.height(), False, False)
+
+    def show_display_frame(self, qimg, M):
+        self.webcam_label.setPixmap(QPixmap.fromImage(qimg))
         self.webcam_label.setGuideMode(True)
\ No newline at end of file
@@ -4,10 +4,13 @@
 import os
 import csv
 import re
+import time
 import numpy as np
 import cv2
 from PyQt5 import QtWidgets as QtW, QtGui as QtG, QtCore as QtC
 
+import device_profile
+
 # result_pages에서 중복 정의된 클래스 가져오기
 from .result_pages import ProductDetailDialog, ClickableLabel
 
@@ -1002,6 +1005,9 @@ class CaptureUnifiedView(QtW.QWidget):
 
         # === 회전/거울 토글 ===
         self.rotate90 = False  # Jetson 세로 모드에서 필요하면 True
+        self._face_track = None  # 최근 얼굴 추적 결과 (프레임 좌표의 박스/랜드마크)
+        self._auto_shot_fired = False
+        self._gate_blocked_since = None  # 품질 게이트가 촬영 버튼을 막기 시작한 시각
         QtW.QShortcut(QtG.QKeySequence("Ctrl+R"), self, activated=self._toggle_rotate)
 
         # NOTE: __init__에서 데모 데이터를 주입하는 _inject_demo_data() 호출을 제거했습니다.
@@ -1050,7 +1056,7 @@ class CaptureUnifiedView(QtW.QWidget):
     def on_webcam_frame(self, frame):
         """카메라에서 들어오는 프레임(np.ndarray BGR 또는 QImage)을 받아
         - 미리보기에 띄우고
-        - parent.webcam_last_frame에 numpy BGR로 보관한다(제품 OCR용).
+        - parent.webcam_last_frame에 원본 참조를 보관한다(변환은 촬영할 때만).
         """
         # 1. 프레임을 QImage로 변환
         qimg = None
@@ -1069,25 +1075,59 @@ class CaptureUnifiedView(QtW.QWidget):
         if not qimg.isNull():
             self.update_frame(qimg)
 
-        # 3. OCR을 위해 BGR numpy 배열로 변환하여 저장
-        bgr = None
-        if isinstance(frame, np.ndarray):
-            bgr = frame
-        elif isinstance(frame, QtG.QImage) and not frame.isNull():
-            # QImage -> BGR ndarray
-            qimg_rgb = frame.convertToFormat(QtG.QImage.Format_RGB888)
-            w, h = qimg_rgb.width(), qimg_rgb.height()
-            ptr = qimg_rgb.bits(); ptr.setsize(h * w * 3)
-            rgb = np.frombuffer(ptr, np.uint8).reshape((h, w, 3))
-            bgr = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
-
+        # 3. 촬영용 원본은 참조만 보관 (BGR 변환은 촬영 시 main.capture_frame에서)
         parent = self.parent() or self.window()
-        if parent is not None and bgr is not None:
-            setattr(parent, "webcam_last_frame", bgr)
+        if parent is not None:
+            setattr(parent, "webcam_last_frame", frame)
 
 
     # ----- 이벤트 핸들러 -----
+    # ----- 촬영 품질 게이트 -----
+    _QUALITY_HINTS = {
+        'no_face': "얼굴을 화면에 맞춰주세요",
+        'dark': "조명이 어두워요",
+        'bright': "빛이 너무 강해요",
+        'blur': "초점이 흐려요",
+        'motion': "잠시 멈춰주세요",
+    }
+
+    @QtC.pyqtSlot(dict)
+    def set_capture_quality(self, q):
+        """
+        CaptureQualityThread.quality_changed 슬롯: 얼굴 모드에서만 촬영 버튼을 게이트.
+        판정 자체가 실패(reason='error')했거나 quality_gate_grace_s 넘게 미달이면 힌트만 보이고 버튼은 켬
+        (촬영하면 분석 경로가 실패를 알려줌)
+        """
+        if not self.btnFace.isChecked():
+            self._gate_blocked_since = None
+            self.shotBtn.setEnabled(True)
+            self.shotBtn.setText("촬영")
+            return
+        ok = bool(q.get('ok'))
+        self.shotBtn.setText("촬영" if ok else self._QUALITY_HINTS.get(q.get('reason'), "촬영"))
+        if not ok:
+            self._auto_shot_fired = False
+            now = time.monotonic()
+            if self._gate_blocked_since is None:
+                self._gate_blocked_since = now
+            waited = now - self._gate_blocked_since
+            self.shotBtn.setEnabled(q.get('reason') == 'error'
+                                    or waited >= device_profile.get('quality_gate_grace_s', 5.0))
+            return
+        self._gate_blocked_since = None
+        self.shotBtn.setEnabled(True)
+        # 자동 촬영: 좋은 상태가 일정 시간 유지되면 한 번만 촬영
+        since = q.get('ok_since')
+        if (device_profile.get('auto_shot', False) and not self._auto_shot_fired and since is not None
+                and time.monotonic() - since >= device_profile.get('auto_shot_hold_s', 1.5)):
+            self._auto_shot_fired = True
+            self._on_shot_clicked()
+
     def _on_mode_changed(self, checked):
+        self._gate_blocked_since = None
+        if not checked:
+            self.shotBtn.setEnabled(True)
+            self.shotBtn.setText("촬영")
         if checked:
             self.rightPanel.show_survey()
         else:
@@ -1197,10 +1237,50 @@ class CaptureUnifiedView(QtW.QWidget):
     def _toggle_rotate(self):
         self.rotate90 = not self.rotate90
 
+    # ----- 얼굴 추적 오버레이 -----
+    @QtC.pyqtSlot(object)
+    def set_face_track(self, track):
+        """FaceTrackThread.track_updated 슬롯: 얼굴이 없으면 None"""
+        self._face_track = track
+
+    def _draw_face_track(self, qimg, track, M=None, in_place=False):
+        """얼굴 박스/랜드마크 오버레이. M: 프레임 좌표 → qimg 좌표 2x3 행렬 (표시용 이미지에 그릴 때)"""
+        img = qimg if in_place else qimg.copy()
+        x, y, w, h = track['rect']
+        corners = np.array([[x, y], [x + w, y], [x + w, y + h], [x, y + h]], dtype=np.float64)
+        pts = np.asarray(track['landmarks'], dtype=np.float64)
+        if M is not None:
+            corners = corners.dot(M[:, :2].T) + M[:, 2]
+            pts = pts.dot(M[:, :2].T) + M[:, 2]
+        p = QtG.QPainter(img)
+        p.setRenderHint(QtG.QPainter.Antialiasing)
+        p.setPen(QtG.QPen(QtG.QColor(148, 183, 207), 3))
+        p.drawPolygon(QtG.QPolygonF([QtC.QPointF(cx, cy) for cx, cy in corners]))
+        p.setPen(QtG.QPen(QtG.QColor(255, 255, 255, 200), 3))
+        for px, py in pts:
+            p.drawPoint(QtC.QPointF(px, py))
+        p.end()
+        return img
+
+    # ----- 캡처 스레드가 만든 표시용 프레임 -----
+    def preview_spec(self):
+        """WebcamThread.set_display_spec 인자: (폭, 높이, 90° 회전, 거울)"""
+        return (self.cameraView.width(), self.cameraView.height(),
+                self.rotate90, self.mirrorToggle.isChecked())
+
+    def show_display_frame(self, qimg, M):
+        """이미 회전/거울/리사이즈된 이미지를 그대로 표시 (GUI 스레드 스케일링 없음)"""
+        if self._face_track is not None and self.btnFace.isChecked():
+            # qimg는 캡처 스레드가 프레임마다 새로 만든 것이라 그 위에 바로 그려도 됨
+            self._draw_face_track(qimg, self._face_track, M, in_place=True)
+        self.cameraView.setPixmap(QtG.QPixmap.fromImage(qimg))
+
     # ----- 외부에서 프레임 주입 -----
     def update_frame(self, qimg, *args):
-        """웹캠 프레임을 미리보기에 표시하고, 다른 모듈용으로 BGR 프레임을 저장합니다."""
+        """웹캠 프레임을 미리보기에 표시합니다. (촬영용 프레임은 main.capture_frame이 필요할 때 가져감)"""
         if isinstance(qimg, QtG.QImage):
+            if self._face_track is not None and self.btnFace.isChecked():
+                qimg = self._draw_face_track(qimg, self._face_track)
             if self.rotate90:
                 qimg = qimg.transformed(QtG.QTransform().rotate(90))
             if self.mirrorToggle.isChecked():
@@ -1213,19 +1293,6 @@ class CaptureUnifiedView(QtW.QWidget):
             )
             self.cameraView.setPixmap(pix)
 
-            # ✅ 여기서도 parent.webcam_last_frame 채워주기 (QImage만 주입되는 경우 대비)
-            try:
-                qimg_rgb = qimg.convertToFormat(QtG.QImage.Format_RGB888)
-                w, h = qimg_rgb.width(), qimg_rgb.height()
-                ptr = qimg_rgb.bits(); ptr.setsize(h * w * 3)
-                rgb = np.frombuffer(ptr, np.uint8).reshape((h, w, 3))
-                bgr = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
-                parent = self.parent() or self.window()
-                if parent is not None:
-                    setattr(parent, "webcam_last_frame", bgr)
-            except Exception:
-                pass
-
     def _load_face_recommendations_safe(self, skin_type=None, personal_color=None, number=None):
         """
         CSV에서 추천 로드. 실패/예외일 때만 최소 백업(타입별 몇 개) 사용.
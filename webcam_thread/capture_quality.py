@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+import time
+
+import cv2
+from PyQt5.QtCore import QThread, pyqtSignal
+
+import device_profile
+
+# 평가용 축소 폭 (밝기/선명도/움직임 모두 이 크기에서 계산)
+_EVAL_WIDTH = 320
+
+
+def _small_gray(frame_bgr):
+    h, w = frame_bgr.shape[:2]
+    r = _EVAL_WIDTH / float(w) if w > _EVAL_WIDTH else 1.0
+    small = cv2.resize(frame_bgr, (int(w * r), int(h * r)), interpolation=cv2.INTER_AREA) if r < 1.0 else frame_bgr
+    return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), r
+
+
+def evaluate_frame(frame_bgr, face_rect=None, prev_gray=None):
+    """
+    저비용 촬영 품질 지표.
+    - face_rect: 원본 좌표 (x, y, w, h) — 있으면 밝기/선명도를 얼굴 영역에서 계산
+    - prev_gray: 직전 평가의 축소 gray — 움직임(평균 절대 차) 계산용
+    반환: (지표 dict, 이번 축소 gray)
+    """
+    gray, r = _small_gray(frame_bgr)
+    roi = gray
+    if face_rect is not None:
+        x, y, w, h = [int(v * r) for v in face_rect]
+        x, y = max(0, x), max(0, y)
+        if w > 8 and h > 8:
+            roi = gray[y:y + h, x:x + w]
+    motion = None
+    if prev_gray is not None and prev_gray.shape == gray.shape:
+        motion = float(cv2.absdiff(gray, prev_gray).mean())
+    metrics = {
+        'face': face_rect is not None,
+        'luminance': float(roi.mean()),
+        'sharpness': float(cv2.Laplacian(roi, cv2.CV_64F).var()),
+        'motion': motion,
+    }
+    return metrics, gray
+
+
+def judge(metrics):
+    """지표 → (ok, reason). reason: None | 'no_face' | 'dark' | 'bright' | 'blur' | 'motion'"""
+    if not metrics['face']:
+        return False, 'no_face'
+    if metrics['luminance'] < device_profile.get('quality_min_luma', 60):
+        return False, 'dark'
+    if metrics['luminance'] > device_profile.get('quality_max_luma', 225):
+        return False, 'bright'
+    if metrics['motion'] is not None and metrics['motion'] > device_profile.get('quality_max_motion', 8.0):
+        return False, 'motion'
+    if metrics['sharpness'] < device_profile.get('quality_min_sharpness', 40.0):
+        return False, 'blur'
+    return True, None
+
+
+class CaptureQualityThread(QThread):
+    """
+    웹캠 최신 프레임을 낮은 주기(quality_fps)로 평가해 quality_changed(dict)를 보낸다.
+    - face_probe(): 얼굴 박스 (x, y, w, h) 또는 None (보통 FaceTracker 결과 재사용)
+      없으면 아주 작은 해상도에서 HOG 검출로 대신한다.
+    dict: face, luminance, sharpness, motion, ok, reason, ok_since(ok 유지 시작 시각)
+    """
+    quality_changed = pyqtSignal(dict)
+
+    def __init__(self, webcam_thread, face_probe=None, fps=None, parent=None):
+        super().__init__(parent)
+        self.webcam_thread = webcam_thread
+        self.face_probe = face_probe or self._detect_probe
+        self.fps = fps or device_profile.get('quality_fps', 4)
+        self.running = True
+        self._latest = None
+
+    def _detect_probe(self):
+        from personal_color_analysis.face_models import get_face_models
+        cur = self._latest
+        if cur is None:
+            return None
+        gray = cv2.cvtColor(cur[1], cv2.COLOR_BGR2GRAY)
+        scale = min(1.0, 240.0 / gray.shape[1])
+        small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        rects = get_face_models().detector(small, 0)
+        if len(rects) == 0:
+            return None
+        r = rects[0]
+        return (int(r.left() / scale), int(r.top() / scale), int(r.width() / scale), int(r.height() / scale))
+
+    def run(self):
+        prev_gray, last_seq, ok_since = None, None, None
+        period_ms = int(1000 / max(1, self.fps))
+        while self.running:
+            cur = self.webcam_thread.latest_frame() if self.webcam_thread else None
+            if cur is not None and cur[0] != last_seq:
+                last_seq = cur[0]
+                self._latest = cur
+                try:
+                    metrics, prev_gray = evaluate_frame(cur[1], self.face_probe(), prev_gray)
+                    ok, reason = judge(metrics)
+                except Exception:
+                    metrics, ok, reason = {'face': False}, False, 'error'
+                now = time.monotonic()
+                ok_since = (ok_since or now) if ok else None
+                metrics.update(ok=ok, reason=reason, ok_since=ok_since, seq=cur[0])
+                self.quality_changed.emit(metrics)
+            self.msleep(period_ms)
+
+    def stop(self):
+        self.running = False
+        self.wait()
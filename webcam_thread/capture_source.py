@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""
+capture_source.py
+- 카메라 입력 추상화 (Qt 불필요)
+  · v4l2   : Linux/Jetson USB 카메라, MJPG/YUYV + 해상도/FPS 지정
+  · dshow  : Windows DirectShow (기존 동작)
+  · gstreamer : 파이프라인 문자열 (예: Jetson CSI nvarguscamerasrc ... ! appsink)
+  · replay : 동영상 파일 또는 이미지 폴더 재생 (카메라 없이 전체 파이프라인 부하 테스트)
+- 설정은 device_profile (capture_*) / 환경변수 SMARTMIRROR_CAPTURE_* 로 지정
+- open() 후 info()로 실제 협상된 해상도/FPS/포맷과 측정 FPS를 확인
+
+헤드리스 측정:
+    python -m webcam_thread.capture_source --seconds 5
+    SMARTMIRROR_CAPTURE_SOURCE=replay SMARTMIRROR_CAPTURE_REPLAY_PATH=captures/ python -m webcam_thread.capture_source
+"""
+import os
+import sys
+import glob
+import time
+
+import cv2
+
+import device_profile
+
+IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+
+
+def _fourcc_str(value):
+    v = int(value or 0)
+    s = ''.join(chr((v >> (8 * i)) & 0xFF) for i in range(4))
+    return s if v and s.isprintable() else ''
+
+
+class CaptureSource:
+    """공통 인터페이스: open() → read(out) 반복 → release(). info()로 협상값/측정 FPS 보고"""
+    name = 'base'
+
+    def __init__(self):
+        self._n = 0
+        self._t0 = None
+        self._fps = 0.0
+
+    def open(self):
+        raise NotImplementedError
+
+    def read(self, out=None):
+        """(ok, frame_bgr). out: 재사용할 버퍼 (크기가 맞으면 그 안에 채움)"""
+        raise NotImplementedError
+
+    def grab(self):
+        """디코딩 없이 한 프레임 넘기기 (일시정지 중 장치 큐를 비워 재개 시 최신 프레임 유지)"""
+        ok, _ = self.read()
+        return ok
+
+    def set_mode(self, width, height):
+        """해상도 전환 (지원 안 하면 False). 성공 시 실제 협상된 (w, h) 반환"""
+        return False
+
+    def release(self):
+        pass
+
+    def negotiated(self):
+        return {}
+
+    def _tick(self):
+        # 1초 창 단위로 측정 FPS 갱신
+        now = time.monotonic()
+        if self._t0 is None:
+            self._t0 = now
+        self._n += 1
+        dt = now - self._t0
+        if dt >= 1.0:
+            self._fps = self._n / dt
+            self._n, self._t0 = 0, now
+
+    @property
+    def measured_fps(self):
+        return self._fps
+
+    def info(self):
+        d = {'source': self.name}
+        d.update(self.negotiated())
+        d['measured_fps'] = round(self._fps, 1)
+        return d
+
+
+class OpenCVCameraSource(CaptureSource):
+    """cv2.VideoCapture 기반 장치/파이프라인 (v4l2, dshow, gstreamer, any)"""
+    _APIS = {
+        'v4l2': cv2.CAP_V4L2,
+        'dshow': cv2.CAP_DSHOW,
+        'gstreamer': cv2.CAP_GSTREAMER,
+        'any': cv2.CAP_ANY,
+    }
+
+    def __init__(self, device=0, api='any', width=0, height=0, fps=0, fourcc=''):
+        super().__init__()
+        self.name = api
+        self.device = device
+        self.api = api
+        self.width, self.height, self.fps = int(width or 0), int(height or 0), int(fps or 0)
+        self.fourcc = (fourcc or '').upper()
+        self.cap = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.device, self._APIS.get(self.api, cv2.CAP_ANY))
+        if not self.cap.isOpened():
+            return False
+        if self.api == 'gstreamer':
+            # 해상도/포맷은 파이프라인 문자열이 정함
+            return True
+        self._negotiate(self.width, self.height)
+        return True
+
+    def _negotiate(self, width, height):
+        # V4L2는 포맷을 먼저 정해야 해상도/FPS 조합이 맞게 협상됨
+        # 해상도를 바꾸면 스트림이 재협상되므로 FPS/버퍼 크기도 매번 다시 지정
+        if self.fourcc:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc[:4].ljust(4)))
+        if width and height:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, int(width))
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, int(height))
+        if self.fps:
+            self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+        # 드라이버 내부 큐 최소화 → 최신 프레임 지연 감소 (지원하는 백엔드만 적용됨)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    def read(self, out=None):
+        ok, frame = self.cap.read(out)
+        if ok and frame is not None:
+            self._tick()
+        return ok, frame
+
+    def grab(self):
+        return self.cap.grab()
+
+    def set_mode(self, width, height):
+        if self.cap is None or self.api == 'gstreamer':
+            return False
+        self._negotiate(width, height)
+        return int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+
+    def negotiated(self):
+        if self.cap is None:
+            return {}
+        return {
+            'width': int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': round(float(self.cap.get(cv2.CAP_PROP_FPS)), 2),
+            'fourcc': _fourcc_str(self.cap.get(cv2.CAP_PROP_FOURCC)),
+            'backend': self.cap.getBackendName() if hasattr(self.cap, 'getBackendName') else self.api,
+        }
+
+
+class ReplaySource(CaptureSource):
+    """
+    동영상 파일 또는 이미지 폴더를 카메라처럼 재생.
+    - fps > 0이면 그 속도로 페이싱, 0이면 가능한 한 빠르게 (처리량 측정용)
+    - loop: 끝나면 처음부터 다시
+    """
+    name = 'replay'
+
+    def __init__(self, path, fps=30, loop=True):
+        super().__init__()
+        self.path = path
+        self.fps = float(fps or 0)
+        self.loop = loop
+        self._files = None
+        self._idx = 0
+        self.cap = None
+        self._next = 0.0
+        self._shape = None
+
+    def open(self):
+        if not self.path:
+            return False
+        if os.path.isdir(self.path):
+            self._files = sorted(p for p in glob.glob(os.path.join(self.path, '*'))
+                                 if p.lower().endswith(IMAGE_EXTS))
+            return bool(self._files)
+        self.cap = cv2.VideoCapture(self.path)
+        return self.cap.isOpened()
+
+    def _pace(self):
+        if self.fps <= 0:
+            return
+        now = time.monotonic()
+        if now < self._next:
+            time.sleep(self._next - now)
+            now = self._next
+        self._next = max(now, self._next) + 1.0 / self.fps
+
+    def _read_once(self, out):
+        if self._files is not None:
+            if self._idx >= len(self._files):
+                if not self.loop:
+                    return False, None
+                self._idx = 0
+            frame = cv2.imread(self._files[self._idx], cv2.IMREAD_COLOR)
+            self._idx += 1
+            return frame is not None, frame
+        ok, frame = self.cap.read(out)
+        if not ok and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.cap.read(out)
+        return ok, frame
+
+    def read(self, out=None):
+        self._pace()
+        ok, frame = self._read_once(out)
+        if ok and frame is not None:
+            self._shape = frame.shape
+            self._tick()
+        return ok, frame
+
+    def grab(self):
+        # 재생 소스는 페이싱만 유지 (디코딩 생략)
+        self._pace()
+        return True
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+
+    def negotiated(self):
+        d = {'path': self.path, 'fps': self.fps}
+        if self._shape is not None:
+            d.update(width=self._shape[1], height=self._shape[0])
+        if self._files is not None:
+            d['frames'] = len(self._files)
+        return d
+
+
+def make_source(kind=None):
+    """
+    device_profile 설정으로 캡처 소스 생성.
+    capture_source: auto | v4l2 | dshow | gstreamer | replay
+      auto → Windows는 dshow, 그 외는 v4l2
+    """
+    kind = (kind or device_profile.get('capture_source', 'auto')).lower()
+    if kind == 'auto':
+        kind = 'dshow' if sys.platform.startswith('win') else 'v4l2'
+    if kind == 'replay':
+        return ReplaySource(device_profile.get('capture_replay_path', ''),
+                            fps=device_profile.get('capture_fps', 30),
+                            loop=device_profile.get('capture_replay_loop', True))
+    if kind == 'gstreamer':
+        return OpenCVCameraSource(device_profile.get('capture_pipeline', ''), api='gstreamer')
+    return OpenCVCameraSource(
+        device_profile.get('capture_device', 0), api=kind,
+        width=device_profile.get('capture_width', 0),
+        height=device_profile.get('capture_height', 0),
+        fps=device_profile.get('capture_fps', 0),
+        fourcc=device_profile.get('capture_fourcc', ''),
+    )
+
+
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(prog='python -m webcam_thread.capture_source',
+                                 description='Open the configured capture source and report negotiated settings / FPS.')
+    ap.add_argument('--source', default=None, help='auto | v4l2 | dshow | gstreamer | replay')
+    ap.add_argument('--seconds', type=float, default=5.0)
+    args = ap.parse_args(argv)
+
+    src = make_source(args.source)
+    if not src.open():
+        print('failed to open capture source: %s' % src.name, file=sys.stderr)
+        return 1
+    print('opened:', src.info())
+    buf, n, t0 = None, 0, time.monotonic()
+    try:
+        while time.monotonic() - t0 < args.seconds:
+            ok, frame = src.read(buf)
+            if not ok:
+                break
+            buf = frame
+            n += 1
+    finally:
+        src.release()
+    dt = time.monotonic() - t0
+    print('%d frames in %.1fs (%.1f fps)' % (n, dt, n / dt if dt > 0 else 0.0), src.info())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
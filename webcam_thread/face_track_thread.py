@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+from PyQt5.QtCore import QThread, pyqtSignal
+
+import device_profile
+from personal_color_analysis.face_tracker import FaceTracker
+
+
+class FaceTrackThread(QThread):
+    """
+    WebcamThread의 최신 프레임을 낮은 주기로 가져와 FaceTracker를 돌린다.
+    - 전체 검출은 FaceTracker가 detect_interval마다만 수행, 나머지는 옵티컬 플로우
+    - track_updated(dict|None): 미리보기 오버레이(얼굴 박스/랜드마크)용
+    """
+    track_updated = pyqtSignal(object)
+
+    def __init__(self, webcam_thread, tracker=None, fps=None, parent=None):
+        super().__init__(parent)
+        self.webcam_thread = webcam_thread
+        self.tracker = tracker or FaceTracker()
+        self.fps = fps or device_profile.get('face_track_fps', 10)
+        self.running = True
+
+    def run(self):
+        last_seq = None
+        period_ms = int(1000 / max(1, self.fps))
+        while self.running:
+            cur = self.webcam_thread.latest_frame() if self.webcam_thread else None
+            if cur is not None and cur[0] != last_seq:
+                last_seq = cur[0]
+                try:
+                    # 추적 상태는 프레임을 분석용으로 보관하므로 링 슬롯 재사용 전에 사본을 넘김
+                    state = self.tracker.update(cur[0], cur[1].copy())
+                except Exception:
+                    state = None
+                self.track_updated.emit(
+                    None if state is None else {'rect': state['rect'], 'landmarks': state['landmarks'],
+                                                'seq': state['seq']})
+            self.msleep(period_ms)
+
+    def snapshot(self, max_age_s=None):
+        return self.tracker.snapshot(max_age_s)
+
+    def stop(self):
+        self.running = False
+        self.wait()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import time
+import threading
+
+import numpy as np
+
+
+class FrameRing:
+    """
+    미리 할당한 프레임 링 버퍼 (최신 프레임 우선).
+    - 쓰기 쪽(캡처 스레드)은 writable()로 받은 슬롯에 직접 채우고 commit()
+    - 읽기 쪽은 latest() / last(n)로 복사 없이 읽기 전용 뷰를 받는다
+    - 슬롯은 slots-1 프레임 뒤에 재사용되므로, 오래 들고 있을 프레임은 호출자가 copy()
+    - 소비가 늦어도 큐가 쌓이지 않고 오래된 프레임이 덮어써진다
+    """
+
+    def __init__(self, slots=4):
+        self.slots = max(2, int(slots))
+        self._bufs = [None] * self.slots
+        self._seqs = [0] * self.slots
+        self._times = [0.0] * self.slots   # commit 시각 (time.monotonic)
+        self._head = -1      # 가장 최근에 commit된 슬롯
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def writable(self, shape, dtype=np.uint8):
+        """다음에 쓸 (슬롯 번호, 버퍼). 해상도가 바뀌면 그 슬롯만 다시 할당"""
+        with self._lock:
+            idx = (self._head + 1) % self.slots
+            buf = self._bufs[idx]
+            if buf is None or buf.shape != tuple(shape) or buf.dtype != dtype:
+                buf = np.empty(shape, dtype=dtype)
+                self._bufs[idx] = buf
+            # 쓰는 동안 읽히지 않도록 무효화
+            self._seqs[idx] = 0
+            return idx, buf
+
+    def commit(self, idx):
+        """writable()로 받은 슬롯을 최신 프레임으로 공개하고 seq를 반환"""
+        with self._lock:
+            self._seq += 1
+            self._seqs[idx] = self._seq
+            self._times[idx] = time.monotonic()
+            self._head = idx
+            return self._seq
+
+    def _view(self, idx):
+        v = self._bufs[idx].view()
+        v.flags.writeable = False
+        return v
+
+    def latest(self):
+        """(seq, frame 뷰) 또는 None"""
+        with self._lock:
+            if self._head < 0 or self._seqs[self._head] == 0:
+                return None
+            return self._seqs[self._head], self._view(self._head)
+
+    def last(self, n, max_age_s=None):
+        """
+        최근 n개 [(seq, frame 뷰), ...] (오래된 것 → 최신 순, 최대 slots-1개)
+        max_age_s: 최신 프레임 기준 이보다 오래된 프레임은 제외
+        """
+        out = []
+        with self._lock:
+            if self._head < 0:
+                return out
+            t_head = self._times[self._head]
+            for k in range(min(n, self.slots - 1)):
+                idx = (self._head - k) % self.slots
+                if self._seqs[idx] == 0:
+                    break
+                if max_age_s is not None and t_head - self._times[idx] > max_age_s:
+                    break
+                out.append((self._seqs[idx], self._view(idx)))
+        out.reverse()
+        return out
+
+    def get(self, seq):
+        """해당 seq 프레임이 아직 덮어써지지 않았으면 뷰, 아니면 None"""
+        with self._lock:
+            for idx in range(self.slots):
+                if self._seqs[idx] == seq and seq != 0:
+                    return self._view(idx)
+        return None
+
+    @property
+    def seq(self):
+        return self._seq
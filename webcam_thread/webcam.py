@@ -1,48 +1,257 @@
 # -*- coding: utf-8 -*-
+import time
+
 import cv2
+import numpy as np
 from PyQt5.QtCore import QThread, pyqtSignal
 from PyQt5.QtGui import QImage
 
+import device_profile
+from webcam_thread.frame_ring import FrameRing
+from webcam_thread.capture_source import make_source
+
+
+def bgr_to_qimage(frame_bgr):
+    """BGR ndarray → RGB888 QImage (자체 버퍼를 가진 사본)"""
+    rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+    h, w, ch = rgb.shape
+    return QImage(rgb.data, w, h, ch * w, QImage.Format_RGB888).copy()
+
+
+def qimage_to_bgr(qimg):
+    """QImage(어떤 포맷이든) → BGR ndarray. 촬영 시점에만 쓰는 변환"""
+    if qimg is None or qimg.isNull():
+        return None
+    if qimg.format() != QImage.Format_RGB888:
+        qimg = qimg.convertToFormat(QImage.Format_RGB888)
+    w, h = qimg.width(), qimg.height()
+    ptr = qimg.bits()
+    ptr.setsize(h * qimg.bytesPerLine())
+    arr = np.frombuffer(ptr, np.uint8).reshape(h, qimg.bytesPerLine())[:, :w * 3].reshape(h, w, 3)
+    return cv2.cvtColor(arr, cv2.COLOR_RGB2BGR)
+
+
+def render_preview(frame_bgr, view_w, view_h, rotate=False, mirror=False):
+    """
+    미리보기 표시용 이미지 (캡처 스레드에서 호출).
+    - rotate: 시계방향 90°, mirror: 좌우 반전
+    - view 크기를 꽉 채우도록 확대/축소 후 가운데를 잘라냄 (KeepAspectRatioByExpanding + 가운데 정렬과 동일)
+    반환: (QImage(view_w x view_h), M) — M은 원본 프레임 좌표 → 표시 좌표 2x3 아핀 행렬 (오버레이용)
+    """
+    img = frame_bgr
+    h, w = img.shape[:2]
+    M = np.eye(3)
+    if rotate:
+        img = cv2.rotate(img, cv2.ROTATE_90_CLOCKWISE)
+        M = np.array([[0.0, -1.0, h - 1.0], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]]).dot(M)
+        w, h = h, w
+    if mirror:
+        img = cv2.flip(img, 1)
+        M = np.array([[-1.0, 0.0, w - 1.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]).dot(M)
+    s = max(view_w / float(w), view_h / float(h))
+    cw, ch = min(w, max(1, int(round(view_w / s)))), min(h, max(1, int(round(view_h / s))))
+    x0, y0 = (w - cw) // 2, (h - ch) // 2
+    interp = cv2.INTER_AREA if s < 1.0 else cv2.INTER_LINEAR
+    out = cv2.resize(img[y0:y0 + ch, x0:x0 + cw], (view_w, view_h), interpolation=interp)
+    sx, sy = view_w / float(cw), view_h / float(ch)
+    M = np.array([[sx, 0.0, -x0 * sx], [0.0, sy, -y0 * sy], [0.0, 0.0, 1.0]]).dot(M)
+    return bgr_to_qimage(out), M[:2]
+
+
 class WebcamThread(QThread):
-    # (미리보기 QImage, OCR용 원본 BGR)
-    change_pixmap_signal = pyqtSignal(QImage, object)
+    # 새 프레임 알림 (합쳐서 보냄: 앞선 알림을 소비하기 전에는 다시 보내지 않음)
+    frame_ready = pyqtSignal()
+    # 캡처 소스를 연 뒤 협상된 설정 (source, width, height, fps, fourcc, backend ...)
+    source_opened = pyqtSignal(dict)
+    # request_still() 결과: 고해상도 BGR 프레임 (실패 시 None)
+    still_ready = pyqtSignal(object)
 
-    def __init__(self, rotate=False, mirror=False, parent=None):
+    def __init__(self, rotate=False, mirror=False, parent=None, source=None):
         super().__init__(parent)
         self.running = True
-        self.cap = None
+        # 캡처 소스 (기본: device_profile의 capture_* 설정 → v4l2/dshow/gstreamer/replay)
+        self.source = source
         self.rotate = rotate
         self.mirror = mirror
+        # 최신 프레임 링 버퍼 — 미리보기/추적/분석이 복사 없이 읽어감
+        self.ring = FrameRing(device_profile.get('capture_ring_slots', 4))
+        self._raw = None   # cap.read 재사용 버퍼
+        self._rot = None   # 회전 결과 재사용 버퍼
+        self._notify_pending = False
+        # 미리보기: 표시 사양 (view_w, view_h, rotate, mirror) 또는 None, 목표 FPS (캡처 FPS와 별개)
+        self._display_spec = None
+        self._display = None
+        self.preview_fps = device_profile.get('preview_fps', 30)
+        # 일시정지: 장치는 열어 둔 채 디코딩/미리보기/알림만 멈춤 (분석 중)
+        self.paused = False
+        # 이 시간 동안 프레임을 못 받으면 소스를 다시 연다 (오류 시에만 재협상)
+        self.reopen_after_s = device_profile.get('capture_reopen_s', 2.0)
+        # 촬영용 고해상도 정지 영상 요청 플래그 (미리보기는 capture_width/height 유지)
+        self._still_requested = False
+
+    def _read_into_ring(self):
+        ret, raw = self.source.read(self._raw)
+        if not ret or raw is None:
+            return False
+        self._raw = raw
+        if self.rotate:
+            raw = self._rot = cv2.rotate(raw, cv2.ROTATE_90_COUNTERCLOCKWISE, self._rot)
+        idx, slot = self.ring.writable(raw.shape, raw.dtype)
+        if self.mirror:
+            cv2.flip(raw, 1, slot)
+        else:
+            np.copyto(slot, raw)
+        self.ring.commit(idx)
+        return True
+
+    def _open_source(self):
+        if self.source is None:
+            self.source = make_source()
+        if not self.source.open():
+            print("Error: 웹캠을 열 수 없습니다. (%s)" % self.source.name)
+            return False
+        info = self.source.info()
+        print("[webcam] opened:", info)
+        self.source_opened.emit(info)
+        return True
+
+    def _reopen_source(self):
+        print("[webcam] 프레임 수신 없음 → 소스 재연결")
+        self.source.release()
+        self._raw = None
+        return self.source.open()
+
+    def _capture_still(self):
+        """
+        장치를 still_width x still_height로 잠시 전환해 한 장을 찍고 미리보기 해상도로 되돌린다.
+        전환 직후 프레임은 노출/버퍼가 안정되지 않아 still_warmup_frames장 버림.
+        고해상도 프레임은 링 버퍼에 넣지 않음 (추적/품질 스레드는 미리보기 해상도 유지)
+        """
+        src = self.source
+        still = None
+        switched = src.set_mode(device_profile.get('still_width', 1920), device_profile.get('still_height', 1080))
+        try:
+            if switched:
+                for _ in range(max(0, device_profile.get('still_warmup_frames', 3))):
+                    src.grab()
+            ok, frame = src.read()
+            if ok and frame is not None:
+                if self.rotate:
+                    frame = cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
+                if self.mirror:
+                    frame = cv2.flip(frame, 1)
+                still = frame
+        except Exception as e:
+            print("[webcam] still capture failed:", e)
+        finally:
+            if switched:
+                src.set_mode(device_profile.get('capture_width', 640), device_profile.get('capture_height', 480))
+                self._raw = None
+        self.still_ready.emit(still)
+
+    def request_still(self):
+        """고해상도 촬영 요청 (비동기). 결과는 still_ready(frame|None)로 전달"""
+        self._still_requested = True
 
     def run(self):
-        self.cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-        if not self.cap.isOpened():
-            print("Error: 웹캠을 열 수 없습니다.")
+        if not self._open_source():
             self.running = False
             return
 
+        preview_period = 1.0 / max(1, self.preview_fps)
+        next_preview = 0.0
+        last_ok = time.monotonic()
         while self.running:
-            ret, frame_bgr = self.cap.read()
-            if not ret:
+            if self._still_requested:
+                self._still_requested = False
+                self._capture_still()
+                last_ok = time.monotonic()
                 continue
+            if self.paused:
+                # 장치 큐만 비우고 디코딩/미리보기는 생략
+                if not self.source.grab():
+                    self.msleep(5)
+                continue
+            if not self._read_into_ring():
+                if time.monotonic() - last_ok > self.reopen_after_s:
+                    self._reopen_source()
+                    last_ok = time.monotonic()
+                self.msleep(5)
+                continue
+            last_ok = time.monotonic()
+            # 캡처는 매 프레임 링에 쌓고, 미리보기는 preview_fps로만 만들고 알림
+            now = last_ok
+            if now < next_preview:
+                continue
+            next_preview = now + preview_period
+            self._update_display()
+            # UI가 멈춰 있어도 알림은 최대 1개만 대기 (이벤트 누적/메모리 증가 방지)
+            if not self._notify_pending:
+                self._notify_pending = True
+                self.frame_ready.emit()
+
+        # 처리 못 한 촬영 요청이 있으면 기다리는 쪽에 실패를 알림
+        if self._still_requested:
+            self._still_requested = False
+            self.still_ready.emit(None)
+        self.source.release()
+
+    def pause(self):
+        """미리보기 전달 중지 (장치는 열린 상태 유지)"""
+        self.paused = True
+
+    def resume(self):
+        self._notify_pending = False
+        self.paused = False
+
+    def capture_info(self):
+        """협상된 설정 + 측정 FPS (소스를 열기 전이면 빈 dict)"""
+        return self.source.info() if self.source is not None else {}
+
+    def set_display_spec(self, view_w, view_h, rotate=False, mirror=False):
+        """미리보기 표시 크기/회전/거울 지정 (GUI 스레드에서 호출, 다음 미리보기부터 적용)"""
+        if view_w > 0 and view_h > 0:
+            self._display_spec = (int(view_w), int(view_h), bool(rotate), bool(mirror))
+        else:
+            self._display_spec = None
+
+    def _update_display(self):
+        spec = self._display_spec
+        if spec is None:
+            self._display = None
+            return
+        cur = self.ring.latest()
+        if cur is None:
+            return
+        try:
+            qimg, M = render_preview(cur[1], *spec)
+        except cv2.error:
+            self._display = None
+            return
+        self._display = (cur[0], qimg, M)
+
+    def latest_display(self):
+        """(seq, 표시용 QImage, 원본→표시 2x3 행렬) 또는 None (표시 사양이 없을 때)"""
+        return self._display
 
-            if self.rotate:
-                frame_bgr = cv2.rotate(frame_bgr, cv2.ROTATE_90_COUNTERCLOCKWISE)
-            if self.mirror:
-                frame_bgr = cv2.flip(frame_bgr, 1)
+    def latest_frame(self):
+        """(seq, frame_bgr 읽기 전용 뷰) 또는 None. seq는 새 프레임마다 1씩 증가"""
+        return self.ring.latest()
 
-            frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
-            h, w, ch = frame_rgb.shape
-            bytes_per_line = ch * w
-            qimg = QImage(frame_rgb.data, w, h, bytes_per_line, QImage.Format_RGB888)
+    def last_frames(self, n, max_age_s=None):
+        """최근 n프레임 [(seq, frame_bgr 뷰), ...] (오래된 것 → 최신 순, max_age_s 이내만)"""
+        return self.ring.last(n, max_age_s)
 
-            self.change_pixmap_signal.emit(qimg, frame_bgr)
+    def snapshot(self):
+        """촬영 요청 시점에만 호출: 최신 원본 BGR 프레임의 사본 (없으면 None)"""
+        cur = self.ring.latest()
+        return None if cur is None else cur[1].copy()
 
-        if self.cap:
-            self.cap.release()
+    def consume_latest(self):
+        """frame_ready 슬롯용: 알림을 소비 처리하고 최신 프레임을 반환"""
+        self._notify_pending = False
+        return self.ring.latest()
 
     def stop(self):
         self.running = False
-        if self.cap:
-            self.cap.release()
         self.wait()